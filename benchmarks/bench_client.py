@@ -0,0 +1,64 @@
+"""
+对比裸 requests.get 与连接池 Client 的每秒调用次数。
+
+用法: python -m benchmarks.bench_client [--calls 2000] [--threads 1]
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+
+from benchmarks.stub_server import StubServer
+from src.client import Client
+
+SONG_PATH = "maimai/song/8?version=24000"
+SONG_PAYLOAD = {
+    "id": 8,
+    "title": "True Love Song",
+    "artist": "Kai/クラシック「G線上のアリア」",
+    "genre": "maimai",
+    "bpm": 150,
+    "version": 10000,
+    "difficulties": {"standard": [], "dx": []},
+}
+
+
+def calls_per_second(call, calls: int, threads: int) -> float:
+    start = time.perf_counter()
+    if threads == 1:
+        for _ in range(calls):
+            call()
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            for _ in pool.map(lambda _: call(), range(calls)):
+                pass
+    return calls / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    with StubServer({SONG_PATH: SONG_PAYLOAD}) as server:
+        url = urljoin(server.root_url, SONG_PATH)
+        assert requests.get(url).json()["id"] == SONG_PAYLOAD["id"]
+        before = calls_per_second(
+            lambda: requests.get(url).json(), args.calls, args.threads
+        )
+        with Client(server.root_url, pool_maxsize=max(args.threads, 1)) as client:
+            after = calls_per_second(
+                lambda: client.get_public_info(SONG_PATH[len("maimai/") :]),
+                args.calls,
+                args.threads,
+            )
+    print(f"requests.get: {before:10.1f} calls/s")
+    print(f"Client:       {after:10.1f} calls/s  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+对比反射式解析与生成解码函数解析 song/list（notes=true）载荷的耗时。
+
+用法: python -m benchmarks.bench_decode [--repeat 5]
+"""
+
+import argparse
+import time
+from dataclasses import MISSING, fields
+from enum import Enum
+from typing import Union
+
+from benchmarks.fixtures import load_fixture
+from src.util import ResponseStruct, Song
+
+
+def reflective_from_dict(cls, data: dict):
+    """
+    逐字段反射的解析方式（生成解码函数之前的实现），作为对照
+    """
+    init_kwargs = {}
+    for f in fields(cls):
+        json_key = f.metadata.get("json_key", f.name)
+        if json_key in data:
+            value = data[json_key]
+            if value is None:
+                init_kwargs[f.name] = None
+                continue
+            field_type = f.type
+            if (
+                isinstance(value, dict)
+                and isinstance(field_type, type)
+                and issubclass(field_type, ResponseStruct)
+            ):
+                init_kwargs[f.name] = reflective_from_dict(field_type, value)
+            elif (
+                isinstance(value, dict)
+                and getattr(field_type, "__origin__", None) is Union
+            ):
+                init_kwargs[f.name] = reflective_from_dict(
+                    _union_member(field_type.__args__, value), value
+                )
+            elif hasattr(field_type, "__origin__") and field_type.__origin__ is list:
+                subtype = field_type.__args__[0]
+                if isinstance(subtype, type) and issubclass(subtype, ResponseStruct):
+                    init_kwargs[f.name] = [
+                        reflective_from_dict(subtype, item) for item in value
+                    ]
+                elif isinstance(subtype, type) and issubclass(subtype, Enum):
+                    init_kwargs[f.name] = [subtype(item) for item in value]
+                else:
+                    init_kwargs[f.name] = value
+            elif isinstance(field_type, type) and issubclass(field_type, Enum):
+                init_kwargs[f.name] = field_type(value)
+            else:
+                init_kwargs[f.name] = value
+    return cls(**init_kwargs)
+
+
+def _union_member(members: tuple, data: dict) -> type:
+    # 与生成的解码函数一致：选择必填键全部出现的成员，都不满足时使用最后一个成员
+    members = [m for m in members if m is not type(None)]
+    for member in members:
+        if all(
+            f.metadata.get("json_key", f.name) in data
+            for f in fields(member)
+            if f.default is MISSING and f.default_factory is MISSING
+        ):
+            return member
+    return members[-1]
+
+
+def best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    songs = load_fixture("song_list")["songs"]
+    assert [reflective_from_dict(Song, s) for s in songs] == Song.from_list(songs)
+    before = best_of(
+        lambda: [reflective_from_dict(Song, s) for s in songs], args.repeat
+    )
+    after = best_of(lambda: Song.from_list(songs), args.repeat)
+    print(f"songs: {len(songs)}")
+    print(f"reflective from_dict: {before * 1000:8.1f} ms")
+    print(f"compiled from_dict:   {after * 1000:8.1f} ms  ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
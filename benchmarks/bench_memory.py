@@ -0,0 +1,90 @@
+"""
+用 tracemalloc 统计解析 10 万条成绩与完整曲目列表后的常驻内存。
+
+对照组为字段相同、带实例 __dict__ 且不驻留字符串的 dataclass。
+统计包含 JSON 解析出的字符串，解析完成后原始载荷即被释放。
+
+用法: python -m benchmarks.bench_memory [--scores 100000]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from dataclasses import field, fields, make_dataclass
+from typing import List
+
+from benchmarks.fixtures import load_fixture, scores_payload
+from src.util import ResponseStruct, Score, Song
+
+_twins: dict[type, type] = {}
+
+
+def dict_backed(cls: type) -> type:
+    """
+    构造 cls 的对照类：去掉 slots 与字符串驻留，嵌套类型同样替换为对照类
+    """
+    if cls in _twins:
+        return _twins[cls]
+
+    def twin_type(tp):
+        if isinstance(tp, type) and issubclass(tp, ResponseStruct):
+            return dict_backed(tp)
+        if getattr(tp, "__origin__", None) is list:
+            return List[twin_type(tp.__args__[0])]
+        return tp
+
+    twin_fields = [
+        (
+            f.name,
+            twin_type(f.type),
+            field(
+                default=f.default,
+                default_factory=f.default_factory,
+                kw_only=f.kw_only,
+                metadata={k: v for k, v in f.metadata.items() if k != "intern"},
+            ),
+        )
+        for f in fields(cls)
+    ]
+    twin = make_dataclass(cls.__name__, twin_fields, bases=(ResponseStruct,))
+    _twins[cls] = twin
+    return twin
+
+
+def retained_bytes(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scores", type=int, default=100000)
+    args = parser.parse_args()
+
+    song_text = json.dumps(load_fixture("song_list"), ensure_ascii=False)
+    score_text = json.dumps(scores_payload(args.scores), ensure_ascii=False)
+    for label, song_cls, score_cls in [
+        ("dict dataclass", dict_backed(Song), dict_backed(Score)),
+        ("slots + intern", Song, Score),
+    ]:
+        song_bytes = retained_bytes(
+            lambda: song_cls.from_list(json.loads(song_text)["songs"])
+        )
+        score_bytes = retained_bytes(
+            lambda: score_cls.from_list(json.loads(score_text)["data"])
+        )
+        print(
+            f"{label:15s} songs: {song_bytes / 2**20:7.2f} MiB"
+            f"  scores({args.scores}): {score_bytes / 2**20:7.2f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+多进程执行器的扩展性：相同的 (玩家 × 谱面) 达成率损失任务在 1/2/4/8 个进程下的吞吐量。
+
+用法: python -m benchmarks.bench_parallel [--players 200] [--workers 1 2 4 8]
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.fixtures import load_fixture
+from src.algorithm import ParallelRunner, SongCatalog, total_achievement_loss_task
+from src.util import Notes, Song
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=200)
+    parser.add_argument("--charts", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--chunk-size", type=int, default=512)
+    args = parser.parse_args()
+
+    catalog = SongCatalog(Song.from_list(load_fixture("song_list")["songs"]))
+    keys = [
+        key for key, diff in catalog.charts.items() if isinstance(diff.notes, Notes)
+    ]
+    rng = random.Random(0)
+    queries = [
+        (
+            song_id,
+            level_index,
+            song_type,
+            {
+                "tap": {"great": rng.randrange(10)},
+                "break": {"perfect": rng.randrange(5)},
+            },
+        )
+        for _ in range(args.players)
+        for song_id, song_type, level_index in rng.sample(keys, args.charts)
+    ]
+
+    start = time.perf_counter()
+    expected = [total_achievement_loss_task(catalog, query) for query in queries]
+    serial = time.perf_counter() - start
+    print(f"tasks: {len(queries)}")
+    print(f"serial:     {len(queries) / serial:12.1f} tasks/s")
+    for workers in args.workers:
+        with ParallelRunner(catalog, workers, args.chunk_size) as runner:
+            start = time.perf_counter()
+            results = runner.total_achievement_loss(queries)
+            elapsed = time.perf_counter() - start
+        assert results == expected
+        print(
+            f"workers={workers}: {len(queries) / elapsed:12.1f} tasks/s "
+            f"({serial / elapsed:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Rating 计算吞吐量（玩家/秒）：逐个玩家用堆选择 B50 与批量向量化计算。
+
+用法: python -m benchmarks.bench_rating [--players 2000] [--scores 600]
+"""
+
+import argparse
+import time
+
+from benchmarks.fixtures import load_fixture, scores_payload
+from src.algorithm import RatingEngine, SongCatalog
+from src.util import Score, Song
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--scores", type=int, default=600)
+    args = parser.parse_args()
+
+    songs = Song.from_list(load_fixture("song_list")["songs"])
+    engine = RatingEngine(SongCatalog(songs))
+    players = [
+        Score.from_list(scores_payload(args.scores, len(songs), seed)["data"])
+        for seed in range(args.players)
+    ]
+
+    start = time.perf_counter()
+    per_player = [engine.best50(scores).total for scores in players]
+    heap_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = engine.batch_ratings(players)
+    batch_time = time.perf_counter() - start
+
+    assert per_player == batch[:, 0].tolist()
+    print(f"players: {args.players}, scores per player: {args.scores}")
+    print(f"best50 (heap):  {args.players / heap_time:10.1f} players/s")
+    print(f"batch_ratings:  {args.players / batch_time:10.1f} players/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+对比 get_song_list 与流式 iter_song_list 读取 song/list（notes=true）时的
+峰值内存与耗时（包含首个曲目的延迟）。
+
+用法: python -m benchmarks.bench_streaming [--songs 1400]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.fixtures import load_fixture, song_list_payload
+from benchmarks.stub_server import StubServer
+from src.api.raw import get_song_list, iter_song_list
+from src.client import Client
+
+
+def measure(consume) -> tuple[float, float, float]:
+    """
+    返回 (峰值内存 MiB, 首个曲目延迟 ms, 总耗时 ms)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = consume(lambda: time.perf_counter())
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20, (first - start) * 1000, total * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--songs", type=int, default=None)
+    args = parser.parse_args()
+
+    payload = song_list_payload(args.songs) if args.songs else load_fixture("song_list")
+    with StubServer({"maimai/song/list": payload}) as server:
+        client = Client(server.root_url)
+
+        def buffered(now):
+            songs = get_song_list(notes=True, client=client)["songs"]
+            first = now()
+            for song in songs:
+                pass
+            return first
+
+        def streamed(now):
+            first = None
+            for song in iter_song_list(notes=True, client=client):
+                first = first or now()
+            return first
+
+        # 预热连接与解码函数
+        buffered(time.perf_counter)
+        for label, consume in [
+            ("get_song_list", buffered),
+            ("iter_song_list", streamed),
+        ]:
+            peak, first, total = measure(consume)
+            print(
+                f"{label:15s} peak {peak:7.2f} MiB  first song {first:8.1f} ms"
+                f"  total {total:8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
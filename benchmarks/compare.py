@@ -0,0 +1,53 @@
+"""
+对比两次 benchmarks.run 的结果，按 ops/s 计算比值。
+
+用法: python -m benchmarks.compare base.json head.json [--threshold 0.1]
+任意一项变慢超过 threshold（默认 10%）时退出码为 1。
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(base: dict, head: dict, threshold: float) -> list[str]:
+    """
+    打印对比表，返回变慢超过 threshold 的项
+    """
+    regressions = []
+    print(f"base: {base.get('commit')}  head: {head.get('commit')}")
+    print(f"{'benchmark':50s} {'base ops/s':>14s} {'head ops/s':>14s} {'ratio':>8s}")
+    for name, result in head["results"].items():
+        old = base["results"].get(name)
+        new_rate = result["ops_per_sec"]
+        if old is None or not old["ops_per_sec"] or not new_rate:
+            print(f"{name:50s} {'-':>14s} {new_rate or 0:14.1f} {'new':>8s}")
+            continue
+        ratio = new_rate / old["ops_per_sec"]
+        mark = ""
+        if ratio < 1 - threshold:
+            regressions.append(name)
+            mark = "  <-- slower"
+        print(
+            f"{name:50s} {old['ops_per_sec']:14.1f} {new_rate:14.1f} {ratio:7.2f}x{mark}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args()
+    regressions = compare(load(args.base), load(args.head), args.threshold)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
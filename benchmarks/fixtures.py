@@ -0,0 +1,395 @@
+"""
+基准测试用的 API 载荷。
+
+优先读取 benchmarks/fixtures/<name>.json.gz 中录制的真实响应；
+没有录制文件时按真实响应的结构确定性地生成同等规模的数据。
+
+录制（需要网络）: python -m benchmarks.fixtures record
+个人 API 的载荷需要同时设置 LXNS_TOKEN 环境变量。
+"""
+
+import gzip
+import json
+import os
+import random
+import sys
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+GENRES = [
+    "流行&动漫",
+    "niconico & VOCALOID",
+    "东方Project",
+    "其他游戏",
+    "舞萌",
+    "音击&中二节奏",
+]
+DESIGNERS = [
+    "-",
+    "mai-Star",
+    "Jack",
+    "ロシェ@ペンギン",
+    "はっぴー",
+    "譜面-100号",
+    "Techno Kitchen",
+]
+LEVELS = (
+    [str(i) for i in range(1, 7)]
+    + [f"{i}{plus}" for i in range(7, 15) for plus in ("", "+")]
+    + ["15"]
+)
+VERSIONS = list(range(10000, 25000, 1000))
+RATES = ["sssp", "sss", "ssp", "ss", "sp", "s", "aaa", "aa", "a"]
+FCS = [None, "fc", "fcp", "ap", "app"]
+FSS = [None, "sync", "fs", "fsp", "fsd", "fsdp"]
+
+
+def _level_value(level: str, rng: random.Random) -> float:
+    base = int(level.rstrip("+"))
+    return round(
+        base + (0.6 if level.endswith("+") else 0.0) + rng.randrange(4) / 10, 1
+    )
+
+
+def _notes(rng: random.Random, total: int) -> dict:
+    tap = int(total * rng.uniform(0.55, 0.75))
+    hold = int(total * rng.uniform(0.05, 0.12))
+    slide = int(total * rng.uniform(0.05, 0.15))
+    touch = int(total * rng.uniform(0.0, 0.08))
+    break_ = max(1, total - tap - hold - slide - touch)
+    return {
+        "total": tap + hold + slide + touch + break_,
+        "tap": tap,
+        "hold": hold,
+        "slide": slide,
+        "touch": touch,
+        "break": break_,
+    }
+
+
+def _difficulties(
+    rng: random.Random, song_type: str, version: int, notes: bool
+) -> list[dict]:
+    result = []
+    for index in range(5 if rng.random() < 0.3 else 4):
+        level = LEVELS[min(len(LEVELS) - 1, index * 4 + rng.randrange(6))]
+        difficulty = {
+            "type": song_type,
+            "difficulty": index,
+            "level": level,
+            "level_value": _level_value(level, rng),
+            "note_designer": rng.choice(DESIGNERS),
+            "version": version,
+        }
+        if notes:
+            difficulty["notes"] = _notes(rng, 150 + index * 180 + rng.randrange(200))
+        result.append(difficulty)
+    return result
+
+
+def _utage(rng: random.Random, version: int, notes: bool) -> list[dict]:
+    is_buddy = rng.random() < 0.3
+    difficulty = {
+        "type": "utage",
+        "difficulty": 0,
+        "level": "14?",
+        "level_value": 14.0,
+        "note_designer": rng.choice(DESIGNERS),
+        "version": version,
+        "kanji": rng.choice(["宴", "協", "光", "蛸"]),
+        "description": "宴会場",
+        "is_buddy": is_buddy,
+    }
+    if notes:
+        if is_buddy:
+            difficulty["notes"] = {"left": _notes(rng, 600), "right": _notes(rng, 600)}
+        else:
+            difficulty["notes"] = _notes(rng, 900)
+    return [difficulty]
+
+
+def song_list_payload(songs: int = 1400, notes: bool = True, seed: int = 0) -> dict:
+    """
+    song/list 响应，结构与 maimai.lxns.net 相同
+    """
+    rng = random.Random(seed)
+    song_list = []
+    for song_id in range(1, songs + 1):
+        version = rng.choice(VERSIONS)
+        has_dx = version >= 13000 or rng.random() < 0.2
+        has_standard = version < 13000 or rng.random() < 0.1
+        song = {
+            "id": song_id,
+            "title": f"曲目 {song_id}",
+            "artist": f"アーティスト {rng.randrange(400)}",
+            "genre": rng.choice(GENRES),
+            "bpm": rng.randrange(90, 240),
+            "version": version,
+            "rights": "© SEGA",
+            "disabled": False,
+            "difficulties": {
+                "standard": (
+                    _difficulties(rng, "standard", version, notes)
+                    if has_standard
+                    else []
+                ),
+                "dx": _difficulties(rng, "dx", version, notes) if has_dx else [],
+            },
+        }
+        if rng.random() < 0.05:
+            song["difficulties"]["utage"] = _utage(rng, version, notes)
+        song_list.append(song)
+    return {
+        "songs": song_list,
+        "genres": [{"id": i, "title": g, "genre": g} for i, g in enumerate(GENRES, 1)],
+        "versions": [
+            {"id": i, "title": f"maimai {v}", "version": v}
+            for i, v in enumerate(VERSIONS, 1)
+        ],
+    }
+
+
+def scores_payload(scores: int = 2000, songs: int = 1400, seed: int = 0) -> dict:
+    """
+    player/scores 响应，结构与 maimai.lxns.net 相同
+    """
+    rng = random.Random(seed)
+    data = []
+    for _ in range(scores):
+        song_id = rng.randrange(1, songs + 1)
+        level_index = rng.randrange(5)
+        achievements = round(min(101.0, rng.gauss(99.0, 1.5)), 4)
+        data.append(
+            {
+                "id": song_id,
+                "song_name": f"曲目 {song_id}",
+                "level": rng.choice(LEVELS),
+                "level_index": level_index,
+                "achievements": achievements,
+                "fc": rng.choice(FCS),
+                "fs": rng.choice(FSS),
+                "dx_score": rng.randrange(500, 3000),
+                "dx_rating": round(rng.uniform(100, 340), 4),
+                "rate": rng.choice(RATES),
+                "type": rng.choice(["standard", "dx"]),
+                "play_time": "2025-01-01T00:00:00Z",
+                "upload_time": "2025-01-01T00:00:00Z",
+                "last_played_time": "2025-01-01T00:00:00Z",
+            }
+        )
+    return {"success": True, "code": 200, "data": data}
+
+
+def player_payload(seed: int = 0) -> dict:
+    """
+    player 响应，结构与 maimai.lxns.net 相同
+    """
+    rng = random.Random(seed)
+    collection = {"id": 1, "name": "はじめまして", "genre": "通常"}
+    return {
+        "success": True,
+        "code": 200,
+        "data": {
+            "name": f"ﾌﾟﾚｲﾔｰ{seed}",
+            "rating": rng.randrange(10000, 16500),
+            "friend_code": 100000000000000 + seed,
+            "trophy": dict(collection, color="Normal"),
+            "trophy_name": "はじめまして",
+            "course_rank": rng.randrange(23),
+            "class_rank": rng.randrange(26),
+            "star": rng.randrange(2000),
+            "icon": collection,
+            "name_plate": collection,
+            "frame": collection,
+            "upload_time": "2025-01-01T00:00:00Z",
+        },
+    }
+
+
+def alias_list_payload(songs: int = 1400, seed: int = 0) -> dict:
+    """
+    alias/list 响应，约三分之二的曲目有 1~4 个别名
+    """
+    rng = random.Random(seed)
+    aliases = []
+    for song_id in range(1, songs + 1):
+        if rng.random() < 0.65:
+            names = {f"别名{song_id}", f"曲{song_id}"}
+            names.update(f"alias{rng.randrange(5000)}" for _ in range(rng.randrange(3)))
+            aliases.append({"song_id": song_id, "aliases": sorted(names)})
+    return {"aliases": aliases}
+
+
+# 姓名框的达成条件：名称后缀 -> (rate, fc, fs)
+PLATE_REQUIREMENTS = {
+    "極": (None, "fc", None),
+    "将": ("sss", None, None),
+    "神": (None, "ap", None),
+    "舞舞": (None, None, "fsd"),
+}
+
+
+def plate_list_payload(songs: int = 1400, required: bool = True, seed: int = 0) -> dict:
+    """
+    plate/list 响应：每个版本一组極/将/神/舞舞姓名框，要求该版本所有曲目的
+    BASIC~MASTER 谱面达到对应评级 / FC / FS
+    """
+    song_list = song_list_payload(songs, notes=False, seed=seed)["songs"]
+    by_version: dict[int, list[dict]] = {}
+    for song in song_list:
+        by_version.setdefault(song["version"], []).append(song)
+    plates = []
+    for version in VERSIONS:
+        for suffix, (rate, fc, fs) in PLATE_REQUIREMENTS.items():
+            plate = {
+                "id": len(plates) + 1,
+                "name": f"{version // 1000}{suffix}",
+                "description": f"{version} 版本所有曲目",
+                "genre": "段位",
+            }
+            if required:
+                requirement = {"difficulties": [0, 1, 2, 3]}
+                for key, value in (("rate", rate), ("fc", fc), ("fs", fs)):
+                    if value is not None:
+                        requirement[key] = value
+                requirement["songs"] = [
+                    {
+                        "id": song["id"],
+                        "title": song["title"],
+                        "type": "dx" if song["difficulties"]["dx"] else "standard",
+                    }
+                    for song in by_version.get(version, [])
+                ]
+                plate["required"] = [requirement]
+            plates.append(plate)
+    return {"plates": plates}
+
+
+def collection_list_payload(
+    key: str, count: int = 300, required: bool = False, seed: int = 0
+) -> dict:
+    """
+    icon/list、frame/list 响应，key 为 "icons" 或 "frames"
+    """
+    rng = random.Random(seed)
+    items = []
+    for item_id in range(1, count + 1):
+        item = {
+            "id": item_id,
+            "name": f"{key[:-1]} {item_id}",
+            "description": "",
+            "genre": rng.choice(GENRES),
+        }
+        if required and rng.random() < 0.3:
+            item["required"] = [{"difficulties": [3], "rate": "s", "songs": []}]
+        items.append(item)
+    return {key: items}
+
+
+def collection_genre_list_payload(count: int = 40) -> dict:
+    """
+    collection-genre/list 响应
+    """
+    return {
+        "collectionGenres": [
+            {"id": i, "title": f"分类 {i}", "genre": f"分类 {i}"}
+            for i in range(1, count + 1)
+        ]
+    }
+
+
+GENERATORS = {
+    "song_list": song_list_payload,
+    "scores": scores_payload,
+    "player": player_payload,
+    "alias_list": alias_list_payload,
+    "icon_list": lambda: collection_list_payload("icons", 800),
+    "plate_list": plate_list_payload,
+    "frame_list": lambda: collection_list_payload("frames", 200),
+    "collection_genre_list": collection_genre_list_payload,
+}
+
+# 录制时请求的真实 API 路径
+RECORD_URLS = {
+    "song_list": "maimai/song/list?version=24000&notes=true",
+    "alias_list": "maimai/alias/list",
+    "icon_list": "maimai/icon/list?version=24000&required=true",
+    "plate_list": "maimai/plate/list?version=24000&required=true",
+    "frame_list": "maimai/frame/list?version=24000&required=true",
+    "collection_genre_list": "maimai/collection-genre/list?version=24000",
+}
+# 个人 API 需要设置环境变量 LXNS_TOKEN 才会录制
+RECORD_PLAYER_URLS = {
+    "player": "user/maimai/player",
+    "scores": "user/maimai/player/scores",
+}
+
+
+def load_fixture(name: str) -> dict:
+    """
+    读取录制的载荷，不存在时使用生成的同结构数据
+    """
+    path = os.path.join(FIXTURE_DIR, f"{name}.json.gz")
+    if os.path.exists(path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    return GENERATORS[name]()
+
+
+def stub_routes() -> dict[str, object]:
+    """
+    api.raw 中所有接口对应的桩服务路由，单项接口使用各列表中的第一项
+    """
+    song_list = load_fixture("song_list")
+    icons = load_fixture("icon_list")
+    plates = load_fixture("plate_list")
+    frames = load_fixture("frame_list")
+    genres = load_fixture("collection_genre_list")
+    song = song_list.get("data", song_list)["songs"][0]
+    routes = {
+        "user/maimai/player": load_fixture("player"),
+        "user/maimai/player/scores": load_fixture("scores"),
+        "maimai/song/list": song_list,
+        f"maimai/song/{song['id']}": song,
+        "maimai/alias/list": load_fixture("alias_list"),
+        "maimai/icon/list": icons,
+        "maimai/plate/list": plates,
+        "maimai/frame/list": frames,
+        "maimai/collection-genre/list": genres,
+    }
+    for name, payload, key in (
+        ("icon", icons, "icons"),
+        ("plate", plates, "plates"),
+        ("frame", frames, "frames"),
+        ("collection-genre", genres, "collectionGenres"),
+    ):
+        items = payload.get("data", payload)[key]
+        if items:
+            routes[f"maimai/{name}/{items[0]['id']}"] = items[0]
+    return routes
+
+
+def _save(name: str, payload: dict):
+    with gzip.open(
+        os.path.join(FIXTURE_DIR, f"{name}.json.gz"), "wt", encoding="utf-8"
+    ) as f:
+        json.dump(payload, f, ensure_ascii=False)
+
+
+def record():
+    from src.client import get_default_client
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    client = get_default_client()
+    for name, url in RECORD_URLS.items():
+        _save(name, client.get(url).json())
+        print(f"recorded {name} from {url}")
+    token = os.environ.get("LXNS_TOKEN")
+    if token:
+        for name, url in RECORD_PLAYER_URLS.items():
+            _save(name, client.get(url, {"X-User-Token": token}).json())
+            print(f"recorded {name} from {url}")
+
+
+if __name__ == "__main__" and sys.argv[1:] == ["record"]:
+    record()
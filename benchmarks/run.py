@@ -0,0 +1,283 @@
+"""
+基准测试套件：端到端请求 + 解析、单独解析，以及目录规模的算法函数。
+
+结果保存为 JSON（包含提交号），可用 benchmarks.compare 对比不同提交。
+
+用法: python -m benchmarks.run [--repeat 5] [--output results.json] [--filter decode]
+"""
+
+import argparse
+import json
+import os
+import pickle
+import platform
+import subprocess
+import time
+from typing import Callable
+
+from benchmarks.fixtures import load_fixture, stub_routes
+from benchmarks.stub_server import StubServer
+from src.algorithm import (
+    CollectionIndex,
+    LossTable,
+    NotesBatch,
+    SongCatalog,
+    SongSearchIndex,
+    extract_notes,
+    get_achievement_loss_from_notes,
+    get_total_achievement_loss_from_notes,
+    iter_note_sets,
+)
+from src.api import raw
+from src.client import Client
+from src.util import Alias, Collection, Player, Score, Song
+
+RESULT_DIR = os.path.join(os.path.dirname(__file__), "results")
+LOSS_DICT = {
+    "tap": {"great": 3, "good": 1},
+    "hold": {"miss": 1},
+    "break": {"perfect": 2},
+}
+
+# (名称, 每次运行处理的条数, 被测函数)
+Case = tuple[str, int, Callable[[], None]]
+
+
+def best_of(func: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def fetch_cases(client: Client) -> list[Case]:
+    """
+    端到端：通过桩服务请求并解析，每个 api.raw 接口一项
+    """
+    token = "token"
+    return [
+        ("fetch.get_player", 1, lambda: raw.get_player(token, client)),
+        ("fetch.get_player_scores", 1, lambda: raw.get_player_scores(token, client)),
+        (
+            "fetch.iter_player_scores",
+            1,
+            lambda: sum(1 for _ in raw.iter_player_scores(token, client)),
+        ),
+        (
+            "fetch.get_song_list",
+            1,
+            lambda: raw.get_song_list(notes=True, client=client),
+        ),
+        (
+            "fetch.iter_song_list",
+            1,
+            lambda: sum(1 for _ in raw.iter_song_list(notes=True, client=client)),
+        ),
+        ("fetch.get_song", 1, lambda: raw.get_song(1, client=client)),
+        ("fetch.get_alias_list", 1, lambda: raw.get_alias_list(client=client)),
+        ("fetch.get_icon_list", 1, lambda: raw.get_icon_list(client=client)),
+        ("fetch.get_icon", 1, lambda: raw.get_icon(1, client=client)),
+        (
+            "fetch.get_plate_list",
+            1,
+            lambda: raw.get_plate_list(required=True, client=client),
+        ),
+        ("fetch.get_plate", 1, lambda: raw.get_plate(1, client=client)),
+        ("fetch.get_frame_list", 1, lambda: raw.get_frame_list(client=client)),
+        ("fetch.get_frame", 1, lambda: raw.get_frame(1, client=client)),
+        (
+            "fetch.get_collection_genre_list",
+            1,
+            lambda: raw.get_collection_genre_list(client=client),
+        ),
+        (
+            "fetch.get_collection_genre",
+            1,
+            lambda: raw.get_collection_genre(1, client=client),
+        ),
+    ]
+
+
+def decode_cases() -> list[Case]:
+    """
+    只测 ResponseStruct 的解析，载荷已在内存中
+    """
+    songs = load_fixture("song_list")["songs"]
+    scores = load_fixture("scores")["data"]
+    aliases = load_fixture("alias_list")["aliases"]
+    plates = load_fixture("plate_list")["plates"]
+    player = load_fixture("player")["data"]
+    return [
+        ("decode.Song", len(songs), lambda: Song.from_list(songs)),
+        ("decode.Song.lazy", len(songs), lambda: Song.from_list(songs, lazy=True)),
+        ("decode.Score", len(scores), lambda: Score.from_list(scores)),
+        ("decode.Alias", len(aliases), lambda: Alias.from_list(aliases)),
+        ("decode.Collection", len(plates), lambda: Collection.from_list(plates)),
+        ("decode.Player", 1, lambda: Player.from_dict(player)),
+    ]
+
+
+def codec_cases() -> list[Case]:
+    """
+    ResponseStruct 二进制格式与 pickle 的编解码对比
+    """
+    songs = Song.from_list(load_fixture("song_list")["songs"])
+    scores = Score.from_list(load_fixture("scores")["data"])
+    cases = []
+    for cls, items in ((Song, songs), (Score, scores)):
+        binary, pickled = cls.list_to_bytes(items), pickle.dumps(items, 5)
+        name = cls.__name__
+        cases += [
+            (
+                f"codec.{name}.to_bytes",
+                len(items),
+                lambda c=cls, i=items: c.list_to_bytes(i),
+            ),
+            (
+                f"codec.{name}.from_bytes",
+                len(items),
+                lambda c=cls, b=binary: c.list_from_bytes(b),
+            ),
+            (
+                f"codec.{name}.pickle.dumps",
+                len(items),
+                lambda i=items: pickle.dumps(i, 5),
+            ),
+            (
+                f"codec.{name}.pickle.loads",
+                len(items),
+                lambda p=pickled: pickle.loads(p),
+            ),
+        ]
+    return cases
+
+
+def algorithm_cases() -> list[Case]:
+    """
+    目录规模的算法函数：对目录中每个谱面调用一次
+    """
+    songs = Song.from_list(load_fixture("song_list")["songs"])
+    catalog = SongCatalog(songs)
+    charts = [
+        (catalog.songs[key[0]], key)
+        for key, diff in catalog.charts.items()
+        if diff.notes is not None
+    ]
+    notes = [
+        n for _, key in charts for _, n in iter_note_sets(catalog.charts[key].notes)
+    ]
+    batch = NotesBatch.from_catalog(catalog)
+    table = LossTable.from_catalog(catalog)
+    plates = CollectionIndex(Collection.from_list(load_fixture("plate_list")["plates"]))
+    scores = Score.from_list(load_fixture("scores")["data"])
+    aliases = Alias.from_list(load_fixture("alias_list")["aliases"])
+    search = SongSearchIndex(songs, aliases)
+    # 部分曲名（去掉首字）与完整别名各一半
+    queries = [song.title[1:] for song in songs[:50]]
+    queries += [alias.aliases[0] for alias in aliases[:50] if alias.aliases]
+    return [
+        (
+            "algorithm.extract_notes",
+            len(charts),
+            lambda: [extract_notes(song, key[2], key[1]) for song, key in charts],
+        ),
+        (
+            "algorithm.get_achievement_loss_from_notes",
+            len(notes),
+            lambda: [
+                get_achievement_loss_from_notes(n, "break", "great") for n in notes
+            ],
+        ),
+        (
+            "algorithm.get_total_achievement_loss_from_notes",
+            len(notes),
+            lambda: [
+                get_total_achievement_loss_from_notes(n, LOSS_DICT) for n in notes
+            ],
+        ),
+        (
+            "algorithm.NotesBatch.total_achievement_loss",
+            len(batch),
+            lambda: batch.total_achievement_loss([LOSS_DICT]),
+        ),
+        (
+            "algorithm.LossTable.total_achievement_loss",
+            len(table),
+            lambda: table.total_achievement_loss([LOSS_DICT]),
+        ),
+        ("algorithm.SongCatalog", len(songs), lambda: SongCatalog(songs)),
+        (
+            "algorithm.SongSearchIndex.search",
+            len(queries),
+            lambda: [search.search(query) for query in queries],
+        ),
+        (
+            "algorithm.CollectionIndex.progress",
+            len(scores),
+            lambda: plates.progress(scores).report(),
+        ),
+    ]
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(cases: list[Case], repeat: int) -> dict[str, dict]:
+    results = {}
+    for name, ops, func in cases:
+        func()  # 预热：编译解码函数、建立连接
+        seconds = best_of(func, repeat)
+        results[name] = {
+            "seconds": seconds,
+            "ops": ops,
+            "ops_per_sec": ops / seconds if seconds else None,
+        }
+        print(f"{name:50s} {seconds * 1000:10.3f} ms {ops / seconds:14.1f} ops/s")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="结果文件，默认为 results/<提交号>.json")
+    parser.add_argument("--filter", default="", help="只运行名称包含该字符串的项")
+    args = parser.parse_args()
+
+    with StubServer(stub_routes()) as server, Client(server.root_url) as client:
+        cases = fetch_cases(client) + decode_cases() + codec_cases() + algorithm_cases()
+        cases = [case for case in cases if args.filter in case[0]]
+        results = run(cases, args.repeat)
+
+    commit = git_commit()
+    output = args.output or os.path.join(RESULT_DIR, f"{(commit or 'local')[:12]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "commit": commit,
+                "timestamp": time.time(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "repeat": args.repeat,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
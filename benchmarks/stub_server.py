@@ -0,0 +1,122 @@
+"""
+本地桩 HTTP 服务，模拟 maimai.lxns.net 的 API 用于离线基准测试。
+
+启用 HTTP/1.1 keep-alive，路由表为 {相对路径: JSON 对象}，
+相对路径可以包含查询参数，也可以只写路径以匹配任意查询参数。
+throttle 大于 0 时前 throttle 个请求返回 429，用于测试限流退避，
+error_status / error_body 可替换这些响应（如代理返回的 HTML 502）；
+delay 为每个请求响应前的等待时间（秒），用于模拟网络延迟。
+"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+API_PREFIX = "/api/v0/"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # 头部与正文合并写出，避免 keep-alive 连接上 Nagle 与延迟 ACK 叠加
+    wbufsize = 1 << 16
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        routes = self.server.routes
+        path = self.path[len(API_PREFIX) :] if self.path.startswith(API_PREFIX) else ""
+        body = routes.get(path)
+        if body is None:
+            body = routes.get(urlsplit(path).path)
+        self.server.request_count += 1
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        if self.server.throttle > 0:
+            self.server.throttle -= 1
+            self._send(
+                self.server.error_status,
+                self.server.error_body,
+                content_type=self.server.error_content_type,
+            )
+            return
+        if body is None:
+            self._send(404, b'{"success": false, "code": 404}')
+            return
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", etag)
+        else:
+            self._send(200, body, etag)
+
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        etag: str = None,
+        content_type: str = "application/json",
+    ):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer:
+    def __init__(
+        self,
+        routes: dict[str, object],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        throttle: int = 0,
+        delay: float = 0.0,
+        error_status: int = 429,
+        error_body: bytes = None,
+    ):
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.request_count = 0
+        self.httpd.throttle = throttle
+        self.httpd.delay = delay
+        self.httpd.error_status = error_status
+        if error_body is None:
+            error_body = b'{"success": false, "code": %d}' % error_status
+            self.httpd.error_content_type = "application/json"
+        else:
+            self.httpd.error_content_type = "text/html"
+        self.httpd.error_body = error_body
+        self.httpd.routes = {
+            path: json.dumps(payload, ensure_ascii=False).encode()
+            for path, payload in routes.items()
+        }
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def request_count(self) -> int:
+        return self.httpd.request_count
+
+    @property
+    def root_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
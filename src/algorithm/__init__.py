@@ -1 +1,9 @@
 from .algorithm import *
+from .catalog import *
+from .vectorized import *
+from .loss_table import *
+from .rating import *
+from .parallel import *
+from .solver import *
+from .collection_progress import *
+from .search import *
@@ -3,25 +3,78 @@ from ..util import (
     SongType,
     LevelIndex,
     Notes,
-    SongDifficulty,
+    BuddyNotes,
+    SongDifficulties,
 )
-from typing import Literal
+from .. import metrics
+from operator import attrgetter
+from typing import Callable, Literal
+
+_DIFFICULTY_NAMES = {
+    "basic": LevelIndex.BASIC,
+    "advanced": LevelIndex.ADVANCED,
+    "expert": LevelIndex.EXPERT,
+    "master": LevelIndex.MASTER,
+    "re_master": LevelIndex.RE_MASTER,
+}
+
+# 谱面类型 -> SongDifficulties 中对应的谱面列表
+_DIFFICULTY_LISTS: dict[SongType, Callable[[SongDifficulties], list]] = {
+    SongType.STANDARD: attrgetter("standard"),
+    SongType.DX: attrgetter("dx"),
+    SongType.UTAGE: attrgetter("utage"),
+}
+
+# Notes 类型 -> 其包含的 (side, Notes)，普通谱面的 side 为 None
+_NOTE_SETS: dict[type, Callable[[Notes | BuddyNotes], tuple]] = {
+    Notes: lambda notes: ((None, notes),),
+    BuddyNotes: lambda notes: (("left", notes.left), ("right", notes.right)),
+}
 
 
 def str_to_difficulty(difficulty: str) -> LevelIndex:
     """
     将字符串难度转换为 LevelIndex 枚举
     """
-    if difficulty == "basic":
-        return LevelIndex.BASIC
-    elif difficulty == "advanced":
-        return LevelIndex.ADVANCED
-    elif difficulty == "expert":
-        return LevelIndex.EXPERT
-    elif difficulty == "master":
-        return LevelIndex.MASTER
-    elif difficulty == "re_master":
-        return LevelIndex.RE_MASTER
+    return _DIFFICULTY_NAMES.get(difficulty)
+
+
+def iter_note_sets(
+    notes: Notes | BuddyNotes | None,
+) -> tuple[tuple[Literal["left", "right"] | None, Notes], ...]:
+    """
+    谱面中的所有 Notes：普通谱面为 ((None, notes),)，
+    协力谱面为 (("left", notes.left), ("right", notes.right))，没有 Notes 时为空
+    """
+    if notes is None:
+        return ()
+    return _NOTE_SETS[type(notes)](notes)
+
+
+def select_notes(
+    notes: Notes | BuddyNotes | None,
+    side: Literal["left", "right"] = None,
+) -> Notes | BuddyNotes | None:
+    """
+    统一的 Notes 访问：协力谱面按 side 取出一侧的 Notes，side 为 None 时原样返回；
+    普通谱面只有一组 Notes，忽略 side
+    """
+    if side is None or not isinstance(notes, BuddyNotes):
+        return notes
+    if side == "left":
+        return notes.left
+    if side == "right":
+        return notes.right
+    raise ValueError(f"未知的协力谱面位置: {side}")
+
+
+def require_notes(notes: Notes | BuddyNotes | None) -> Notes:
+    """
+    确认 notes 不是协力谱面的 BuddyNotes，计算达成率损失前使用
+    """
+    if isinstance(notes, BuddyNotes):
+        raise ValueError("协力谱面需要指定 side（left 或 right）")
+    return notes
 
 
 def extract_notes(
@@ -29,36 +82,28 @@ def extract_notes(
     difficulty: (
         LevelIndex | Literal["basic", "advanced", "expert", "master", "re_master"] | int
     ),
-    type: SongType | Literal["dx", "standard"] = None,
-) -> Notes:
+    type: SongType | Literal["dx", "standard", "utage"] = None,
+    side: Literal["left", "right"] = None,
+) -> Notes | BuddyNotes:
     """
     获取指定曲目的Notes
-    暂不支持utage
+
+    type 为 None 时仅当曲目只有一种谱面类型时自动选择；
+    协力谱面返回 BuddyNotes，指定 side 时返回对应一侧的 Notes
     """
     if isinstance(difficulty, str):
         difficulty = str_to_difficulty(difficulty)
     if isinstance(difficulty, int):
         difficulty = LevelIndex(difficulty)
     difficulties = song.difficulties
-
-    def get_notes(difficulty_list: list[SongDifficulty]) -> Notes:
-        for diff in difficulty_list:
-            if diff.difficulty.value == difficulty.value:
-                return diff.notes
-        return None
-
-    if not difficulties.standard and not difficulties.utage:
-        return get_notes(difficulties.dx)
-    if not difficulties.dx and not difficulties.utage:
-        return get_notes(difficulties.standard)
-    if type is not None:
-        type = SongType(type)
-        if type == SongType.UTAGE:
-            return get_notes(difficulties.utage)
-        elif type == SongType.DX:
-            return get_notes(difficulties.dx)
-        elif type == SongType.STANDARD:
-            return get_notes(difficulties.standard)
+    if type is None:
+        available = [t for t, get in _DIFFICULTY_LISTS.items() if get(difficulties)]
+        if len(available) != 1:
+            return None
+        type = available[0]
+    for diff in _DIFFICULTY_LISTS[SongType(type)](difficulties) or ():
+        if diff.difficulty is difficulty:
+            return select_notes(diff.notes, side)
     return None
 
 
@@ -69,6 +114,33 @@ def get_equi_taps_from_notes(notes: Notes) -> int:
     return notes.tap + notes.hold * 2 + notes.slide * 3 + notes.touch + notes.break_ * 5
 
 
+# 各 Note 类型在各判定下的达成率损失系数，每个 (a, b) 表示损失 a * x + b * y
+# 其中 x = 1 / 总物量（按 tap 折算），y = 1 / break 数 * 0.01（绝赞额外分）
+# 有多个系数的判定（如 break great）依次为损失从低到高的几种情况
+LOSS_COEFFICIENTS: dict[tuple[str, str], tuple[tuple[float, float], ...]] = {
+    ("tap", "critical_perfect"): ((0, 0),),
+    ("tap", "perfect"): ((0, 0),),
+    ("tap", "great"): ((0.2, 0),),
+    ("tap", "good"): ((0.5, 0),),
+    ("tap", "miss"): ((1, 0),),
+    ("hold", "critical_perfect"): ((0, 0),),
+    ("hold", "perfect"): ((0, 0),),
+    ("hold", "great"): ((0.4, 0),),
+    ("hold", "good"): ((1, 0),),
+    ("hold", "miss"): ((2, 0),),
+    ("slide", "critical_perfect"): ((0, 0),),
+    ("slide", "perfect"): ((0, 0),),
+    ("slide", "great"): ((0.6, 0),),
+    ("slide", "good"): ((1.5, 0),),
+    ("slide", "miss"): ((3, 0),),
+    ("break", "critical_perfect"): ((0, 0),),
+    ("break", "perfect"): ((0, 0.25), (0, 0.5)),
+    ("break", "great"): ((1, 0.6), (2, 0.6), (2.5, 0.6)),
+    ("break", "good"): ((3, 0.7),),
+    ("break", "miss"): ((5, 1),),
+}
+
+
 def get_achievement_loss_from_notes(
     notes: Notes,
     note_type: Literal["tap", "hold", "slide", "break"],
@@ -77,50 +149,14 @@ def get_achievement_loss_from_notes(
     """
     获取一组Notes中指定Note类型在不同判定的达成率损失
     """
+    if metrics.state.current is not None:
+        metrics.count_call("get_achievement_loss_from_notes")
+    coefficients = LOSS_COEFFICIENTS.get((note_type, accuracy))
+    if coefficients is None:
+        return None
     x = 1 / get_equi_taps_from_notes(notes)
-    if note_type == "tap":
-        if accuracy == "critical_perfect" or accuracy == "perfect":
-            return (0,)
-        elif accuracy == "great":
-            return (0.2 * x,)
-        elif accuracy == "good":
-            return (0.5 * x,)
-        elif accuracy == "miss":
-            return (x,)
-    elif note_type == "hold":
-        if accuracy == "critical_perfect" or accuracy == "perfect":
-            return (0,)
-        elif accuracy == "great":
-            return (0.4 * x,)
-        elif accuracy == "good":
-            return (x,)
-        elif accuracy == "miss":
-            return (2 * x,)
-    elif note_type == "slide":
-        if accuracy == "critical_perfect" or accuracy == "perfect":
-            return (0,)
-        elif accuracy == "great":
-            return (0.6 * x,)
-        elif accuracy == "good":
-            return (1.5 * x,)
-        elif accuracy == "miss":
-            return (3 * x,)
-    elif note_type == "break":
-        y_scaled = 1 / notes.break_ * 0.01
-        if accuracy == "critical_perfect":
-            return (0,)
-        elif accuracy == "perfect":
-            return (0.25 * y_scaled, 0.5 * y_scaled)
-        elif accuracy == "great":
-            return (
-                x + 0.6 * y_scaled,
-                2 * x + 0.6 * y_scaled,
-                2.5 * x + 0.6 * y_scaled,
-            )
-        elif accuracy == "good":
-            return (3 * x + 0.7 * y_scaled,)
-        elif accuracy == "miss":
-            return (5 * x + y_scaled,)
+    y_scaled = 1 / notes.break_ * 0.01 if note_type == "break" else 0
+    return tuple(a * x + b * y_scaled for a, b in coefficients)
 
 
 def get_achievement_loss_from_song(
@@ -130,13 +166,17 @@ def get_achievement_loss_from_song(
     ),
     note_type: Literal["tap", "hold", "slide", "break"],
     accuracy: Literal["critical_perfect", "perfect", "great", "good", "miss"],
-    song_type: SongType | Literal["dx", "standard"] = None,
+    song_type: SongType | Literal["dx", "standard", "utage"] = None,
+    side: Literal["left", "right"] = None,
 ) -> tuple[float] | tuple[float, float] | tuple[float, float, float]:
     """
     获取指定曲目指定Note类型在不同判定的达成率损失
-    暂不支持utage
+
+    协力谱面需要通过 side 指定计算哪一侧
     """
-    notes = extract_notes(song, difficulty, song_type)
+    if metrics.state.current is not None:
+        metrics.count_call("get_achievement_loss_from_song")
+    notes = require_notes(extract_notes(song, difficulty, song_type, side))
     return get_achievement_loss_from_notes(notes, note_type, accuracy)
 
 
@@ -149,16 +189,15 @@ def get_total_achievement_loss_from_notes(
     - loss_dict: 未达到满达成率的物量配置 e.g. {"tap":{"miss":1},"break":{"perfect":1}}
     返回值: (达成率损失下限,达成率损失上限)
     """
+    if metrics.state.current is not None:
+        metrics.count_call("get_total_achievement_loss_from_notes")
     lower = 0
     upper = 0
     for note_type, accuracy_dict in loss_dict.items():
         for accuracy, loss in accuracy_dict.items():
-            lower += (
-                get_achievement_loss_from_notes(notes, note_type, accuracy)[0] * loss
-            )
-            upper += (
-                get_achievement_loss_from_notes(notes, note_type, accuracy)[-1] * loss
-            )
+            losses = get_achievement_loss_from_notes(notes, note_type, accuracy)
+            lower += losses[0] * loss
+            upper += losses[-1] * loss
     return (lower, upper)
 
 
@@ -168,15 +207,17 @@ def get_total_achievement_loss_from_song(
         LevelIndex | Literal["basic", "advanced", "expert", "master", "re_master"]
     ),
     loss_dict: dict[str, dict[str, int]],
-    song_type: SongType | Literal["dx", "standard"] = None,
+    song_type: SongType | Literal["dx", "standard", "utage"] = None,
+    side: Literal["left", "right"] = None,
 ) -> tuple[float, float]:
     """
     获取指定曲目在loss_dict情况下的达成率损失
 
     - loss_dict: 未达到满达成率的物量配置 e.g. {"tap":{"miss":1},"break":{"perfect":1}}
+    - side: 协力谱面计算哪一侧
     返回值: (达成率损失下限,达成率损失上限)
-
-    暂不支持utage
     """
-    notes = extract_notes(song, difficulty, song_type)
+    if metrics.state.current is not None:
+        metrics.count_call("get_total_achievement_loss_from_song")
+    notes = require_notes(extract_notes(song, difficulty, song_type, side))
     return get_total_achievement_loss_from_notes(notes, loss_dict)
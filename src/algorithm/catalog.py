@@ -0,0 +1,249 @@
+from ..util import (
+    Song,
+    SongType,
+    LevelIndex,
+    Notes,
+    BuddyNotes,
+    SongDifficulty,
+    Alias,
+)
+from .algorithm import _DIFFICULTY_LISTS, select_notes, str_to_difficulty
+from bisect import bisect_left, bisect_right, insort
+from operator import itemgetter
+from typing import Iterable, Literal
+
+ChartKey = tuple[int, SongType, LevelIndex]
+# 一组 Notes 的键：普通谱面同 ChartKey，协力谱面的每一侧在末尾加上 "left" / "right"
+NotesKey = ChartKey | tuple[int, SongType, LevelIndex, str]
+
+_level_value = itemgetter(0)
+
+
+def iter_difficulties(song: Song) -> Iterable[SongDifficulty]:
+    """
+    遍历曲目的所有谱面（standard、dx、utage）
+    """
+    difficulties = song.difficulties
+    if difficulties is None:
+        return
+    for difficulty_list in (difficulties.standard, difficulties.dx, difficulties.utage):
+        yield from difficulty_list or ()
+
+
+class SongCatalog:
+    """
+    曲目目录，一次性从 get_song_list + get_alias_list 构建，提供：
+
+    - (song_id, type, LevelIndex) -> SongDifficulty / Notes 的哈希索引
+    - 曲名 -> 曲目、别名 -> song_id 的哈希索引
+    - 按 level_value 排序的索引，支持定数范围查询
+
+    曲目列表更新时调用 update，只重建发生变化的曲目。
+    """
+
+    def __init__(
+        self,
+        songs: Iterable[Song] = (),
+        aliases: Iterable[Alias] = (),
+        version: int = None,
+    ):
+        self.version = version
+        self.songs: dict[int, Song] = {}
+        self.charts: dict[ChartKey, SongDifficulty] = {}
+        self._titles: dict[str, list[int]] = {}
+        self._aliases: dict[str, list[int]] = {}
+        self._song_aliases: dict[int, list[str]] = {}
+        self._by_level: list[tuple[float, ChartKey]] = []
+        for song in songs:
+            self._add_song(song)
+        self._set_aliases(aliases)
+
+    @classmethod
+    def from_api(
+        cls, song_list: dict, aliases: Iterable[Alias] = (), version: int = None
+    ) -> "SongCatalog":
+        """
+        从 get_song_list 的返回值与 get_alias_list 的返回值构建
+        """
+        return cls(song_list["songs"], aliases, version)
+
+    def __len__(self) -> int:
+        return len(self.songs)
+
+    def __contains__(self, song_id: int) -> bool:
+        return song_id in self.songs
+
+    # ===== 索引维护 =====
+    def _add_song(self, song: Song):
+        self.songs[song.id] = song
+        self._titles.setdefault(song.title.casefold(), []).append(song.id)
+        for diff in iter_difficulties(song):
+            key = (song.id, diff.type, diff.difficulty)
+            self.charts[key] = diff
+            if diff.level_value is not None:
+                insort(self._by_level, (diff.level_value, key), key=_level_value)
+
+    def _remove_song(self, song_id: int):
+        song = self.songs.pop(song_id)
+        title = song.title.casefold()
+        self._titles[title].remove(song_id)
+        if not self._titles[title]:
+            del self._titles[title]
+        for diff in iter_difficulties(song):
+            key = (song_id, diff.type, diff.difficulty)
+            self.charts.pop(key, None)
+            if diff.level_value is not None:
+                lo = bisect_left(self._by_level, diff.level_value, key=_level_value)
+                hi = bisect_right(self._by_level, diff.level_value, key=_level_value)
+                for i in range(lo, hi):
+                    if self._by_level[i][1] == key:
+                        del self._by_level[i]
+                        break
+
+    def _set_song_aliases(self, song_id: int, names: list[str]):
+        for name in self._song_aliases.pop(song_id, ()):
+            ids = self._aliases[name.casefold()]
+            ids.remove(song_id)
+            if not ids:
+                del self._aliases[name.casefold()]
+        if names:
+            self._song_aliases[song_id] = list(names)
+            for name in names:
+                self._aliases.setdefault(name.casefold(), []).append(song_id)
+
+    def _set_aliases(self, aliases: Iterable[Alias]):
+        aliases = {alias.song_id: alias.aliases for alias in aliases}
+        for song_id in self._song_aliases.keys() - aliases.keys():
+            self._set_song_aliases(song_id, [])
+        for song_id, names in aliases.items():
+            if self._song_aliases.get(song_id) != names:
+                self._set_song_aliases(song_id, names)
+
+    def update(
+        self,
+        songs: Iterable[Song],
+        aliases: Iterable[Alias] = None,
+        version: int = None,
+    ) -> set[int]:
+        """
+        按新的曲目列表增量更新索引，只重建新增、删除或内容变化的曲目
+        aliases 为 None 时保留原有别名，否则以其为完整的别名列表
+
+        返回值: 发生变化的 song_id 集合
+        """
+        songs = {song.id: song for song in songs}
+        changed = set(self.songs.keys() - songs.keys())
+        for song_id in changed:
+            self._remove_song(song_id)
+        for song_id, song in songs.items():
+            old = self.songs.get(song_id)
+            if old == song:
+                continue
+            if old is not None:
+                self._remove_song(song_id)
+            self._add_song(song)
+            changed.add(song_id)
+        if aliases is not None:
+            self._set_aliases(aliases)
+        if version is not None:
+            self.version = version
+        return changed
+
+    # ===== 查询 =====
+    def get_song(self, song_id: int) -> Song | None:
+        return self.songs.get(song_id)
+
+    def resolve_key(
+        self,
+        song_id: int,
+        difficulty: (
+            LevelIndex
+            | Literal["basic", "advanced", "expert", "master", "re_master"]
+            | int
+        ),
+        type: SongType | Literal["dx", "standard", "utage"] = None,
+    ) -> ChartKey | None:
+        """
+        将查询参数规范化为索引键，type 为 None 时与 extract_notes 一致：
+        仅当曲目只有一种谱面类型时自动选择
+        """
+        if isinstance(difficulty, str):
+            difficulty = str_to_difficulty(difficulty)
+        elif not isinstance(difficulty, LevelIndex):
+            difficulty = LevelIndex(difficulty)
+        if type is not None:
+            return (song_id, SongType(type), difficulty)
+        song = self.songs.get(song_id)
+        if song is None or song.difficulties is None:
+            return None
+        difficulties = song.difficulties
+        available = [t for t, get in _DIFFICULTY_LISTS.items() if get(difficulties)]
+        if len(available) != 1:
+            return None
+        return (song_id, available[0], difficulty)
+
+    def get_difficulty(
+        self,
+        song_id: int,
+        difficulty: (
+            LevelIndex
+            | Literal["basic", "advanced", "expert", "master", "re_master"]
+            | int
+        ),
+        type: SongType | Literal["dx", "standard", "utage"] = None,
+    ) -> SongDifficulty | None:
+        """
+        获取指定谱面
+        """
+        return self.charts.get(self.resolve_key(song_id, difficulty, type))
+
+    def get_notes(
+        self,
+        song_id: int,
+        difficulty: (
+            LevelIndex
+            | Literal["basic", "advanced", "expert", "master", "re_master"]
+            | int
+        ),
+        type: SongType | Literal["dx", "standard", "utage"] = None,
+        side: Literal["left", "right"] = None,
+    ) -> Notes | BuddyNotes | None:
+        """
+        获取指定谱面的 Notes，协力谱面指定 side 时返回对应一侧
+        """
+        diff = self.get_difficulty(song_id, difficulty, type)
+        return None if diff is None else select_notes(diff.notes, side)
+
+    def get_notes_by_key(self, key: NotesKey) -> Notes | BuddyNotes | None:
+        """
+        按 NotesKey（NotesBatch / LossTable 的行键）获取 Notes
+        """
+        diff = self.charts.get(key[:3])
+        if diff is None:
+            return None
+        return select_notes(diff.notes, key[3] if len(key) > 3 else None)
+
+    def find_by_title(self, title: str) -> list[Song]:
+        """
+        按曲名查找（不区分大小写），同名曲目可能有多首
+        """
+        return [self.songs[i] for i in self._titles.get(title.casefold(), ())]
+
+    def find_by_alias(self, alias: str) -> list[int]:
+        """
+        按别名查找 song_id（不区分大小写）
+        """
+        return list(self._aliases.get(alias.casefold(), ()))
+
+    def charts_in_range(
+        self,
+        min_level_value: float,
+        max_level_value: float = float("inf"),
+    ) -> list[tuple[ChartKey, SongDifficulty]]:
+        """
+        获取定数在 [min_level_value, max_level_value] 内的所有谱面，按定数升序
+        e.g. charts_in_range(14.6) 获取所有 14+ 及以上谱面
+        """
+        lo = bisect_left(self._by_level, min_level_value, key=_level_value)
+        hi = bisect_right(self._by_level, max_level_value, key=_level_value)
+        return [(key, self.charts[key]) for _, key in self._by_level[lo:hi]]
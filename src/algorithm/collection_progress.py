@@ -0,0 +1,211 @@
+from ..util import (
+    Collection,
+    CollectionRequired,
+    FCType,
+    FSType,
+    LevelIndex,
+    RateType,
+    Score,
+    SongType,
+)
+from dataclasses import dataclass
+from typing import Iterable
+
+# 评级 / FC / FS 的等级，越好越大，0 表示没有（或不要求）
+_RATE_RANK = {member: rank for rank, member in enumerate(reversed(RateType), 1)}
+_FC_RANK = {member: rank for rank, member in enumerate(reversed(FCType), 1)}
+_FS_RANK = {member: rank for rank, member in enumerate(reversed(FSType), 1)}
+
+# 要求中的谱面：未指定难度的要求以 None 作为难度，该曲目任意难度满足即可
+RequiredKey = tuple[int, SongType, LevelIndex | None]
+
+
+@dataclass(slots=True)
+class _Requirement:
+    collection: int
+    rate: int
+    fc: int
+    fs: int
+    keys: list[RequiredKey]
+
+    @property
+    def full(self) -> int:
+        return (1 << len(self.keys)) - 1
+
+    def satisfied_by(self, rate: int, fc: int, fs: int) -> bool:
+        return rate >= self.rate and fc >= self.fc and fs >= self.fs
+
+
+@dataclass(slots=True)
+class CollectionProgress:
+    """
+    单个收藏品的完成进度，completed / total 为已满足的谱面数 / 要求的谱面数
+    """
+
+    collection: Collection
+    completed: int
+    total: int
+    missing: list[RequiredKey]
+
+    @property
+    def done(self) -> bool:
+        return self.completed == self.total
+
+    @property
+    def ratio(self) -> float:
+        return self.completed / self.total if self.total else 1.0
+
+
+def _required_keys(required: CollectionRequired) -> list[RequiredKey]:
+    levels = required.difficulties or [None]
+    return list(
+        dict.fromkeys(
+            (song.id, song.type, level)
+            for song in required.songs or ()
+            for level in levels
+        )
+    )
+
+
+class CollectionIndex:
+    """
+    收藏品（姓名框、头像、背景等）解锁要求的预计算索引，每个版本的列表只需构建一次。
+
+    每个要求的谱面在该要求中占一位，谱面 -> (要求, 位) 的哈希索引使得
+    一份成绩只需查一次表，不需要逐个要求遍历玩家的成绩列表。
+    没有曲目要求（songs 为空）的条件无法由成绩判断，不计入进度。
+    """
+
+    def __init__(self, collections: Iterable[Collection]):
+        self.collections: list[Collection] = []
+        self._requirements: list[_Requirement] = []
+        # 收藏品 -> 其要求在 _requirements 中的下标
+        self._by_collection: list[list[int]] = []
+        self._positions: dict[int, int] = {}
+        self._by_key: dict[RequiredKey, list[tuple[int, int]]] = {}
+        for collection in collections:
+            self._add_collection(collection)
+
+    def _add_collection(self, collection: Collection):
+        requirements = []
+        for required in collection.required or ():
+            keys = _required_keys(required)
+            if not keys:
+                continue
+            requirement = _Requirement(
+                len(self.collections),
+                _RATE_RANK.get(required.rate, 0),
+                _FC_RANK.get(required.fc, 0),
+                _FS_RANK.get(required.fs, 0),
+                keys,
+            )
+            for bit, key in enumerate(keys):
+                self._by_key.setdefault(key, []).append((len(self._requirements), bit))
+            requirements.append(len(self._requirements))
+            self._requirements.append(requirement)
+        if requirements:
+            self._positions[collection.id] = len(self.collections)
+            self.collections.append(collection)
+            self._by_collection.append(requirements)
+
+    def __len__(self) -> int:
+        return len(self.collections)
+
+    def __contains__(self, collection_id: int) -> bool:
+        return collection_id in self._positions
+
+    def progress(self, scores: Iterable[Score] = ()) -> "PlayerProgress":
+        """
+        一次遍历 scores 计算玩家的进度，之后可用 PlayerProgress.update 增量更新
+        """
+        progress = PlayerProgress(self)
+        progress.update(scores)
+        return progress
+
+
+class PlayerProgress:
+    """
+    单个玩家的收藏品进度，masks[i] 为第 i 个要求中已满足的谱面位集合。
+
+    成绩只会变好，已满足的谱面不会变为未满足，因此新成绩只需按位或入。
+    """
+
+    def __init__(self, index: CollectionIndex):
+        self.index = index
+        self.masks = [0] * len(index._requirements)
+
+    def update(self, scores: Iterable[Score]) -> set[int]:
+        """
+        加入新的成绩
+
+        返回值: 进度发生变化的收藏品 id 集合
+        """
+        by_key, requirements, masks = (
+            self.index._by_key,
+            self.index._requirements,
+            self.masks,
+        )
+        changed = set()
+        for score in scores:
+            if score.type is None:
+                continue
+            entries = by_key.get((score.id, score.type, score.level_index), ())
+            any_level = by_key.get((score.id, score.type, None))
+            if any_level:
+                entries = [*entries, *any_level]
+            if not entries:
+                continue
+            rate = _RATE_RANK.get(score.rate, 0)
+            fc = _FC_RANK.get(score.fc, 0)
+            fs = _FS_RANK.get(score.fs, 0)
+            for position, bit in entries:
+                requirement = requirements[position]
+                if masks[position] >> bit & 1 or not requirement.satisfied_by(
+                    rate, fc, fs
+                ):
+                    continue
+                masks[position] |= 1 << bit
+                changed.add(requirement.collection)
+        return {self.index.collections[i].id for i in changed}
+
+    def get(self, collection_id: int) -> CollectionProgress | None:
+        """
+        获取指定收藏品的进度，收藏品不在索引中时返回 None
+        """
+        position = self.index._positions.get(collection_id)
+        if position is None:
+            return None
+        return self._progress(position)
+
+    def _progress(self, position: int) -> CollectionProgress:
+        completed = total = 0
+        missing = []
+        for i in self.index._by_collection[position]:
+            requirement, mask = self.index._requirements[i], self.masks[i]
+            completed += mask.bit_count()
+            total += len(requirement.keys)
+            missing.extend(
+                key for bit, key in enumerate(requirement.keys) if not mask >> bit & 1
+            )
+        return CollectionProgress(
+            self.index.collections[position], completed, total, missing
+        )
+
+    def is_done(self, collection_id: int) -> bool:
+        position = self.index._positions[collection_id]
+        return all(
+            self.masks[i] == self.index._requirements[i].full
+            for i in self.index._by_collection[position]
+        )
+
+    def completed(self) -> list[Collection]:
+        """
+        已完成的收藏品
+        """
+        return [c for c in self.index.collections if self.is_done(c.id)]
+
+    def report(self) -> list[CollectionProgress]:
+        """
+        所有收藏品的进度，顺序与索引中的收藏品一致
+        """
+        return [self._progress(i) for i in range(len(self.index.collections))]
@@ -0,0 +1,201 @@
+from ..util import (
+    SongType,
+    LevelIndex,
+)
+from .algorithm import LOSS_COEFFICIENTS, str_to_difficulty
+from .catalog import NotesKey, SongCatalog
+from .. import metrics
+from .vectorized import LOSS_KEYS, NotesBatch, loss_scales, pack_loss_dicts
+from typing import Literal
+import os
+import numpy as np
+
+_SONG_TYPES = list(SongType)
+# 保存时协力谱面的位置编码，0 为普通谱面
+_SIDES = [None, "left", "right"]
+
+# 所有判定的损失系数依次展开为 V 列，每个 LOSS_KEYS 对应其中连续的一段
+_VARIANTS = np.array([ab for c in LOSS_COEFFICIENTS.values() for ab in c], float)
+
+
+def _variant_slices() -> dict[tuple[str, str], slice]:
+    slices, offset = {}, 0
+    for key, coefficients in LOSS_COEFFICIENTS.items():
+        slices[key] = slice(offset, offset + len(coefficients))
+        offset += len(coefficients)
+    return slices
+
+
+_VARIANT_SLICES = _variant_slices()
+_LOWER_COLUMNS = np.array([_VARIANT_SLICES[key].start for key in LOSS_KEYS])
+_UPPER_COLUMNS = np.array([_VARIANT_SLICES[key].stop - 1 for key in LOSS_KEYS])
+
+
+class LossTable:
+    """
+    目录中所有谱面的达成率损失系数表，每个目录版本只需构建一次。
+
+    coefficients[i, v] 为第 i 个谱面中单个 Note 在第 v 种判定情况下的达成率损失，
+    查询 loss_dict 的总损失只需一次点积，不需要网络请求。没有 break 的谱面
+    break 相关的系数为 nan。行键同 NotesBatch，协力谱面的左右两侧各占一行。
+    """
+
+    def __init__(self, keys: list[NotesKey], coefficients: np.ndarray, version=None):
+        self.keys = keys
+        self.coefficients = coefficients
+        self.version = version
+        self.index = {key: row for row, key in enumerate(keys)}
+        self._song_types: dict[int, set[SongType]] = {}
+        for song_id, song_type, *_ in keys:
+            self._song_types.setdefault(song_id, set()).add(song_type)
+
+    @classmethod
+    def from_catalog(cls, catalog: SongCatalog) -> "LossTable":
+        batch = NotesBatch.from_catalog(catalog)
+        x, y = loss_scales(batch.notes)
+        # b 为 0 的判定不引入 y，避免无 break 谱面的其他判定也变为 nan
+        by = np.where(_VARIANTS[:, 1] == 0, 0.0, y[:, None] * _VARIANTS[:, 1])
+        coefficients = x[:, None] * _VARIANTS[:, 0] + by
+        return cls(batch.keys, coefficients, catalog.version)
+
+    # ===== 序列化 =====
+    def save(self, path: str):
+        song_ids, types, levels = (
+            zip(*(key[:3] for key in self.keys)) if self.keys else ((), (), ())
+        )
+        sides = [_SIDES.index(key[3] if len(key) > 3 else None) for key in self.keys]
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                song_ids=np.array(song_ids, dtype=np.int64),
+                types=np.array([_SONG_TYPES.index(t) for t in types], dtype=np.int8),
+                levels=np.array([level.value for level in levels], dtype=np.int8),
+                sides=np.array(sides, dtype=np.int8),
+                coefficients=self.coefficients,
+                loss_keys=np.array([f"{t}:{a}" for t, a in LOSS_KEYS]),
+                version=np.array(-1 if self.version is None else self.version),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "LossTable":
+        with np.load(path) as data:
+            if list(data["loss_keys"]) != [f"{t}:{a}" for t, a in LOSS_KEYS]:
+                raise ValueError(f"{path} 的损失系数布局与当前版本不一致")
+            # 旧版本的系数表没有 sides，均为普通谱面
+            sides = data["sides"] if "sides" in data else np.zeros_like(data["types"])
+            keys = [
+                (int(song_id), _SONG_TYPES[t], LevelIndex(int(level)))
+                + (() if side == 0 else (_SIDES[side],))
+                for song_id, t, level, side in zip(
+                    data["song_ids"], data["types"], data["levels"], sides
+                )
+            ]
+            version = int(data["version"])
+            return cls(keys, data["coefficients"], None if version == -1 else version)
+
+    @classmethod
+    def load_or_build(cls, catalog: SongCatalog, path: str) -> "LossTable":
+        """
+        path 中已有同一目录版本的系数表时直接读取，否则重新构建并保存
+        """
+        if os.path.exists(path):
+            table = cls.load(path)
+            if catalog.version is not None and table.version == catalog.version:
+                return table
+        table = cls.from_catalog(catalog)
+        table.save(path)
+        return table
+
+    # ===== 查询 =====
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def resolve_row(
+        self,
+        song_id: int,
+        difficulty: (
+            LevelIndex
+            | Literal["basic", "advanced", "expert", "master", "re_master"]
+            | int
+        ),
+        song_type: SongType | Literal["dx", "standard", "utage"] = None,
+        side: Literal["left", "right"] = None,
+    ) -> int:
+        """
+        获取谱面所在行，song_type 为 None 时要求曲目只有一种谱面类型；
+        协力谱面需要通过 side 指定哪一侧
+        """
+        if isinstance(difficulty, str):
+            difficulty = str_to_difficulty(difficulty)
+        elif not isinstance(difficulty, LevelIndex):
+            difficulty = LevelIndex(difficulty)
+        if song_type is None:
+            types = self._song_types.get(song_id, set())
+            if len(types) != 1:
+                raise KeyError((song_id, None, difficulty))
+            (song_type,) = types
+        key = (song_id, SongType(song_type), difficulty)
+        if side is not None and key not in self.index:
+            key = (*key, side)
+        return self.index[key]
+
+    def get_achievement_loss(
+        self,
+        song_id: int,
+        difficulty: (
+            LevelIndex | Literal["basic", "advanced", "expert", "master", "re_master"]
+        ),
+        note_type: Literal["tap", "hold", "slide", "break"],
+        accuracy: Literal["critical_perfect", "perfect", "great", "good", "miss"],
+        song_type: SongType | Literal["dx", "standard", "utage"] = None,
+        side: Literal["left", "right"] = None,
+    ) -> tuple[float] | tuple[float, float] | tuple[float, float, float]:
+        """
+        同 get_achievement_loss_from_song，从系数表中读取
+        """
+        row = self.resolve_row(song_id, difficulty, song_type, side)
+        columns = _VARIANT_SLICES[(note_type, accuracy)]
+        return tuple(self.coefficients[row, columns].tolist())
+
+    def get_total_achievement_loss(
+        self,
+        song_id: int,
+        difficulty: (
+            LevelIndex | Literal["basic", "advanced", "expert", "master", "re_master"]
+        ),
+        loss_dict: dict[str, dict[str, int]],
+        song_type: SongType | Literal["dx", "standard", "utage"] = None,
+        side: Literal["left", "right"] = None,
+    ) -> tuple[float, float]:
+        """
+        同 get_total_achievement_loss_from_song，从系数表中计算点积
+
+        返回值: (达成率损失下限,达成率损失上限)
+        """
+        if metrics.state.current is not None:
+            metrics.count_call("LossTable.get_total_achievement_loss")
+        row = self.coefficients[self.resolve_row(song_id, difficulty, song_type, side)]
+        counts = pack_loss_dicts([loss_dict])[0]
+        used = counts != 0
+        lower = row[_LOWER_COLUMNS[used]] @ counts[used]
+        upper = row[_UPPER_COLUMNS[used]] @ counts[used]
+        return (float(lower), float(upper))
+
+    def total_achievement_loss(
+        self, loss_dicts: list[dict[str, dict[str, int]]]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        计算所有谱面在 M 种 loss_dict 下的达成率损失，形状均为 N×M
+        """
+        if metrics.state.current is not None:
+            metrics.count_call("LossTable.total_achievement_loss")
+        counts = pack_loss_dicts(loss_dicts)
+        result = []
+        for columns in (_LOWER_COLUMNS, _UPPER_COLUMNS):
+            table = self.coefficients[:, columns]
+            missing = np.isnan(table)
+            loss = np.where(missing, 0.0, table) @ counts.T
+            # 用到了无定义系数（无 break 谱面的 break 判定）的结果为 nan
+            loss[(missing.astype(float) @ (counts != 0).T) > 0] = np.nan
+            result.append(loss)
+        return result[0], result[1]
@@ -0,0 +1,157 @@
+from ..util import (
+    SongType,
+    LevelIndex,
+    Notes,
+)
+from .algorithm import get_total_achievement_loss_from_notes
+from .catalog import SongCatalog
+from itertools import count, islice
+from typing import Callable, Iterable, Iterator, Literal, TypeVar
+import multiprocessing
+import os
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# 子进程中的曲目目录，按 ParallelRunner 的 id 区分：fork 时直接继承父进程的对象，
+# 其他启动方式由 initializer 设置一次。多个执行器并存时互不覆盖
+_catalogs: dict[int, SongCatalog] = {}
+_runner_ids = count()
+
+# (song_id, difficulty, song_type, loss_dict[, side])，song_type 可为 None，
+# 协力谱面通过 side（"left" / "right"）指定计算哪一侧
+LossQuery = (
+    tuple[
+        int,
+        LevelIndex | Literal["basic", "advanced", "expert", "master", "re_master"],
+        SongType | Literal["dx", "standard", "utage"] | None,
+        dict[str, dict[str, int]],
+    ]
+    | tuple[
+        int,
+        LevelIndex | Literal["basic", "advanced", "expert", "master", "re_master"],
+        SongType | Literal["dx", "standard", "utage"] | None,
+        dict[str, dict[str, int]],
+        Literal["left", "right"] | None,
+    ]
+)
+
+
+def _init_worker(runner_id: int, catalog: SongCatalog):
+    _catalogs[runner_id] = catalog
+
+
+def _run_chunk(task: tuple[int, Callable, list]) -> list:
+    runner_id, func, chunk = task
+    catalog = _catalogs[runner_id]
+    return [func(catalog, item) for item in chunk]
+
+
+def _chunks(items: Iterable[T], size: int) -> Iterator[list[T]]:
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def total_achievement_loss_task(
+    catalog: SongCatalog, query: LossQuery
+) -> tuple[float, float] | None:
+    """
+    ParallelRunner 任务：计算单个谱面在 loss_dict 下的达成率损失，
+    谱面不存在或协力谱面未指定 side 时为 None
+    """
+    song_id, difficulty, song_type, loss_dict = query[:4]
+    side = query[4] if len(query) > 4 else None
+    notes = catalog.get_notes(song_id, difficulty, song_type, side)
+    if not isinstance(notes, Notes):
+        return None
+    return get_total_achievement_loss_from_notes(notes, loss_dict)
+
+
+class ParallelRunner:
+    """
+    多进程分析执行器，用于对大量 (玩家, 谱面) 组合批量运行算法。
+
+    曲目目录在每个子进程中只传递一次：fork 启动时子进程直接继承父进程的目录，
+    其他启动方式通过 initializer 在子进程启动时反序列化一次，任务本身只传递查询参数。
+    任务按 chunk_size 分块调度，结果顺序与输入一致。
+
+    任务函数的签名为 func(catalog, item)，必须定义在模块顶层以便子进程导入。
+    """
+
+    def __init__(
+        self,
+        catalog: SongCatalog,
+        workers: int = None,
+        chunk_size: int = 256,
+        start_method: str = None,
+    ):
+        """
+        - workers: 子进程数，默认为 CPU 核数
+        - chunk_size: 每个任务块包含的条目数
+        - start_method: 进程启动方式，默认优先使用 fork
+        """
+        if start_method is None:
+            methods = multiprocessing.get_all_start_methods()
+            start_method = "fork" if "fork" in methods else methods[0]
+        self.catalog = catalog
+        self._id = next(_runner_ids)
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        context = multiprocessing.get_context(start_method)
+        if start_method == "fork":
+            # 先登记目录再创建进程池，子进程继承时不需要序列化
+            _init_worker(self._id, catalog)
+            self._pool = context.Pool(self.workers)
+        else:
+            self._pool = context.Pool(self.workers, _init_worker, (self._id, catalog))
+
+    def imap(
+        self,
+        func: Callable[[SongCatalog, T], R],
+        items: Iterable[T],
+        progress: Callable[[int, int | None], None] = None,
+    ) -> Iterator[R]:
+        """
+        按输入顺序逐个产生 func(catalog, item) 的结果
+
+        - progress: 每完成一个任务块调用一次 progress(已完成条数, 总条数)，
+          items 没有长度时总条数为 None
+        """
+        total = len(items) if hasattr(items, "__len__") else None
+        done = 0
+        tasks = ((self._id, func, chunk) for chunk in _chunks(items, self.chunk_size))
+        for results in self._pool.imap(_run_chunk, tasks):
+            done += len(results)
+            if progress is not None:
+                progress(done, total)
+            yield from results
+
+    def map(
+        self,
+        func: Callable[[SongCatalog, T], R],
+        items: Iterable[T],
+        progress: Callable[[int, int | None], None] = None,
+    ) -> list[R]:
+        return list(self.imap(func, items, progress))
+
+    def total_achievement_loss(
+        self,
+        queries: Iterable[LossQuery],
+        progress: Callable[[int, int | None], None] = None,
+    ) -> list[tuple[float, float] | None]:
+        """
+        并行计算一批 (song_id, difficulty, song_type, loss_dict) 的达成率损失
+        """
+        return self.map(total_achievement_loss_task, queries, progress)
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
+        _catalogs.pop(self._id, None)
+
+    def __enter__(self) -> "ParallelRunner":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
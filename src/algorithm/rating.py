@@ -0,0 +1,203 @@
+from ..util import (
+    Score,
+    SongType,
+    SongDifficulty,
+)
+from .catalog import SongCatalog
+from .. import metrics
+from dataclasses import dataclass, field
+from typing import Iterable, Sequence
+from bisect import bisect_right
+from itertools import repeat
+from operator import attrgetter
+import heapq
+import numpy as np
+
+# (达成率下限, 系数)，按达成率从高到低排列
+RANK_FACTORS: tuple[tuple[float, float], ...] = (
+    (100.5, 22.4),
+    (100.4999, 22.2),
+    (100.0, 21.6),
+    (99.9999, 21.4),
+    (99.5, 21.1),
+    (99.0, 20.8),
+    (98.9999, 20.6),
+    (98.0, 20.3),
+    (97.0, 20.0),
+    (96.9999, 17.6),
+    (94.0, 16.8),
+    (90.0, 15.2),
+    (80.0, 13.6),
+    (79.9999, 12.8),
+    (75.0, 12.0),
+    (70.0, 11.2),
+    (60.0, 9.6),
+    (50.0, 8.0),
+    (40.0, 6.4),
+    (30.0, 4.8),
+    (20.0, 3.2),
+    (10.0, 1.6),
+    (0.0, 0.0),
+)
+
+# 以整数计算避免浮点误差：达成率 ×10000，定数与系数 ×10，按达成率升序排列
+_THRESHOLD_LIST = [round(t * 10000) for t, _ in reversed(RANK_FACTORS)]
+_FACTOR_LIST = [round(f * 10) for _, f in reversed(RANK_FACTORS)]
+_THRESHOLDS = np.array(_THRESHOLD_LIST)
+_FACTORS = np.array(_FACTOR_LIST)
+_MAX_ACHIEVEMENTS = 1005000
+_SCALE = 10 * 10 * 10000 * 100
+
+
+def get_rating(level_value: float, achievements: float) -> int:
+    """
+    计算单曲 Rating：定数 × min(达成率, 100.5) × 系数 / 100，向下取整
+    """
+    achievements = round(achievements * 10000)
+    factor = _FACTOR_LIST[bisect_right(_THRESHOLD_LIST, achievements) - 1]
+    return (
+        round(level_value * 10) * factor * min(achievements, _MAX_ACHIEVEMENTS)
+    ) // _SCALE
+
+
+@dataclass(slots=True)
+class RatingEntry:
+    score: Score
+    difficulty: SongDifficulty
+    rating: int
+
+
+# 以枚举的原始值作为键，避免对枚举成员调用 Python 层的 __hash__
+_score_key = attrgetter("id", "type._value_", "level_index._value_")
+_score_achievements = attrgetter("achievements")
+
+
+def _entry_key(entry: RatingEntry) -> tuple[int, float]:
+    return (entry.rating, entry.score.achievements)
+
+
+@dataclass(slots=True)
+class Best50:
+    """
+    standard 为旧版本谱面的最佳成绩（B35），dx 为当前版本谱面的最佳成绩（B15）
+    """
+
+    standard: list[RatingEntry] = field(default_factory=list)
+    dx: list[RatingEntry] = field(default_factory=list)
+
+    @property
+    def standard_total(self) -> int:
+        return sum(entry.rating for entry in self.standard)
+
+    @property
+    def dx_total(self) -> int:
+        return sum(entry.rating for entry in self.dx)
+
+    @property
+    def total(self) -> int:
+        return self.standard_total + self.dx_total
+
+
+class RatingEngine:
+    """
+    基于曲目目录的 Rating 计算引擎。
+
+    成绩通过 (id, type, level_index) 在目录索引中找到谱面定数与版本，
+    谱面版本不低于 current_version 的计入当前版本（B15），其余计入旧版本（B35）。
+    """
+
+    def __init__(
+        self,
+        catalog: SongCatalog,
+        current_version: int = None,
+        standard_count: int = 35,
+        dx_count: int = 15,
+    ):
+        self.catalog = catalog
+        self.standard_count = standard_count
+        self.dx_count = dx_count
+        if current_version is None:
+            current_version = max(
+                (diff.version or 0 for diff in catalog.charts.values()), default=0
+            )
+        self.current_version = current_version
+        # 谱面行号与按行排列的定数（×10）、是否当前版本，供批量计算使用
+        self._rows = {}
+        level_values, is_new = [], []
+        for key, diff in catalog.charts.items():
+            if key[1] is SongType.UTAGE or diff.level_value is None:
+                continue
+            self._rows[(key[0], key[1].value, key[2].value)] = len(level_values)
+            level_values.append(round(diff.level_value * 10))
+            is_new.append((diff.version or 0) >= current_version)
+        self._level_values = np.array(level_values, dtype=np.int64)
+        self._is_new = np.array(is_new, dtype=bool)
+
+    def rate(self, score: Score) -> RatingEntry | None:
+        """
+        计算单条成绩的 Rating，找不到谱面时返回 None
+        """
+        diff = self.catalog.charts.get((score.id, score.type, score.level_index))
+        if diff is None or diff.level_value is None or score.type is SongType.UTAGE:
+            return None
+        return RatingEntry(
+            score, diff, get_rating(diff.level_value, score.achievements)
+        )
+
+    def best50(self, scores: Iterable[Score]) -> Best50:
+        """
+        计算单个玩家的 B50，使用堆进行部分选择
+        """
+        if metrics.state.current is not None:
+            metrics.count_call("RatingEngine.best50")
+        standard, dx = [], []
+        for score in scores:
+            entry = self.rate(score)
+            if entry is not None:
+                is_new = (entry.difficulty.version or 0) >= self.current_version
+                (dx if is_new else standard).append(entry)
+        return Best50(
+            heapq.nlargest(self.standard_count, standard, key=_entry_key),
+            heapq.nlargest(self.dx_count, dx, key=_entry_key),
+        )
+
+    def batch_ratings(self, players: Sequence[Iterable[Score]]) -> np.ndarray:
+        """
+        批量计算多个玩家的 Rating
+
+        返回值: 形状为 P×3 的数组，每行为 (总 Rating, B35 合计, B15 合计)
+        """
+        if metrics.state.current is not None:
+            metrics.count_call("RatingEngine.batch_ratings")
+        player_index, rows, achievements = [], [], []
+        for i, scores in enumerate(players):
+            scores = [score for score in scores if score.type is not None]
+            rows.extend(map(self._rows.get, map(_score_key, scores), repeat(-1)))
+            achievements.extend(map(_score_achievements, scores))
+            player_index.extend(repeat(i, len(scores)))
+        rows = np.array(rows, dtype=np.int64)
+        found = rows >= 0
+        rows = rows[found]
+        player_index = np.array(player_index, dtype=np.int64)[found]
+        achievements = np.array(achievements, dtype=np.float64)[found]
+        achievements = np.round(achievements * 10000).astype(np.int64)
+
+        factors = _FACTORS[np.searchsorted(_THRESHOLDS, achievements, "right") - 1]
+        ratings = (
+            self._level_values[rows]
+            * factors
+            * np.minimum(achievements, _MAX_ACHIEVEMENTS)
+            // _SCALE
+        )
+        # 每个玩家拆为旧版本 / 当前版本两组，组内按 Rating 降序排名后取前 N
+        groups = player_index * 2 + self._is_new[rows]
+        order = np.lexsort((-ratings, groups))
+        groups, ratings = groups[order], ratings[order]
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        lengths = np.diff(np.r_[starts, len(groups)])
+        ranks = np.arange(len(groups)) - np.repeat(starts, lengths)
+        limits = np.where(groups % 2 == 1, self.dx_count, self.standard_count)
+        kept = np.where(ranks < limits, ratings, 0)
+        totals = np.bincount(groups, weights=kept, minlength=2 * len(players))
+        totals = totals.reshape(-1, 2).astype(np.int64)
+        return np.column_stack((totals.sum(axis=1), totals[:, 0], totals[:, 1]))
@@ -0,0 +1,227 @@
+from ..util import (
+    Song,
+    Alias,
+)
+from .catalog import SongCatalog
+from collections import Counter
+from dataclasses import dataclass
+from heapq import nlargest
+from typing import Iterable, Literal
+import unicodedata
+
+# 片假名（ァ~ヶ）与平假名（ぁ~ゖ）的码位差
+_KANA_OFFSET = ord("ァ") - ord("ぁ")
+_KATAKANA_TO_HIRAGANA = {
+    code: code - _KANA_OFFSET for code in range(ord("ァ"), ord("ヶ") + 1)
+}
+
+
+def normalize(text: str) -> str:
+    """
+    将曲名 / 别名规范化为检索用的形式：NFKC（全角转半角等）、casefold、
+    片假名转平假名，并去掉空白与标点符号；全是符号的名称只去掉空白
+    e.g. normalize("ＰＡＮＤＯＲＡ パラドクス") == "pandoraぱらどくす"
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = text.translate(_KATAKANA_TO_HIRAGANA)
+    folded = "".join(ch for ch in text if ch.isalnum())
+    return folded or "".join(text.split())
+
+
+def ngrams(text: str) -> set[str]:
+    """
+    规范化后名称的 n-gram：单个字符的名称为其本身，否则为所有相邻两个字符
+    """
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+@dataclass(slots=True)
+class _Entry:
+    song_id: int
+    name: str
+    kind: Literal["title", "alias"]
+    normalized: str
+    grams: set[str]
+
+
+@dataclass(slots=True)
+class SearchHit:
+    """
+    搜索结果：name 为匹配到的原始曲名或别名
+    """
+
+    song_id: int
+    score: float
+    name: str
+    kind: Literal["title", "alias"]
+
+
+class SongSearchIndex:
+    """
+    曲名与别名的模糊搜索索引。
+
+    名称规范化后拆为 n-gram 建立倒排索引，查询只需遍历查询中各 n-gram 的倒排表，
+    按 Dice 系数（共同 n-gram 数 * 2 / 两者 n-gram 数之和）排序，完全一致、
+    前缀与子串匹配额外加分。别名列表更新时调用 set_aliases 只重建变化的曲目。
+    """
+
+    def __init__(self, songs: Iterable[Song] = (), aliases: Iterable[Alias] = ()):
+        self._entries: dict[int, _Entry] = {}
+        self._postings: dict[str, set[int]] = {}
+        # 单个字符 -> 包含它的名称，用于单字查询
+        self._chars: dict[str, set[int]] = {}
+        self._titles: dict[int, list[int]] = {}
+        self._aliases: dict[int, list[int]] = {}
+        self._song_aliases: dict[int, list[str]] = {}
+        self._next_id = 0
+        for song in songs:
+            self.add_song(song)
+        self.set_aliases(aliases)
+
+    @classmethod
+    def from_catalog(cls, catalog: SongCatalog) -> "SongSearchIndex":
+        index = cls(catalog.songs.values())
+        for song_id, names in catalog._song_aliases.items():
+            index.set_song_aliases(song_id, names)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ===== 索引维护 =====
+    def _add_entry(self, song_id: int, name: str, kind: str) -> int | None:
+        normalized = normalize(name)
+        if not normalized:
+            return None
+        entry_id, self._next_id = self._next_id, self._next_id + 1
+        entry = _Entry(song_id, name, kind, normalized, ngrams(normalized))
+        self._entries[entry_id] = entry
+        for gram in entry.grams:
+            self._postings.setdefault(gram, set()).add(entry_id)
+        for char in set(normalized):
+            self._chars.setdefault(char, set()).add(entry_id)
+        return entry_id
+
+    def _remove_entries(self, entry_ids: Iterable[int]):
+        for entry_id in entry_ids:
+            entry = self._entries.pop(entry_id)
+            for postings, keys in (
+                (self._postings, entry.grams),
+                (self._chars, set(entry.normalized)),
+            ):
+                for key in keys:
+                    posting = postings[key]
+                    posting.discard(entry_id)
+                    if not posting:
+                        del postings[key]
+
+    def add_song(self, song: Song):
+        """
+        加入或替换曲目的曲名
+        """
+        self._remove_entries(self._titles.pop(song.id, ()))
+        entry_id = self._add_entry(song.id, song.title, "title")
+        self._titles[song.id] = [] if entry_id is None else [entry_id]
+
+    def remove_song(self, song_id: int):
+        """
+        移除曲目的曲名与别名
+        """
+        self._remove_entries(self._titles.pop(song_id, ()))
+        self.set_song_aliases(song_id, [])
+
+    def set_song_aliases(self, song_id: int, names: list[str]):
+        """
+        替换单个曲目的别名，名称没有变化时不做任何事
+        """
+        if self._song_aliases.get(song_id, []) == names:
+            return
+        self._remove_entries(self._aliases.pop(song_id, ()))
+        self._song_aliases.pop(song_id, None)
+        if names:
+            self._song_aliases[song_id] = list(names)
+            entry_ids = (self._add_entry(song_id, name, "alias") for name in names)
+            self._aliases[song_id] = [i for i in entry_ids if i is not None]
+
+    def set_aliases(self, aliases: Iterable[Alias]) -> set[int]:
+        """
+        以 aliases 为完整的别名列表增量更新，只重建别名发生变化的曲目
+
+        返回值: 别名发生变化的 song_id 集合
+        """
+        aliases = {alias.song_id: alias.aliases for alias in aliases}
+        changed = set(self._song_aliases.keys() - aliases.keys())
+        for song_id in changed:
+            self.set_song_aliases(song_id, [])
+        for song_id, names in aliases.items():
+            if self._song_aliases.get(song_id, []) != names:
+                self.set_song_aliases(song_id, names)
+                changed.add(song_id)
+        return changed
+
+    # ===== 查询 =====
+    def search(
+        self, query: str, limit: int = 10, min_score: float = 0.3
+    ) -> list[SearchHit]:
+        """
+        模糊搜索曲目，返回得分最高的 limit 首曲目（每首曲目只取得分最高的名称）
+
+        - min_score: 最低得分，Dice 系数在 [0, 1] 之间，完全一致为 3，前缀为 2 起
+
+        耗时与候选名称数成正比：一般查询在 1 ms 以内，单字或两字的常见查询
+        命中的名称多且无法提前结束，约为 1~2 ms
+        """
+        normalized = normalize(query)
+        query_grams = ngrams(normalized)
+        if not query_grams:
+            return []
+        counts = Counter()
+        if len(normalized) == 1:
+            # 单字查询：包含该字的名称（已包括同名的单字名称）均视为 1 个共同 n-gram，
+            # 再按完全一致 / 前缀 / 子串规则加分
+            counts.update(self._chars.get(normalized, ()))
+        else:
+            for gram in query_grams:
+                counts.update(self._postings.get(gram, ()))
+
+        entries, size = self._entries, len(query_grams)
+        # Dice 系数不低于 min_score 所需的最少共同 n-gram 数（名称至少有 1 个 n-gram）
+        least = min_score * (size + 1) / 2
+        threshold, previous = min_score, None
+        best: dict[int, tuple[float, int]] = {}
+        # 按共同 n-gram 数从多到少处理，剩余候选的得分上限低于当前第 limit 名时提前结束
+        for entry_id, common in counts.most_common():
+            if common != previous:
+                previous = common
+                if len(best) >= limit:
+                    kth = nlargest(limit, (score for score, _ in best.values()))[-1]
+                    threshold = max(threshold, kth)
+                bound = 3 if common == size else 2 * common / (size + common)
+                if common < least or bound < threshold:
+                    break
+            entry = entries[entry_id]
+            score = 2 * common / (size + len(entry.grams))
+            if common == size:
+                # 查询的 n-gram 全部出现时再比较字符串，判断完全一致 / 前缀 / 子串
+                if entry.normalized == normalized:
+                    score += 2
+                elif entry.normalized.startswith(normalized):
+                    score += 1
+                elif normalized in entry.normalized:
+                    score += 0.5
+            if score >= min_score and score > best.get(entry.song_id, (-1, 0))[0]:
+                best[entry.song_id] = (score, entry_id)
+
+        top = nlargest(limit, best.items(), key=lambda item: (item[1][0], -item[0]))
+        return [
+            SearchHit(song_id, score, self._entries[i].name, self._entries[i].kind)
+            for song_id, (score, i) in top
+        ]
+
+    def search_ids(self, query: str, limit: int = 10) -> list[int]:
+        """
+        同 search，只返回 song_id
+        """
+        return [hit.song_id for hit in self.search(query, limit)]
@@ -0,0 +1,187 @@
+from ..util import (
+    Notes,
+)
+from .algorithm import LOSS_COEFFICIENTS, get_equi_taps_from_notes
+from .vectorized import (
+    LOSS_KEYS,
+    LOWER_COEFFICIENTS,
+    UPPER_COEFFICIENTS,
+    NOTE_COLUMNS,
+    NotesBatch,
+    _combine,
+    loss_scales,
+    pack_notes,
+)
+from math import floor
+from typing import Iterator, Literal, Sequence
+import numpy as np
+
+# 理论最高达成率（%）
+MAX_ACHIEVEMENTS = 101.0
+# 浮点误差容限，避免恰好达到目标的组合因舍入被判为不可行
+_EPSILON = 1e-12
+
+# 默认参与组合枚举的判定：常见的失误类型
+DEFAULT_JUDGEMENTS: tuple[tuple[str, str], ...] = (
+    ("tap", "great"),
+    ("tap", "good"),
+    ("tap", "miss"),
+    ("break", "perfect"),
+    ("break", "great"),
+)
+
+# 每种判定所属 Note 类型在 NOTE_COLUMNS 中的列
+_NOTE_COLUMN = np.array([NOTE_COLUMNS.index(t) for t, _ in LOSS_KEYS])
+
+
+def achievement_budget(target: float) -> float:
+    """
+    达到 target（%）时允许的最大达成率损失，单位与 get_achievement_loss_from_notes 一致
+    e.g. achievement_budget(100.5) == 0.005
+    """
+    return (MAX_ACHIEVEMENTS - target) / 100
+
+
+def judgement_cost(
+    notes: Notes,
+    note_type: Literal["tap", "hold", "slide", "break"],
+    accuracy: Literal["critical_perfect", "perfect", "great", "good", "miss"],
+    bound: Literal["lower", "upper"] = "upper",
+) -> float:
+    """
+    单个指定判定的达成率损失，bound 为 "upper" 时取最坏情况
+    """
+    coefficients = LOSS_COEFFICIENTS.get((note_type, accuracy))
+    if coefficients is None:
+        raise ValueError(f"未知的 Note 类型或判定: {note_type} {accuracy}")
+    a, b = coefficients[-1] if bound == "upper" else coefficients[0]
+    x = 1 / get_equi_taps_from_notes(notes)
+    y = 1 / notes.break_ * 0.01 if b and notes.break_ else 0
+    return a * x + b * y
+
+
+def max_count(
+    notes: Notes,
+    target: float,
+    note_type: Literal["tap", "hold", "slide", "break"],
+    accuracy: Literal["critical_perfect", "perfect", "great", "good", "miss"],
+    bound: Literal["lower", "upper"] = "upper",
+) -> int:
+    """
+    其余 Note 全部理论值时，指定判定最多出现多少次仍能达到 target（%）
+
+    e.g. max_count(notes, 100.5, "tap", "great") 为 SSS+ 下最多允许的 tap great 数；
+    无法达到 target 时返回 -1
+    """
+    budget = achievement_budget(target)
+    if budget < -_EPSILON:
+        return -1
+    capacity = getattr(notes, "break_" if note_type == "break" else note_type)
+    cost = judgement_cost(notes, note_type, accuracy, bound)
+    if cost <= 0:
+        return capacity
+    return min(capacity, floor((budget + _EPSILON) / cost))
+
+
+def max_counts(
+    notes: Notes, target: float, bound: Literal["lower", "upper"] = "upper"
+) -> dict[tuple[str, str], int]:
+    """
+    所有判定各自的 max_count，键为 (Note 类型, 判定)
+    """
+    return {
+        (note_type, accuracy): max_count(notes, target, note_type, accuracy, bound)
+        for note_type, accuracy in LOSS_COEFFICIENTS
+    }
+
+
+def iter_loss_combinations(
+    notes: Notes,
+    target: float,
+    judgements: Sequence[tuple[str, str]] = DEFAULT_JUDGEMENTS,
+    bound: Literal["lower", "upper"] = "upper",
+) -> Iterator[dict[str, dict[str, int]]]:
+    """
+    枚举达到 target（%）时所有极大的失误组合：组合内任意一种判定再多一次都会
+    低于 target（或超过该类 Note 的数量）。
+
+    每个组合为 loss_dict，可直接传给 get_total_achievement_loss_from_notes；
+    不属于极大组合的分支会被提前剪掉，不会穷举所有计数。
+    """
+    budget = achievement_budget(target) + _EPSILON
+    if budget < 0:
+        return
+    k = len(judgements)
+    if k == 0:
+        yield {}
+        return
+    costs = [judgement_cost(notes, t, a, bound) for t, a in judgements]
+    types = [t for t, _ in judgements]
+    capacity = {t: getattr(notes, "break_" if t == "break" else t) for t in types}
+    counts = [0] * k
+
+    def most(i: int, remaining: float) -> int:
+        if costs[i] <= 0:
+            return capacity[types[i]]
+        return max(0, min(capacity[types[i]], floor(remaining / costs[i])))
+
+    # suffix[i] 为第 i 个及之后的判定最多能消耗的损失（忽略预算），用于剪枝
+    suffix = [0.0] * (k + 1)
+    for i in range(k - 1, -1, -1):
+        suffix[i] = suffix[i + 1] + costs[i] * capacity[types[i]]
+
+    def is_maximal(residual: float) -> bool:
+        return all(capacity[types[j]] < 1 or costs[j] > residual for j in range(k))
+
+    def search(i: int, remaining: float) -> Iterator[dict[str, dict[str, int]]]:
+        if i == k - 1:
+            counts[i] = most(i, remaining)
+            capacity[types[i]] -= counts[i]
+            if is_maximal(remaining - counts[i] * costs[i]):
+                loss_dict = {}
+                for (t, a), n in zip(judgements, counts):
+                    if n:
+                        loss_dict.setdefault(t, {})[a] = n
+                yield loss_dict
+            capacity[types[i]] += counts[i]
+            return
+        for n in range(most(i, remaining), -1, -1):
+            left = remaining - n * costs[i]
+            capacity[types[i]] -= n
+            # 之后的判定全部用满仍有余量再多一次当前判定时，更小的 n 也不可能极大
+            if left - suffix[i + 1] >= costs[i] and capacity[types[i]] >= 1:
+                capacity[types[i]] += n
+                break
+            counts[i] = n
+            yield from search(i + 1, left)
+            capacity[types[i]] += n
+
+    yield from search(0, budget)
+
+
+def batch_max_counts(
+    notes: Sequence[Notes] | np.ndarray | NotesBatch,
+    targets: float | Sequence[float] | np.ndarray,
+    bound: Literal["lower", "upper"] = "upper",
+) -> np.ndarray:
+    """
+    批量计算 N 个谱面每种判定的 max_count
+
+    - targets: 目标达成率（%），可为标量或长度为 N 的数组
+    返回值: 形状为 N×K 的整数数组，列顺序见 LOSS_KEYS；无法达到目标时为 -1
+    """
+    if isinstance(notes, NotesBatch):
+        notes = notes.notes
+    packed = notes if isinstance(notes, np.ndarray) else pack_notes(notes)
+    x, y = loss_scales(packed)
+    coefficients = UPPER_COEFFICIENTS if bound == "upper" else LOWER_COEFFICIENTS
+    costs = _combine(x, y, coefficients)
+    capacity = packed[:, _NOTE_COLUMN]
+    budget = achievement_budget(np.asarray(targets, dtype=np.float64))
+    budget = np.broadcast_to(budget, (len(packed),))[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        counts = np.floor((budget + _EPSILON) / costs)
+    # 不造成损失的判定只受数量限制；没有 break 的谱面 break 判定为 nan
+    counts = np.where(costs <= 0, capacity, counts)
+    counts = np.minimum(np.nan_to_num(counts, nan=0.0), capacity).astype(np.int64)
+    return np.where(budget < -_EPSILON, -1, counts)
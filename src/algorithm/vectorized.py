@@ -0,0 +1,156 @@
+from ..util import (
+    SongType,
+    LevelIndex,
+    Notes,
+)
+from .algorithm import LOSS_COEFFICIENTS, iter_note_sets
+from .catalog import NotesKey, SongCatalog
+from .. import metrics
+from typing import Literal, Sequence
+import numpy as np
+
+# Notes 的列顺序，以及各列折算为 tap 的权重（与 get_equi_taps_from_notes 一致）
+NOTE_COLUMNS = ("tap", "hold", "slide", "touch", "break")
+EQUI_TAP_WEIGHTS = np.array([1, 2, 3, 1, 5], dtype=np.float64)
+
+# 损失配置的列顺序，与 LOSS_COEFFICIENTS 的键一一对应
+LOSS_KEYS: tuple[tuple[str, str], ...] = tuple(LOSS_COEFFICIENTS)
+_LOSS_INDEX = {key: i for i, key in enumerate(LOSS_KEYS)}
+# 每种 (Note 类型, 判定) 的损失下限 / 上限系数 (a, b)，形状 K×2
+LOWER_COEFFICIENTS = np.array([c[0] for c in LOSS_COEFFICIENTS.values()], float)
+UPPER_COEFFICIENTS = np.array([c[-1] for c in LOSS_COEFFICIENTS.values()], float)
+
+
+def pack_notes(notes_list: Sequence[Notes]) -> np.ndarray:
+    """
+    将一组 Notes 打包为 N×5 的列式数组，列顺序见 NOTE_COLUMNS
+    """
+    return np.array(
+        [(n.tap, n.hold, n.slide, n.touch, n.break_) for n in notes_list],
+        dtype=np.int64,
+    ).reshape(-1, len(NOTE_COLUMNS))
+
+
+def pack_loss_dicts(loss_dicts: Sequence[dict[str, dict[str, int]]]) -> np.ndarray:
+    """
+    将一组 loss_dict 打包为 M×K 的物量矩阵，列顺序见 LOSS_KEYS
+    """
+    counts = np.zeros((len(loss_dicts), len(LOSS_KEYS)), dtype=np.float64)
+    for row, loss_dict in enumerate(loss_dicts):
+        for note_type, accuracy_dict in loss_dict.items():
+            for accuracy, loss in accuracy_dict.items():
+                column = _LOSS_INDEX.get((note_type, accuracy))
+                if column is None:
+                    raise ValueError(f"未知的 Note 类型或判定: {note_type} {accuracy}")
+                counts[row, column] += loss
+    return counts
+
+
+def loss_scales(packed_notes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    计算每个谱面的 x = 1 / 总物量 与 y = 1 / break 数 * 0.01
+
+    没有 break 的谱面 y 为 nan
+    """
+    x = 1 / (packed_notes @ EQUI_TAP_WEIGHTS)
+    breaks = packed_notes[:, NOTE_COLUMNS.index("break")]
+    with np.errstate(divide="ignore"):
+        y = np.where(breaks > 0, 1 / breaks * 0.01, np.nan)
+    return x, y
+
+
+def _combine(x: np.ndarray, y: np.ndarray, ab: np.ndarray) -> np.ndarray:
+    # 损失 = x * a + y * b；b 为 0 时不引入 y，避免无 break 谱面得到 nan
+    by = np.where(ab[:, 1] == 0, 0.0, y[:, None] * ab[:, 1])
+    return x[:, None] * ab[:, 0] + by
+
+
+def batch_total_achievement_loss(
+    notes: Sequence[Notes] | np.ndarray,
+    loss_dicts: Sequence[dict[str, dict[str, int]]],
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    批量计算 N 个谱面在 M 种 loss_dict 下的达成率损失
+
+    - notes: Notes 列表或 pack_notes 的结果
+    - loss_dicts: 未达到满达成率的物量配置列表，格式同 get_total_achievement_loss_from_notes
+    返回值: (达成率损失下限, 达成率损失上限)，形状均为 N×M
+    """
+    if metrics.state.current is not None:
+        metrics.count_call("batch_total_achievement_loss")
+    packed = notes if isinstance(notes, np.ndarray) else pack_notes(notes)
+    x, y = loss_scales(packed)
+    counts = pack_loss_dicts(loss_dicts)
+    lower = _combine(x, y, counts @ LOWER_COEFFICIENTS)
+    upper = _combine(x, y, counts @ UPPER_COEFFICIENTS)
+    return lower, upper
+
+
+def batch_achievement_loss(
+    notes: Sequence[Notes] | np.ndarray,
+    note_type: Literal["tap", "hold", "slide", "break"],
+    accuracy: Literal["critical_perfect", "perfect", "great", "good", "miss"],
+) -> np.ndarray:
+    """
+    批量计算 N 个谱面中单个指定 Note 在指定判定下的达成率损失
+
+    返回值: 形状为 N×C 的数组，C 为该判定可能的损失个数（同 get_achievement_loss_from_notes）
+    """
+    if metrics.state.current is not None:
+        metrics.count_call("batch_achievement_loss")
+    coefficients = LOSS_COEFFICIENTS.get((note_type, accuracy))
+    if coefficients is None:
+        raise ValueError(f"未知的 Note 类型或判定: {note_type} {accuracy}")
+    packed = notes if isinstance(notes, np.ndarray) else pack_notes(notes)
+    x, y = loss_scales(packed)
+    return _combine(x, y, np.array(coefficients, dtype=np.float64))
+
+
+class NotesBatch:
+    """
+    目录中一批谱面的列式 Notes，keys 与 notes 的行一一对应
+
+    协力谱面的左右两侧各占一行，键为 (song_id, type, LevelIndex, "left" / "right")
+    """
+
+    def __init__(self, keys: list[NotesKey], notes: np.ndarray):
+        self.keys = keys
+        self.notes = notes
+        self.index = {key: row for row, key in enumerate(keys)}
+
+    @classmethod
+    def from_catalog(
+        cls,
+        catalog: SongCatalog,
+        difficulty: LevelIndex = None,
+        type: SongType = None,
+    ) -> "NotesBatch":
+        """
+        从目录中取出（可按难度、谱面类型筛选的）所有带 Notes 的谱面，包括宴会场谱面
+        e.g. NotesBatch.from_catalog(catalog, LevelIndex.MASTER) 为所有 MASTER 谱面
+        """
+        keys, notes_list = [], []
+        for key, diff in catalog.charts.items():
+            if difficulty is not None and key[2] != difficulty:
+                continue
+            if type is not None and key[1] != type:
+                continue
+            for side, notes in iter_note_sets(diff.notes):
+                keys.append(key if side is None else (*key, side))
+                notes_list.append(notes)
+        return cls(keys, pack_notes(notes_list))
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def total_achievement_loss(
+        self, loss_dicts: Sequence[dict[str, dict[str, int]]]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return batch_total_achievement_loss(self.notes, loss_dicts)
+
+    def achievement_loss(
+        self,
+        note_type: Literal["tap", "hold", "slide", "break"],
+        accuracy: Literal["critical_perfect", "perfect", "great", "good", "miss"],
+    ) -> np.ndarray:
+        return batch_achievement_loss(self.notes, note_type, accuracy)
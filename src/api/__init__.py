@@ -1,2 +1,3 @@
 from .raw import *
 from .composed import *
+from .sync import *
@@ -0,0 +1,220 @@
+"""
+异步 API，与 api.raw 中的函数一一对应，返回值类型相同。
+
+所有请求共享同一个 AsyncClient 的连接池，并发数由其信号量限制::
+
+    players = await asyncio.gather(*(aio.get_player(t) for t in tokens))
+"""
+
+from ..util import (
+    Player,
+    Score,
+    Song,
+    Genre,
+    Version,
+    Alias,
+    Collection,
+    CollectionGenre,
+)
+from ..client import AsyncClient, get_default_async_client
+from ..scheduler import Priority
+from ..singleflight import coalesce_async
+
+
+async def get_player_info(
+    token: str,
+    info_type_url: str,
+    client: AsyncClient = None,
+    priority: Priority = Priority.NORMAL,
+) -> dict | list[dict]:
+    client = client or get_default_async_client()
+    return await client.get_player_info(token, info_type_url, priority)
+
+
+async def get_public_info(info_type_url: str, client: AsyncClient = None) -> dict:
+    client = client or get_default_async_client()
+    return await client.get_public_info(info_type_url)
+
+
+# ===== 个人 API =====
+async def get_player(token: str, client: AsyncClient = None) -> Player:
+    """
+    获取玩家信息
+    """
+    return Player.from_dict(
+        await get_player_info(token, "player", client, Priority.INTERACTIVE)
+    )
+
+
+async def get_player_scores(token: str, client: AsyncClient = None) -> list[Score]:
+    """
+    获取玩家所有成绩
+    """
+    return Score.from_list(
+        await get_player_info(token, "player/scores", client, Priority.BULK)
+    )
+
+
+# ===== 公共 API =====
+@coalesce_async
+async def get_song_list(
+    version: int = 24000,
+    notes: bool = False,
+    client: AsyncClient = None,
+    lazy: bool = False,
+) -> dict:
+    """
+    获取曲目列表
+    返回字典包含：
+      - songs: List[Song]
+      - genres: List[Genre]
+      - versions: List[Version]
+    lazy 为 True 时曲目的难度与 Notes 在首次访问时才解析
+    """
+    result = await get_public_info(
+        f"song/list?version={version}&notes={str(notes).lower()}", client
+    )
+    data = result.get("data", result)
+    songs = Song.from_list(data.get("songs", []), lazy)
+    genres = Genre.from_list(data.get("genres", []))
+    versions = Version.from_list(data.get("versions", []))
+    return {"songs": songs, "genres": genres, "versions": versions}
+
+
+async def get_song_json(
+    song_id: int, version: int = 24000, client: AsyncClient = None
+) -> dict | None:
+    """
+    获取指定曲目信息
+    """
+    result = await get_public_info(f"song/{song_id}?version={version}", client)
+    if "code" in result and result["code"] == 404:
+        return None
+    return result
+
+
+@coalesce_async
+async def get_song(
+    song_id: int, version: int = 24000, client: AsyncClient = None
+) -> Song | None:
+    """
+    获取指定曲目信息
+    """
+    song_json = await get_song_json(song_id, version, client)
+    if song_json is None:
+        return None
+    return Song.from_dict(song_json)
+
+
+@coalesce_async
+async def get_alias_list(client: AsyncClient = None) -> list[Alias]:
+    """
+    获取曲目别名列表
+    """
+    result = await get_public_info("alias/list", client)
+    return Alias.from_list(result.get("aliases", []))
+
+
+# 以下接口中 Icon、Plate、Frame 均为 Collection 类型
+@coalesce_async
+async def get_icon_list(
+    version: int = 24000, required: bool = False, client: AsyncClient = None
+) -> list[Collection]:
+    """
+    获取头像列表
+    """
+    result = await get_public_info(
+        f"icon/list?version={version}&required={str(required).lower()}", client
+    )
+    data = result.get("data", result)
+    return Collection.from_list(data.get("icons", []))
+
+
+@coalesce_async
+async def get_icon(
+    icon_id: int, version: int = 24000, client: AsyncClient = None
+) -> Collection:
+    """
+    获取指定头像信息
+    """
+    result = await get_public_info(f"icon/{icon_id}?version={version}", client)
+    data = result.get("data", result)
+    return Collection.from_dict(data)
+
+
+@coalesce_async
+async def get_plate_list(
+    version: int = 24000, required: bool = False, client: AsyncClient = None
+) -> list[Collection]:
+    """
+    获取姓名框列表
+    """
+    result = await get_public_info(
+        f"plate/list?version={version}&required={str(required).lower()}", client
+    )
+    data = result.get("data", result)
+    return Collection.from_list(data.get("plates", []))
+
+
+@coalesce_async
+async def get_plate(
+    plate_id: int, version: int = 24000, client: AsyncClient = None
+) -> Collection:
+    """
+    获取指定姓名框信息
+    """
+    result = await get_public_info(f"plate/{plate_id}?version={version}", client)
+    data = result.get("data", result)
+    return Collection.from_dict(data)
+
+
+@coalesce_async
+async def get_frame_list(
+    version: int = 24000, required: bool = False, client: AsyncClient = None
+) -> list[Collection]:
+    """
+    获取背景列表
+    """
+    result = await get_public_info(
+        f"frame/list?version={version}&required={str(required).lower()}", client
+    )
+    data = result.get("data", result)
+    return Collection.from_list(data.get("frames", []))
+
+
+@coalesce_async
+async def get_frame(
+    frame_id: int, version: int = 24000, client: AsyncClient = None
+) -> Collection:
+    """
+    获取指定背景信息
+    """
+    result = await get_public_info(f"frame/{frame_id}?version={version}", client)
+    data = result.get("data", result)
+    return Collection.from_dict(data)
+
+
+@coalesce_async
+async def get_collection_genre_list(
+    version: int = 24000, client: AsyncClient = None
+) -> list[CollectionGenre]:
+    """
+    获取收藏品分类列表
+    """
+    result = await get_public_info(f"collection-genre/list?version={version}", client)
+    data = result.get("data", result)
+    return CollectionGenre.from_list(data.get("collectionGenres", []))
+
+
+@coalesce_async
+async def get_collection_genre(
+    collection_genre_id: int, version: int = 24000, client: AsyncClient = None
+) -> CollectionGenre:
+    """
+    获取指定收藏品分类信息
+    """
+    result = await get_public_info(
+        f"collection-genre/{collection_genre_id}?version={version}", client
+    )
+    data = result.get("data", result)
+    return CollectionGenre.from_dict(data)
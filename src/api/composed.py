@@ -1,11 +1,30 @@
-from .raw import get_song
+from .raw import get_song, get_song_list, get_alias_list
 from ..algorithm import (
     get_achievement_loss_from_song,
+    get_achievement_loss_from_notes,
     extract_notes,
     get_total_achievement_loss_from_song,
+    get_total_achievement_loss_from_notes,
+    require_notes,
+    SongCatalog,
+    LossTable,
+)
+from ..util import BuddyNotes, LevelIndex, Notes, Song
+from ..client import Client
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Literal
+
+ChartQuery = (
+    tuple[int, LevelIndex | str]
+    | tuple[int, LevelIndex | str, Literal["standard", "dx", "utage"] | None]
+    | tuple[
+        int,
+        LevelIndex | str,
+        Literal["standard", "dx", "utage"] | None,
+        Literal["left", "right"] | None,
+    ]
 )
-from ..util import LevelIndex
-from typing import Literal
 
 
 def get_song_notes(
@@ -13,16 +32,18 @@ def get_song_notes(
     difficulty: (
         LevelIndex | Literal["basic", "advanced", "expert", "master", "re_master"]
     ),
-    song_type: Literal["standard", "dx"] = None,
+    song_type: Literal["standard", "dx", "utage"] = None,
     version: int = 24000,
-) -> int:
+    client: Client = None,
+    side: Literal["left", "right"] = None,
+) -> Notes | BuddyNotes:
     """
-    获取曲目指定难度的总物量
+    获取曲目指定难度的 Notes
 
-    暂不支持utage
+    协力谱面返回 BuddyNotes，指定 side 时返回对应一侧
     """
-    song = get_song(song_id, version)
-    return extract_notes(song, difficulty, song_type)
+    song = get_song(song_id, version, client)
+    return extract_notes(song, difficulty, song_type, side)
 
 
 def get_song_achievement_loss(
@@ -32,17 +53,25 @@ def get_song_achievement_loss(
     ),
     note_type: Literal["tap", "hold", "slide", "break"],
     accuracy: Literal["critical_perfect", "perfect", "great", "good", "miss"],
-    song_type: Literal["standard", "dx"] = None,
+    song_type: Literal["standard", "dx", "utage"] = None,
     version: int = 24000,
+    client: Client = None,
+    loss_table: LossTable = None,
+    side: Literal["left", "right"] = None,
 ) -> tuple[int] | tuple[int, int] | tuple[int, int, int]:
     """
     获取曲目指定难度指定Note指定准度达成率损失
 
-    暂不支持utage
+    传入 loss_table 时直接从预计算的系数表中读取，不发起网络请求；
+    协力谱面需要通过 side 指定计算哪一侧
     """
-    song = get_song(song_id, version)
+    if loss_table is not None:
+        return loss_table.get_achievement_loss(
+            song_id, difficulty, note_type, accuracy, song_type, side
+        )
+    song = get_song(song_id, version, client)
     return get_achievement_loss_from_song(
-        song, difficulty, note_type, accuracy, song_type
+        song, difficulty, note_type, accuracy, song_type, side
     )
 
 
@@ -52,13 +81,213 @@ def get_song_total_achievement_loss(
         LevelIndex | Literal["basic", "advanced", "expert", "master", "re_master"]
     ),
     loss_dict: dict[str, dict[str, int]],
-    song_type: Literal["standard", "dx"] = None,
+    song_type: Literal["standard", "dx", "utage"] = None,
     version: int = 24000,
+    client: Client = None,
+    loss_table: LossTable = None,
+    side: Literal["left", "right"] = None,
 ) -> tuple[int] | tuple[int, int] | tuple[int, int, int]:
     """
     获取曲目指定难度指定Note指定准度总达成率损失
 
-    暂不支持utage
+    传入 loss_table 时直接从预计算的系数表中计算，不发起网络请求；
+    协力谱面需要通过 side 指定计算哪一侧
+    """
+    if loss_table is not None:
+        return loss_table.get_total_achievement_loss(
+            song_id, difficulty, loss_dict, song_type, side
+        )
+    song = get_song(song_id, version, client)
+    return get_total_achievement_loss_from_song(
+        song, difficulty, loss_dict, song_type, side
+    )
+
+
+def get_song_catalog(
+    version: int = 24000,
+    client: Client = None,
+    catalog: SongCatalog = None,
+) -> SongCatalog:
+    """
+    获取曲目目录（含 Notes 与别名）
+
+    传入已有的 catalog 时在其基础上增量更新并返回
+    """
+    song_list = get_song_list(version, notes=True, client=client)
+    aliases = get_alias_list(client=client)
+    if catalog is None:
+        return SongCatalog.from_api(song_list, aliases, version)
+    catalog.update(song_list["songs"], aliases, version)
+    return catalog
+
+
+# ===== 批量 API =====
+@dataclass
+class BatchResult:
     """
-    song = get_song(song_id, version)
-    return get_total_achievement_loss_from_song(song, difficulty, loss_dict, song_type)
+    批量接口中单项的结果，失败时 error 为对应的异常
+    """
+
+    value: Any = None
+    error: Exception = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def fetch_songs(
+    song_ids: Iterable[int],
+    version: int = 24000,
+    client: Client = None,
+    max_workers: int = 8,
+    list_threshold: int = 64,
+) -> dict[int, Song | Exception]:
+    """
+    去重后获取多首曲目
+
+    曲目数不少于 list_threshold 时使用一次 get_song_list(notes=True)，
+    否则以 max_workers 个线程并发调用 get_song。获取失败的曲目对应其异常。
+    """
+    song_ids = set(song_ids)
+    if len(song_ids) >= list_threshold:
+        try:
+            songs = get_song_list(version, notes=True, client=client)["songs"]
+        except Exception as e:
+            return {song_id: e for song_id in song_ids}
+        by_id = {song.id: song for song in songs if song.id in song_ids}
+        return {
+            song_id: by_id.get(song_id) or LookupError(f"曲目 {song_id} 不存在")
+            for song_id in song_ids
+        }
+
+    def fetch(song_id: int) -> Song | Exception:
+        try:
+            return get_song(song_id, version, client) or LookupError(
+                f"曲目 {song_id} 不存在"
+            )
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers) as pool:
+        return dict(zip(song_ids, pool.map(fetch, song_ids)))
+
+
+def _run_batch(
+    queries: Iterable[ChartQuery],
+    compute: Callable[[Notes], Any],
+    version: int,
+    client: Client,
+    catalog: SongCatalog,
+    max_workers: int,
+    list_threshold: int,
+) -> list[BatchResult]:
+    queries = [
+        (q[0], q[1], q[2] if len(q) > 2 else None, q[3] if len(q) > 3 else None)
+        for q in queries
+    ]
+    songs = {}
+    if catalog is None:
+        songs = fetch_songs(
+            (song_id for song_id, *_ in queries),
+            version,
+            client,
+            max_workers,
+            list_threshold,
+        )
+    results = []
+    for song_id, difficulty, song_type, side in queries:
+        try:
+            if catalog is not None:
+                notes = catalog.get_notes(song_id, difficulty, song_type, side)
+            else:
+                song = songs[song_id]
+                if isinstance(song, Exception):
+                    raise song
+                notes = extract_notes(song, difficulty, song_type, side)
+            if notes is None:
+                raise LookupError(
+                    f"找不到谱面 {song_id} {difficulty} {song_type or ''}".rstrip()
+                )
+            results.append(BatchResult(compute(notes)))
+        except Exception as e:
+            results.append(BatchResult(error=e))
+    return results
+
+
+def get_songs_notes(
+    queries: Iterable[ChartQuery],
+    version: int = 24000,
+    client: Client = None,
+    catalog: SongCatalog = None,
+    max_workers: int = 8,
+    list_threshold: int = 64,
+) -> list[BatchResult]:
+    """
+    批量获取谱面的 Notes，queries 为 (song_id, difficulty[, song_type[, side]]) 的序列
+
+    返回值与 queries 顺序一致，单项失败不影响其他项；
+    传入 catalog 时直接从目录读取，否则按 fetch_songs 去重获取曲目
+    """
+    return _run_batch(
+        queries,
+        lambda notes: notes,
+        version,
+        client,
+        catalog,
+        max_workers,
+        list_threshold,
+    )
+
+
+def get_songs_achievement_loss(
+    queries: Iterable[ChartQuery],
+    note_type: Literal["tap", "hold", "slide", "break"],
+    accuracy: Literal["critical_perfect", "perfect", "great", "good", "miss"],
+    version: int = 24000,
+    client: Client = None,
+    catalog: SongCatalog = None,
+    max_workers: int = 8,
+    list_threshold: int = 64,
+) -> list[BatchResult]:
+    """
+    get_song_achievement_loss 的批量版本，参数与返回值约定同 get_songs_notes
+    协力谱面未指定 side 时该项失败
+    """
+    return _run_batch(
+        queries,
+        lambda notes: get_achievement_loss_from_notes(
+            require_notes(notes), note_type, accuracy
+        ),
+        version,
+        client,
+        catalog,
+        max_workers,
+        list_threshold,
+    )
+
+
+def get_songs_total_achievement_loss(
+    queries: Iterable[ChartQuery],
+    loss_dict: dict[str, dict[str, int]],
+    version: int = 24000,
+    client: Client = None,
+    catalog: SongCatalog = None,
+    max_workers: int = 8,
+    list_threshold: int = 64,
+) -> list[BatchResult]:
+    """
+    get_song_total_achievement_loss 的批量版本，参数与返回值约定同 get_songs_notes
+    协力谱面未指定 side 时该项失败
+    """
+    return _run_batch(
+        queries,
+        lambda notes: get_total_achievement_loss_from_notes(
+            require_notes(notes), loss_dict
+        ),
+        version,
+        client,
+        catalog,
+        max_workers,
+        list_threshold,
+    )
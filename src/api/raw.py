@@ -1,6 +1,8 @@
 from ..util import (
     get_player_info,
     get_public_info,
+    iter_player_info,
+    iter_public_info,
     Player,
     Score,
     Song,
@@ -10,146 +12,203 @@ from ..util import (
     Collection,
     CollectionGenre,
 )
+from ..client import Client
+from ..scheduler import Priority
+from ..singleflight import coalesce
+from typing import Iterator
 
 
 # ===== 个人 API =====
-def get_player(token: str) -> Player:
+def get_player(token: str, client: Client = None) -> Player:
     """
-    获取玩家信息
+    获取玩家信息（交互优先级，启用调度器时先于批量请求发出）
     """
-    return Player.from_dict(get_player_info(token, "player"))
+    return Player.from_dict(
+        get_player_info(token, "player", client, Priority.INTERACTIVE)
+    )
 
 
-def get_player_scores(token: str) -> list[Score]:
+def get_player_scores(token: str, client: Client = None) -> list[Score]:
     """
-    获取玩家所有成绩
+    获取玩家所有成绩（批量优先级）
     """
-    return Score.from_list(get_player_info(token, "player/scores"))
+    return Score.from_list(
+        get_player_info(token, "player/scores", client, Priority.BULK)
+    )
+
+
+def iter_player_scores(token: str, client: Client = None) -> Iterator[Score]:
+    """
+    流式获取玩家所有成绩，边读取响应边逐个产生 Score
+    """
+    return Score.iter_list(
+        iter_player_info(token, "player/scores", client, Priority.BULK)
+    )
 
 
 # ===== 公共 API =====
-def get_song_list(version: int = 24000, notes: bool = False) -> dict:
+@coalesce
+def get_song_list(
+    version: int = 24000, notes: bool = False, client: Client = None, lazy: bool = False
+) -> dict:
     """
     获取曲目列表
     返回字典包含：
       - songs: List[Song]
       - genres: List[Genre]
       - versions: List[Version]
+    lazy 为 True 时曲目的难度与 Notes 在首次访问时才解析
     """
-    result = get_public_info(f"song/list?version={version}&notes={str(notes).lower()}")
+    result = get_public_info(
+        f"song/list?version={version}&notes={str(notes).lower()}", client
+    )
     data = result.get("data", result)
-    songs = Song.from_list(data.get("songs", []))
+    songs = Song.from_list(data.get("songs", []), lazy)
     genres = Genre.from_list(data.get("genres", []))
     versions = Version.from_list(data.get("versions", []))
     return {"songs": songs, "genres": genres, "versions": versions}
 
 
-def get_song_json(song_id: int, version: int = 24000) -> dict | None:
+def iter_song_list(
+    version: int = 24000, notes: bool = False, client: Client = None
+) -> Iterator[Song]:
+    """
+    流式获取曲目列表中的曲目，边读取响应边逐个产生 Song
+    峰值内存只与单首曲目有关，适合 notes=True 的完整曲目列表
+    """
+    return Song.iter_list(
+        iter_public_info(
+            f"song/list?version={version}&notes={str(notes).lower()}", "songs", client
+        )
+    )
+
+
+def get_song_json(
+    song_id: int, version: int = 24000, client: Client = None
+) -> dict | None:
     """
     获取指定曲目信息
     """
-    result = get_public_info(f"song/{song_id}?version={version}")
+    result = get_public_info(f"song/{song_id}?version={version}", client)
     if "code" in result and result["code"] == 404:
         return None
     return result
 
 
-def get_song(song_id: int, version: int = 24000) -> Song | None:
+@coalesce
+def get_song(song_id: int, version: int = 24000, client: Client = None) -> Song | None:
     """
     获取指定曲目信息
     """
-    song_json = get_song_json(song_id, version)
+    song_json = get_song_json(song_id, version, client)
     if song_json is None:
         return None
     return Song.from_dict(song_json)
 
 
-def get_alias_list() -> list[Alias]:
+@coalesce
+def get_alias_list(client: Client = None) -> list[Alias]:
     """
     获取曲目别名列表
     """
-    result = get_public_info("alias/list")
+    result = get_public_info("alias/list", client)
     return Alias.from_list(result.get("aliases", []))
 
 
 # 以下接口中 Icon、Plate、Frame 均为 Collection 类型
-def get_icon_list(version: int = 24000, required: bool = False) -> list[Collection]:
+@coalesce
+def get_icon_list(
+    version: int = 24000, required: bool = False, client: Client = None
+) -> list[Collection]:
     """
     获取头像列表
     """
     result = get_public_info(
-        f"icon/list?version={version}&required={str(required).lower()}"
+        f"icon/list?version={version}&required={str(required).lower()}", client
     )
     data = result.get("data", result)
     return Collection.from_list(data.get("icons", []))
 
 
-def get_icon(icon_id: int, version: int = 24000) -> Collection:
+@coalesce
+def get_icon(icon_id: int, version: int = 24000, client: Client = None) -> Collection:
     """
     获取指定头像信息
     """
-    result = get_public_info(f"icon/{icon_id}?version={version}")
+    result = get_public_info(f"icon/{icon_id}?version={version}", client)
     data = result.get("data", result)
     return Collection.from_dict(data)
 
 
-def get_plate_list(version: int = 24000, required: bool = False) -> list[Collection]:
+@coalesce
+def get_plate_list(
+    version: int = 24000, required: bool = False, client: Client = None
+) -> list[Collection]:
     """
     获取姓名框列表
     """
     result = get_public_info(
-        f"plate/list?version={version}&required={str(required).lower()}"
+        f"plate/list?version={version}&required={str(required).lower()}", client
     )
     data = result.get("data", result)
     return Collection.from_list(data.get("plates", []))
 
 
-def get_plate(plate_id: int, version: int = 24000) -> Collection:
+@coalesce
+def get_plate(plate_id: int, version: int = 24000, client: Client = None) -> Collection:
     """
     获取指定姓名框信息
     """
-    result = get_public_info(f"plate/{plate_id}?version={version}")
+    result = get_public_info(f"plate/{plate_id}?version={version}", client)
     data = result.get("data", result)
     return Collection.from_dict(data)
 
 
-def get_frame_list(version: int = 24000, required: bool = False) -> list[Collection]:
+@coalesce
+def get_frame_list(
+    version: int = 24000, required: bool = False, client: Client = None
+) -> list[Collection]:
     """
     获取背景列表
     """
     result = get_public_info(
-        f"frame/list?version={version}&required={str(required).lower()}"
+        f"frame/list?version={version}&required={str(required).lower()}", client
     )
     data = result.get("data", result)
     return Collection.from_list(data.get("frames", []))
 
 
-def get_frame(frame_id: int, version: int = 24000) -> Collection:
+@coalesce
+def get_frame(frame_id: int, version: int = 24000, client: Client = None) -> Collection:
     """
     获取指定背景信息
     """
-    result = get_public_info(f"frame/{frame_id}?version={version}")
+    result = get_public_info(f"frame/{frame_id}?version={version}", client)
     data = result.get("data", result)
     return Collection.from_dict(data)
 
 
-def get_collection_genre_list(version: int = 24000) -> list[CollectionGenre]:
+@coalesce
+def get_collection_genre_list(
+    version: int = 24000, client: Client = None
+) -> list[CollectionGenre]:
     """
     获取收藏品分类列表
     """
-    result = get_public_info(f"collection-genre/list?version={version}")
+    result = get_public_info(f"collection-genre/list?version={version}", client)
     data = result.get("data", result)
     return CollectionGenre.from_list(data.get("collectionGenres", []))
 
 
+@coalesce
 def get_collection_genre(
-    collection_genre_id: int, version: int = 24000
+    collection_genre_id: int, version: int = 24000, client: Client = None
 ) -> CollectionGenre:
     """
     获取指定收藏品分类信息
     """
     result = get_public_info(
-        f"collection-genre/{collection_genre_id}?version={version}"
+        f"collection-genre/{collection_genre_id}?version={version}", client
     )
     data = result.get("data", result)
     return CollectionGenre.from_dict(data)
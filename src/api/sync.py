@@ -0,0 +1,170 @@
+"""
+玩家成绩增量同步：本地按玩家保存上次同步的成绩，每次同步只产生新增或提升的成绩
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from ..util import iter_player_info, Score, FCType, FSType
+from ..client import Client
+from ..scheduler import Priority
+
+# (id, type, level_index)，使用响应中的原始值，不需要解析即可比较
+ScoreKey = tuple[int, str, int]
+
+# 原始值 -> 等级，越大越好；None（无 FC / FS）为 0
+_FC_RANK = {member.value: rank for rank, member in enumerate(reversed(FCType), 1)}
+_FS_RANK = {member.value: rank for rank, member in enumerate(reversed(FSType), 1)}
+
+
+def score_key(record: dict) -> ScoreKey:
+    return (record["id"], record.get("type"), record["level_index"])
+
+
+_TIMESTAMPS = ("play_time", "upload_time", "last_played_time")
+
+
+def _same_timestamps(old: dict, new: dict) -> bool:
+    return new.get("upload_time") == old.get("upload_time") and new.get(
+        "last_played_time"
+    ) == old.get("last_played_time")
+
+
+def is_improved(old: dict, new: dict) -> bool:
+    """
+    new 是否在达成率、DX 分数、FC、FS 任意一项上优于 old
+    """
+    return (
+        new["achievements"] > old["achievements"]
+        or (new.get("dx_score") or 0) > (old.get("dx_score") or 0)
+        or _FC_RANK.get(new.get("fc"), 0) > _FC_RANK.get(old.get("fc"), 0)
+        or _FS_RANK.get(new.get("fs"), 0) > _FS_RANK.get(old.get("fs"), 0)
+    )
+
+
+@dataclass
+class ScoreDelta:
+    """
+    一次同步的结果，inserted 为新谱面的成绩，improved 为有提升的成绩
+    """
+
+    inserted: list[Score] = field(default_factory=list)
+    improved: list[Score] = field(default_factory=list)
+    # 时间戳变化但成绩没有提升（如重打未刷新）的条数
+    replayed: int = 0
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> list[Score]:
+        return self.inserted + self.improved
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.improved)
+
+
+class ScoreStore:
+    """
+    本地成绩存储，每个玩家对应 root/<player>.json，保存原始成绩记录
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, player: str) -> str:
+        return os.path.join(self.root, f"{player}.json")
+
+    def load(self, player: str) -> dict[ScoreKey, dict]:
+        try:
+            with open(self.path(player), encoding="utf-8") as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {score_key(record): record for record in records}
+
+    def save(self, player: str, records: dict[ScoreKey, dict]):
+        path = self.path(player)
+        os.makedirs(self.root, exist_ok=True)
+        # 先写临时文件再替换，避免同步中断时留下半截文件
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(list(records.values()), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class ScoreSync:
+    """
+    玩家成绩增量同步器。
+
+    流式读取 player/scores，upload_time 与 last_played_time 都与本地记录一致的
+    成绩直接跳过，不构建 Score；只有新增或提升的成绩才会被解析并写入 ScoreDelta，
+    下游的 Rating、排名等计算只需处理这部分数据。
+    """
+
+    def __init__(self, store: ScoreStore, client: Client = None):
+        self.store = store
+        self.client = client
+        self._records: dict[str, dict[ScoreKey, dict]] = {}
+        self._lock = threading.Lock()
+
+    def records(self, player: str) -> dict[ScoreKey, dict]:
+        """
+        获取玩家的本地成绩记录，首次访问时从存储中读取
+        """
+        with self._lock:
+            records = self._records.get(player)
+            if records is None:
+                records = self._records[player] = self.store.load(player)
+            return records
+
+    def scores(self, player: str) -> list[Score]:
+        """
+        获取玩家本地保存的完整成绩
+        """
+        return Score.from_list(list(self.records(player).values()))
+
+    def apply(self, player: str, records: Iterable[dict]) -> ScoreDelta:
+        """
+        将一批原始成绩记录合并进本地存储并返回变化部分
+
+        变化先记录在本地，records 全部读取完毕后才合并进存储并保存；
+        读取中途出错时存储保持不变，重试会重新得到完整的变化
+        """
+        stored = self.records(player)
+        changes: dict[ScoreKey, dict] = {}
+        delta = ScoreDelta()
+        for record in records:
+            key = score_key(record)
+            old = changes.get(key) or stored.get(key)
+            if old is None:
+                delta.inserted.append(Score.from_dict(record))
+            elif _same_timestamps(old, record):
+                delta.unchanged += 1
+                continue
+            elif is_improved(old, record):
+                delta.improved.append(Score.from_dict(record))
+            else:
+                # 没有提升时保留原来的最佳成绩，只更新时间戳，下次同步视为未变化
+                delta.replayed += 1
+                changes[key] = dict(old, **{k: record.get(k) for k in _TIMESTAMPS})
+                continue
+            changes[key] = record
+        if changes:
+            self.store.save(player, {**stored, **changes})
+            stored.update(changes)
+        return delta
+
+    def sync(self, player: str, token: str) -> ScoreDelta:
+        """
+        拉取玩家最新成绩并返回变化部分
+
+        - player: 本地存储使用的玩家标识，e.g. 好友码
+        - token: 玩家的个人 API 密钥
+        """
+        # 与 raw.iter_player_scores 一致使用 BULK 优先级，后台同步不与交互查询争抢配额
+        records = iter_player_info(
+            token, "player/scores", self.client, priority=Priority.BULK
+        )
+        return self.apply(player, records)
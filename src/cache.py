@@ -0,0 +1,238 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
+
+import requests
+
+
+@dataclass
+class CacheEntry:
+    payload: dict
+    fetched_at: float
+    etag: str = None
+    last_modified: str = None
+
+
+@dataclass
+class CacheStats:
+    """
+    缓存计数器，用于评估缓存容量
+    """
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    revalidations: int = 0
+    not_modified: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+
+def cache_key(info_type_url: str) -> tuple[str, str]:
+    """
+    将公共 API 的相对 url 转换为 (endpoint, version) 缓存键
+
+    e.g. "song/list?version=24000&notes=true" -> ("song/list?notes=true", "24000")
+    """
+    parts = urlsplit(info_type_url)
+    query = dict(parse_qsl(parts.query))
+    version = query.pop("version", "latest")
+    endpoint = parts.path
+    if query:
+        endpoint += "?" + urlencode(sorted(query.items()))
+    return endpoint, version
+
+
+class LRUCache:
+    """
+    进程内 LRU 缓存，超出 maxsize 时淘汰最久未使用的条目
+    """
+
+    def __init__(self, maxsize: int = 256, stats: CacheStats = None):
+        self.maxsize = maxsize
+        self.stats = stats or CacheStats()
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, entry: CacheEntry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskStore:
+    """
+    本地磁盘存储，每个 (endpoint, version) 对应 root/version/endpoint.json
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def path(self, key: tuple[str, str]) -> str:
+        endpoint, version = key
+        return os.path.join(
+            self.root, quote(version, safe=""), quote(endpoint, safe="") + ".json"
+        )
+
+    def load(self, key: tuple[str, str]) -> CacheEntry | None:
+        try:
+            with open(self.path(key), encoding="utf-8") as f:
+                return CacheEntry(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save(self, key: tuple[str, str], entry: CacheEntry):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 先写临时文件再替换，避免并发读取到半截文件
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(asdict(entry), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class CatalogueCache:
+    """
+    公共 API（曲目、别名、收藏品等）的分层缓存：进程内 LRU -> 本地磁盘 -> 网络。
+
+    条目超过 ttl 后使用 If-None-Match / If-Modified-Since 条件请求重新验证，
+    服务端返回 304 时仅刷新时间戳。
+    返回的 payload 为缓存中的同一个对象，在所有调用方之间共享，调用方不应修改。
+    """
+
+    def __init__(self, ttl: float = 3600.0, maxsize: int = 256, disk_root: str = None):
+        """
+        - ttl: 条目有效期（秒），过期后重新验证
+        - maxsize: 进程内 LRU 最大条目数
+        - disk_root: 磁盘存储目录，为 None 时不落盘
+        """
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self.memory = LRUCache(maxsize, self.stats)
+        self.disk = DiskStore(disk_root) if disk_root else None
+
+    def _is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.fetched_at < self.ttl
+
+    def _store(self, key: tuple, entry: CacheEntry):
+        self.memory.put(key, entry)
+        if self.disk is not None:
+            self.disk.save(key, entry)
+
+    def _lookup(self, info_type_url: str) -> tuple[tuple, CacheEntry | None, bool]:
+        """
+        依次查找进程内 LRU 与磁盘，返回 (缓存键, 条目, 是否新鲜)
+        """
+        key = cache_key(info_type_url)
+        entry = self.memory.get(key)
+        if entry is not None and self._is_fresh(entry):
+            self.stats.hits += 1
+            return key, entry, True
+        if entry is None and self.disk is not None:
+            entry = self.disk.load(key)
+            if entry is not None:
+                self.memory.put(key, entry)
+                if self._is_fresh(entry):
+                    self.stats.disk_hits += 1
+                    return key, entry, True
+        return key, entry, False
+
+    def _conditional_headers(self, entry: CacheEntry | None) -> dict:
+        headers = {}
+        if entry is None:
+            self.stats.misses += 1
+        else:
+            self.stats.revalidations += 1
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def _resolve(
+        self,
+        key: tuple,
+        entry: CacheEntry | None,
+        status: int,
+        headers,
+        payload: dict,
+    ) -> dict:
+        if status == 304 and entry is not None:
+            self.stats.not_modified += 1
+            entry = CacheEntry(
+                entry.payload, time.time(), entry.etag, entry.last_modified
+            )
+            self._store(key, entry)
+            return entry.payload
+        if status == 200:
+            self._store(
+                key,
+                CacheEntry(
+                    payload,
+                    time.time(),
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                ),
+            )
+        return payload
+
+    def get_or_fetch(
+        self,
+        info_type_url: str,
+        fetch: Callable[[dict], requests.Response],
+    ) -> dict:
+        """
+        读取缓存，未命中或过期时调用 fetch(headers) 发起（条件）请求
+        返回值为共享的缓存对象，调用方不应修改
+        """
+        key, entry, fresh = self._lookup(info_type_url)
+        if fresh:
+            return entry.payload
+        response = fetch(self._conditional_headers(entry))
+        payload = None if response.status_code == 304 else response.json()
+        return self._resolve(
+            key, entry, response.status_code, response.headers, payload
+        )
+
+    async def aget_or_fetch(
+        self,
+        info_type_url: str,
+        fetch: Callable[[dict], Awaitable[tuple[int, dict, dict]]],
+    ) -> dict:
+        """
+        get_or_fetch 的异步版本，fetch(headers) 返回 (状态码, 响应头, JSON)
+        """
+        key, entry, fresh = self._lookup(info_type_url)
+        if fresh:
+            return entry.payload
+        status, headers, payload = await fetch(self._conditional_headers(entry))
+        return self._resolve(key, entry, status, headers, payload)
+
+    def clear(self):
+        self.memory.clear()
@@ -0,0 +1,460 @@
+import asyncio
+import threading
+import time
+from typing import Iterator
+from urllib.parse import urljoin
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from . import metrics
+from .cache import CatalogueCache
+from .scheduler import AsyncRequestScheduler, Priority, RequestScheduler
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .snapshot import Snapshot
+from .stream import iter_json_array
+
+ROOT_URL = "https://maimai.lxns.net/api/v0/"
+
+
+class APIError(Exception):
+    """
+    API 返回错误状态码或 success 为 false
+    """
+
+    def __init__(self, status: int, payload: dict = None):
+        self.status = status
+        self.payload = payload
+        message = (payload or {}).get("message", "")
+        super().__init__(f"API 请求失败 ({status}) {message}".rstrip())
+
+
+def _player_data(status: int, payload) -> dict | list[dict]:
+    if (
+        status != 200
+        or not isinstance(payload, dict)
+        or not payload.get("success", True)
+    ):
+        raise APIError(status, payload if isinstance(payload, dict) else None)
+    return payload["data"]
+
+
+def _record_request(url: str, status, start: float, size: int | str = None):
+    # 只读取一次，调用方检查之后其他线程可能已经关闭了指标收集
+    recorder = metrics.state.current
+    if recorder is None:
+        return
+    endpoint = metrics.endpoint_label(url)
+    recorder.observe(
+        "lxns_http_request_seconds",
+        time.perf_counter() - start,
+        endpoint=endpoint,
+        status=str(status),
+    )
+    if size is not None:
+        recorder.increment(
+            "lxns_http_response_bytes_total", int(size), endpoint=endpoint
+        )
+
+
+class Client:
+    """
+    共享 HTTP 客户端。
+
+    基于 requests.Session 复用 keep-alive 连接，支持按主机配置连接池大小、
+    超时以及带指数退避的重试。可注入到 api.raw 中的所有函数。
+    """
+
+    def __init__(
+        self,
+        root_url: str = ROOT_URL,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        host_pool_sizes: dict[str, int] = None,
+        timeout: float | tuple[float, float] = 10.0,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504),
+        cache: CatalogueCache = None,
+        scheduler: RequestScheduler = None,
+        snapshot: Snapshot = None,
+    ):
+        """
+        - pool_connections: 缓存的主机连接池数量
+        - pool_maxsize: 每个主机连接池的最大连接数
+        - host_pool_sizes: 针对特定主机前缀的连接池大小 e.g. {"https://maimai.lxns.net/": 32}
+        - timeout: 请求超时（秒），可为 (连接超时, 读取超时)
+        - retries: 连接错误或 retry_statuses 状态码时的最大重试次数
+        - backoff_factor: 第 n 次重试前等待 backoff_factor * 2 ** n 秒
+        - cache: 公共 API 的分层缓存，为 None 时不缓存
+        - scheduler: 请求调度器（限速与优先级），为 None 时请求立即发出；
+          设置后需要重试时通过调度器让所有请求一起退避
+        - snapshot: 公共 API 快照，能从快照回答的请求不访问网络
+        """
+        self.root_url = root_url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.cache = cache
+        self.scheduler = scheduler
+        self.snapshot = snapshot
+        self._flights = SingleFlight()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        for prefix, size in (host_pool_sizes or {}).items():
+            self.session.mount(
+                prefix, HTTPAdapter(pool_connections=1, pool_maxsize=size)
+            )
+
+    def _backoff(self, attempt: int, response: requests.Response = None) -> float:
+        # 优先遵循服务端给出的 Retry-After（秒）
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after is not None and retry_after.isdigit():
+                return min(float(retry_after), self.backoff_max)
+        return min(self.backoff_factor * 2**attempt, self.backoff_max)
+
+    def get(
+        self,
+        url: str,
+        headers: dict = None,
+        stream: bool = False,
+        priority: Priority = Priority.NORMAL,
+    ) -> requests.Response:
+        """
+        发送 GET 请求，url 为相对于 root_url 的路径
+        stream 为 True 时不预先读取响应体
+        """
+        target_url = urljoin(self.root_url, url)
+        for attempt in range(self.retries + 1):
+            if self.scheduler is not None:
+                self.scheduler.acquire(priority)
+            response = None
+            start = time.perf_counter()
+            try:
+                response = self.session.get(
+                    target_url, headers=headers, timeout=self.timeout, stream=stream
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if metrics.state.current is not None:
+                    _record_request(url, "error", start)
+                if attempt == self.retries:
+                    raise
+            else:
+                if metrics.state.current is not None:
+                    size = response.headers.get("Content-Length")
+                    if not stream:
+                        size = len(response.content)
+                    _record_request(url, response.status_code, start, size)
+                if (
+                    response.status_code not in self.retry_statuses
+                    or attempt == self.retries
+                ):
+                    return response
+                # 丢弃将要重试的响应，stream=True 时将连接归还连接池
+                response.close()
+            if self.scheduler is not None:
+                self.scheduler.pause(self._backoff(attempt, response))
+            else:
+                time.sleep(self._backoff(attempt, response))
+
+    def get_player_info(
+        self,
+        token: str,
+        info_type_url: str,
+        priority: Priority = Priority.NORMAL,
+    ) -> dict | list[dict]:
+        """
+        获取个人 API 的 data，状态码不为 200 或 success 为 false 时抛出 APIError
+        """
+        response = self.get(
+            urljoin("user/maimai/", info_type_url),
+            headers={"X-User-Token": token},
+            priority=priority,
+        )
+        try:
+            payload = response.json()
+        except ValueError:
+            payload = None
+        return _player_data(response.status_code, payload)
+
+    def get_public_info(self, info_type_url: str) -> dict:
+        """
+        获取公共 API 的响应，相同 url 的并发调用共享同一次请求与 JSON 解析
+        """
+        return self._flights.do(
+            info_type_url, lambda: self._fetch_public_info(info_type_url)
+        )
+
+    def _fetch_public_info(self, info_type_url: str) -> dict:
+        snapshot = self.snapshot
+        if snapshot is not None:
+            payload = snapshot.get(info_type_url)
+            if payload is not None:
+                return payload
+        url = urljoin("maimai/", info_type_url)
+        if self.cache is None:
+            return self.get(url).json()
+        return self.cache.get_or_fetch(
+            info_type_url, lambda headers: self.get(url, headers)
+        )
+
+    def _iter_items(
+        self,
+        url: str,
+        key: str,
+        headers: dict = None,
+        chunk_size: int = 1 << 16,
+        priority: Priority = Priority.NORMAL,
+    ) -> Iterator[dict]:
+        with self.get(url, headers, stream=True, priority=priority) as response:
+            if response.status_code != 200:
+                raise APIError(response.status_code)
+            chunks = response.iter_content(chunk_size)
+            yield from iter_json_array(chunks, key)
+            # 读完剩余部分，使连接可以回到连接池复用
+            for _ in chunks:
+                pass
+
+    def iter_player_info(
+        self,
+        token: str,
+        info_type_url: str,
+        key: str = "data",
+        priority: Priority = Priority.NORMAL,
+    ) -> Iterator[dict]:
+        """
+        流式读取个人 API 响应中的数组，逐个产生元素（不经过缓存）
+        """
+        return self._iter_items(
+            urljoin("user/maimai/", info_type_url),
+            key,
+            {"X-User-Token": token},
+            priority=priority,
+        )
+
+    def iter_public_info(self, info_type_url: str, key: str) -> Iterator[dict]:
+        """
+        流式读取公共 API 响应中键为 key 的数组，逐个产生元素（不经过缓存）
+        """
+        return self._iter_items(urljoin("maimai/", info_type_url), key)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncClient:
+    """
+    异步 HTTP 客户端。
+
+    基于 aiohttp.ClientSession 共享同一个连接池，并通过信号量限制并发请求数。
+    重试与退避策略与 Client 一致。会话在首次请求时于当前事件循环中创建。
+    """
+
+    def __init__(
+        self,
+        root_url: str = ROOT_URL,
+        max_concurrency: int = 64,
+        limit: int = 100,
+        limit_per_host: int = 0,
+        timeout: float = 10.0,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504),
+        cache: CatalogueCache = None,
+        scheduler: AsyncRequestScheduler = None,
+        snapshot: Snapshot = None,
+    ):
+        """
+        - max_concurrency: 同时进行中的最大请求数
+        - limit: 连接池总连接数，0 为不限
+        - limit_per_host: 每个主机的最大连接数，0 为不限
+        其余参数同 Client
+        """
+        self.root_url = root_url
+        self.max_concurrency = max_concurrency
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.cache = cache
+        self.scheduler = scheduler
+        self.snapshot = snapshot
+        self._flights = AsyncSingleFlight()
+        self._session: aiohttp.ClientSession = None
+        self._semaphore: asyncio.Semaphore = None
+        self._loop: asyncio.AbstractEventLoop = None
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        # 会话与信号量都绑定事件循环，循环变化（如多次 asyncio.run）时重新创建
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._loop is not loop or self._session.closed:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit, limit_per_host=self.limit_per_host
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    _backoff = Client._backoff
+
+    async def get(
+        self, url: str, headers: dict = None, priority: Priority = Priority.NORMAL
+    ) -> tuple[int, dict, dict]:
+        """
+        发送 GET 请求，返回 (状态码, 响应头, JSON)，304 时 JSON 为 None
+        """
+        session = self._ensure_session()
+        target_url = urljoin(self.root_url, url)
+        for attempt in range(self.retries + 1):
+            if self.scheduler is not None:
+                await self.scheduler.acquire(priority)
+            response = None
+            try:
+                async with self._semaphore:
+                    start = time.perf_counter()
+                    async with session.get(target_url, headers=headers) as response:
+                        payload = None
+                        retry = (
+                            response.status in self.retry_statuses
+                            and attempt != self.retries
+                        )
+                        # 需要重试的响应不解析正文，代理返回的 HTML 错误页不会中断重试
+                        if response.status != 304 and not retry:
+                            try:
+                                payload = await response.json(content_type=None)
+                            except ValueError:
+                                if response.status < 400:
+                                    raise
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if metrics.state.current is not None:
+                    _record_request(url, "error", start)
+                if attempt == self.retries:
+                    raise
+            else:
+                if metrics.state.current is not None:
+                    _record_request(
+                        url, response.status, start, response.content_length
+                    )
+                if (
+                    response.status not in self.retry_statuses
+                    or attempt == self.retries
+                ):
+                    return response.status, response.headers, payload
+            if self.scheduler is not None:
+                self.scheduler.pause(self._backoff(attempt, response))
+            else:
+                await asyncio.sleep(self._backoff(attempt, response))
+
+    async def get_player_info(
+        self,
+        token: str,
+        info_type_url: str,
+        priority: Priority = Priority.NORMAL,
+    ) -> dict | list[dict]:
+        status, _, payload = await self.get(
+            urljoin("user/maimai/", info_type_url),
+            headers={"X-User-Token": token},
+            priority=priority,
+        )
+        return _player_data(status, payload)
+
+    async def get_public_info(self, info_type_url: str) -> dict:
+        return await self._flights.do(
+            info_type_url, lambda: self._fetch_public_info(info_type_url)
+        )
+
+    async def _fetch_public_info(self, info_type_url: str) -> dict:
+        snapshot = self.snapshot
+        if snapshot is not None:
+            payload = snapshot.get(info_type_url)
+            if payload is not None:
+                return payload
+        url = urljoin("maimai/", info_type_url)
+        if self.cache is None:
+            _, _, payload = await self.get(url)
+            return payload
+        return await self.cache.aget_or_fetch(
+            info_type_url, lambda headers: self.get(url, headers)
+        )
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+_default_client: Client = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> Client:
+    """
+    获取进程内共享的默认客户端，首次调用时创建。
+    默认客户端带有进程内的 CatalogueCache，公共数据在 ttl 内只请求一次
+    """
+    global _default_client
+    if _default_client is None:
+        with _default_client_lock:
+            if _default_client is None:
+                _default_client = Client(cache=CatalogueCache())
+    return _default_client
+
+
+def set_default_client(client: Client) -> Client:
+    """
+    替换默认客户端，返回旧的客户端（可能为 None）
+    """
+    global _default_client
+    with _default_client_lock:
+        old, _default_client = _default_client, client
+    return old
+
+
+_default_async_client: AsyncClient = None
+
+
+def get_default_async_client() -> AsyncClient:
+    """
+    获取进程内共享的默认异步客户端，首次调用时创建，同样带有 CatalogueCache
+    """
+    global _default_async_client
+    if _default_async_client is None:
+        _default_async_client = AsyncClient(cache=CatalogueCache())
+    return _default_async_client
+
+
+def set_default_async_client(client: AsyncClient) -> AsyncClient:
+    """
+    替换默认异步客户端，返回旧的客户端（可能为 None）
+    """
+    global _default_async_client
+    old, _default_async_client = _default_async_client, client
+    return old
@@ -0,0 +1,281 @@
+"""
+可选的运行时指标：请求延迟、传输字节数、解析耗时、缓存命中率与算法调用次数。
+
+默认关闭，关闭时各埋点只有一次属性读取的开销::
+
+    metrics = enable_metrics()
+    ...
+    print(to_prometheus_text(metrics))
+"""
+
+import logging
+import math
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, Protocol
+
+from .cache import CatalogueCache
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[tuple[str, str], ...]
+
+_id_segment = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_label(url: str) -> str:
+    """
+    将请求路径归一化为指标标签，去掉查询参数并把数字 id 替换为 {id}
+
+    e.g. "maimai/song/8?version=24000" -> "maimai/song/{id}"
+    """
+    return _id_segment.sub("/{id}", url.partition("?")[0])
+
+
+class Histogram:
+    """
+    累积直方图，buckets 为各区间的上界（不含 +Inf）
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """
+        返回 [(上界, 不大于上界的观测数)]，最后一项上界为 inf
+        """
+        result, total = [], 0
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class Exporter(Protocol):
+    def export(self, metrics: "Metrics"): ...
+
+
+class Metrics:
+    """
+    指标注册表，计数器与直方图均以 (名称, 标签) 为键
+    """
+
+    def __init__(self, exporters: list[Exporter] = None):
+        self.counters: dict[tuple[str, Labels], float] = {}
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+        self.exporters = list(exporters or ())
+        self._gauges: list[Callable[[], dict[tuple[str, Labels], float]]] = []
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels: str):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(
+        self,
+        name: str,
+        value: float,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+        **labels: str,
+    ):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def watch_cache(self, cache: CatalogueCache, name: str = "catalogue"):
+        """
+        导出时读取 cache 的计数器作为 gauge
+        """
+
+        def collect():
+            stats, labels = cache.stats, (("cache", name),)
+            return {
+                ("lxns_cache_hits", labels): stats.hits,
+                ("lxns_cache_disk_hits", labels): stats.disk_hits,
+                ("lxns_cache_misses", labels): stats.misses,
+                ("lxns_cache_not_modified", labels): stats.not_modified,
+                ("lxns_cache_hit_ratio", labels): stats.hit_ratio,
+            }
+
+        self._gauges.append(collect)
+
+    def gauges(self) -> dict[tuple[str, Labels], float]:
+        result = {}
+        for collect in self._gauges:
+            result.update(collect())
+        return result
+
+    def snapshot(self) -> dict:
+        """
+        以普通字典返回当前所有指标，供内存导出与测试使用
+        """
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "histograms": {
+                    key: {"count": h.count, "sum": h.sum, "buckets": h.cumulative()}
+                    for key, h in self.histograms.items()
+                },
+                "gauges": self.gauges(),
+            }
+
+    def export(self):
+        for exporter in self.exporters:
+            exporter.export(self)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+# ===== 全局开关 =====
+class _State:
+    current: Metrics = None
+
+
+state = _State()
+
+
+def enable_metrics(metrics: Metrics = None) -> Metrics:
+    """
+    开启指标收集，返回正在使用的 Metrics
+    """
+    state.current = metrics or Metrics()
+    return state.current
+
+
+def disable_metrics() -> Metrics | None:
+    """
+    关闭指标收集，返回之前使用的 Metrics（可能为 None）
+    """
+    old, state.current = state.current, None
+    return old
+
+
+def get_metrics() -> Metrics | None:
+    return state.current
+
+
+def count_call(function: str):
+    """
+    记录一次算法调用，指标收集已关闭时忽略
+    """
+    recorder = state.current
+    if recorder is not None:
+        recorder.increment("lxns_algorithm_calls_total", function=function)
+
+
+# ===== 导出 =====
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    labels = labels + extra
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in labels
+    )
+    return "{%s}" % pairs
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def to_prometheus_text(metrics: Metrics) -> str:
+    """
+    按 Prometheus 文本格式输出所有指标
+    """
+    data = metrics.snapshot()
+    lines, declared = [], set()
+
+    def declare(name: str, kind: str):
+        if name not in declared:
+            declared.add(name)
+            lines.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), value in sorted(data["counters"].items()):
+        declare(name, "counter")
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    for (name, labels), value in sorted(data["gauges"].items()):
+        declare(name, "gauge")
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    for (name, labels), histogram in sorted(data["histograms"].items()):
+        declare(name, "histogram")
+        for bound, count in histogram["buckets"]:
+            le = (("le", _format_value(bound)),)
+            lines.append(f"{name}_bucket{_format_labels(labels, le)} {count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram['sum']!r}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+class InMemoryExporter:
+    """
+    保存每次导出时的指标快照
+    """
+
+    def __init__(self):
+        self.snapshots: list[dict] = []
+
+    def export(self, metrics: Metrics):
+        self.snapshots.append(metrics.snapshot())
+
+
+class LoggingExporter:
+    """
+    将指标以 Prometheus 文本格式逐行写入日志
+    """
+
+    def __init__(self, logger: logging.Logger = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger("lxns.metrics")
+        self.level = level
+
+    def export(self, metrics: Metrics):
+        for line in to_prometheus_text(metrics).splitlines():
+            if not line.startswith("#"):
+                self.logger.log(self.level, line)
+
+
+class PrometheusExporter:
+    """
+    将指标以 Prometheus 文本格式写入文件，可配合 node_exporter 的 textfile 收集器
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.text = ""
+
+    def export(self, metrics: Metrics):
+        self.text = to_prometheus_text(metrics)
+        # 先写临时文件再原子替换，收集器不会读到写了一半的文件
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.text)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,209 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+
+class Priority(IntEnum):
+    """
+    请求优先级，数值越小越先发出
+    """
+
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+@dataclass
+class SchedulerStats:
+    """
+    调度器计数器，wait 均为请求在队列中等待的时间（秒）
+    """
+
+    requests: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    throttled: int = 0
+    requests_by_priority: dict[Priority, int] = field(
+        default_factory=lambda: dict.fromkeys(Priority, 0)
+    )
+    wait_by_priority: dict[Priority, float] = field(
+        default_factory=lambda: dict.fromkeys(Priority, 0.0)
+    )
+
+    @property
+    def mean_wait(self) -> float:
+        return self.total_wait / self.requests if self.requests else 0.0
+
+    def record(self, priority: Priority, wait: float):
+        self.requests += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.requests_by_priority[priority] += 1
+        self.wait_by_priority[priority] += wait
+
+
+class TokenBucket:
+    """
+    令牌桶：每秒补充 rate 个令牌，最多积累 burst 个
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def delay(self, now: float) -> float:
+        """
+        距离下一个令牌可用还需等待的时间（秒）
+        """
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+    def drain(self):
+        self.tokens = min(self.tokens, 0.0)
+
+
+class _SchedulerBase:
+    def __init__(self, rate: float, burst: int):
+        self.bucket = TokenBucket(rate, burst)
+        self.stats = SchedulerStats()
+        self._waiting: list[tuple[int, int]] = []
+        self._counter = itertools.count()
+        self._paused_until = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiting)
+
+    def queue_depth_by_priority(self) -> dict[Priority, int]:
+        depth = dict.fromkeys(Priority, 0)
+        for priority, _ in self._waiting:
+            depth[Priority(priority)] += 1
+        return depth
+
+    def _enqueue(self, priority: Priority) -> tuple[int, int]:
+        entry = (int(priority), next(self._counter))
+        heapq.heappush(self._waiting, entry)
+        return entry
+
+    def _delay(self) -> float:
+        now = time.monotonic()
+        return max(self._paused_until - now, self.bucket.delay(now))
+
+    def _dequeue(self, entry: tuple[int, int], start: float):
+        heapq.heappop(self._waiting)
+        self.bucket.take()
+        self.stats.record(Priority(entry[0]), time.monotonic() - start)
+
+    def _pause(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self.bucket.drain()
+        self.stats.throttled += 1
+
+
+class RequestScheduler(_SchedulerBase):
+    """
+    线程间共享的请求调度器。
+
+    所有请求发出前按 (优先级, 到达顺序) 排队，只有队首能取令牌，因此交互请求
+    会越过排队中的批量请求；服务端限流（429 / 5xx）时 pause 让所有请求一起暂停。
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 10):
+        """
+        - rate: 每秒允许发出的请求数
+        - burst: 空闲后允许连续发出的最大请求数
+        """
+        super().__init__(rate, burst)
+        self._condition = threading.Condition()
+
+    def acquire(self, priority: Priority = Priority.NORMAL) -> float:
+        """
+        阻塞直到可以发出请求，返回等待时间（秒）
+        """
+        start = time.monotonic()
+        with self._condition:
+            entry = self._enqueue(priority)
+            while True:
+                if self._waiting[0] is entry:
+                    delay = self._delay()
+                    if delay <= 0:
+                        self._dequeue(entry, start)
+                        self._condition.notify_all()
+                        return time.monotonic() - start
+                    self._condition.wait(delay)
+                else:
+                    self._condition.wait()
+
+    def pause(self, seconds: float):
+        """
+        暂停发出请求 seconds 秒
+        """
+        with self._condition:
+            self._pause(seconds)
+
+    def resume(self):
+        """
+        提前结束 pause，排队中的请求按令牌桶继续发出
+        """
+        with self._condition:
+            self._paused_until = 0.0
+            self._condition.notify_all()
+
+
+class AsyncRequestScheduler(_SchedulerBase):
+    """
+    同一事件循环内协程间共享的请求调度器，行为同 RequestScheduler
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 10):
+        super().__init__(rate, burst)
+        self._condition: asyncio.Condition = None
+        self._loop: asyncio.AbstractEventLoop = None
+
+    def _ensure_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._loop = loop
+            self._condition = asyncio.Condition()
+            self._waiting.clear()
+        return self._condition
+
+    async def acquire(self, priority: Priority = Priority.NORMAL) -> float:
+        start = time.monotonic()
+        condition = self._ensure_condition()
+        async with condition:
+            entry = self._enqueue(priority)
+            try:
+                while True:
+                    if self._waiting[0] is entry:
+                        delay = self._delay()
+                        if delay <= 0:
+                            self._dequeue(entry, start)
+                            condition.notify_all()
+                            return time.monotonic() - start
+                        try:
+                            await asyncio.wait_for(condition.wait(), delay)
+                        except asyncio.TimeoutError:
+                            pass
+                    else:
+                        await condition.wait()
+            except asyncio.CancelledError:
+                # 被取消的请求移出队列，避免阻塞后面的请求
+                if entry in self._waiting:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    condition.notify_all()
+                raise
+
+    def pause(self, seconds: float):
+        self._pause(seconds)
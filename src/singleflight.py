@@ -0,0 +1,109 @@
+"""
+请求合并（single-flight）：相同的调用同时只执行一次，执行期间到达的调用共享其结果
+"""
+
+import asyncio
+import functools
+import inspect
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+R = TypeVar("R")
+
+
+class SingleFlight:
+    """
+    线程间的请求合并：同一个 key 同时只执行一次 fn，
+    执行期间到达的相同调用阻塞等待并共享同一个结果（或异常）
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        # 直接复用进行中调用结果的次数
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], R]) -> R:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                leader = False
+            else:
+                future = self._calls[key] = Future()
+                leader = True
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """
+    协程间的请求合并：同一事件循环内同一个 key 同时只运行一个任务，
+    单个调用方被取消时不会取消共享的任务
+    """
+
+    def __init__(self):
+        self._calls: dict[tuple, asyncio.Task] = {}
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[R]]) -> R:
+        key = (asyncio.get_running_loop(), key)
+        task = self._calls.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
+
+
+def _call_key(signature: inspect.Signature, func: Callable, args, kwargs) -> tuple:
+    # 补全默认参数，使 get_song(8) 与 get_song(8, 24000) 视为同一调用
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return (func, tuple(bound.arguments.items()))
+
+
+def coalesce(func: Callable[..., R]) -> Callable[..., R]:
+    """
+    装饰器：参数相同的并发调用共享同一次执行（包括网络请求与解析）的结果。
+    参数必须可哈希；共享的结果为同一个对象，调用方不应修改
+    """
+    flight = SingleFlight()
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = _call_key(signature, func, args, kwargs)
+        return flight.do(key, lambda: func(*args, **kwargs))
+
+    wrapper.flight = flight
+    return wrapper
+
+
+def coalesce_async(func: Callable[..., Awaitable[R]]) -> Callable[..., Awaitable[R]]:
+    """
+    coalesce 的协程版本
+    """
+    flight = AsyncSingleFlight()
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = _call_key(signature, func, args, kwargs)
+        return await flight.do(key, lambda: func(*args, **kwargs))
+
+    wrapper.flight = flight
+    return wrapper
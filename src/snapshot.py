@@ -0,0 +1,244 @@
+"""
+公共 API 快照：将某个版本的所有公共接口导出为一个文件，启动时无需网络即可提供数据
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin
+
+from .cache import cache_key
+from .scheduler import Priority
+
+if TYPE_CHECKING:
+    from .client import Client
+
+_MAGIC = b"LXSNAP01"
+_HEADER = struct.Struct("<8sI")
+
+# 列表接口 -> 列表在响应中的键；单项接口 {name}/{id} 从对应的列表中取出
+_LIST_KEYS = {
+    "song": "songs",
+    "icon": "icons",
+    "plate": "plates",
+    "frame": "frames",
+    "collection-genre": "collectionGenres",
+}
+# 单项接口使用的列表 url（包含谱面物量 / 解锁条件的完整版本）
+_ITEM_SOURCES = {
+    "song": "song/list?version={version}&notes=true",
+    "icon": "icon/list?version={version}&required=true",
+    "plate": "plate/list?version={version}&required=true",
+    "frame": "frame/list?version={version}&required=true",
+    "collection-genre": "collection-genre/list?version={version}",
+}
+_NOT_FOUND = {"success": False, "code": 404}
+
+
+def snapshot_urls(version: int) -> list[str]:
+    """
+    快照中包含的公共 API url
+    """
+    urls = ["alias/list"]
+    for notes in ("true", "false"):
+        urls.append(f"song/list?version={version}&notes={notes}")
+    for name in ("icon", "plate", "frame"):
+        for required in ("true", "false"):
+            urls.append(f"{name}/list?version={version}&required={required}")
+    urls.append(f"collection-genre/list?version={version}")
+    return urls
+
+
+def export_snapshot(path: str, version: int = 24000, client: "Client" = None) -> str:
+    """
+    从网络拉取 version 的所有公共接口并写入快照文件
+
+    每个接口的响应单独压缩，读取时只解压用到的部分。先写临时文件再替换，
+    其他进程正在读取的旧快照不受影响。
+    """
+    from .client import APIError, get_default_client
+
+    client = client or get_default_client()
+    blobs, entries, offset = [], {}, 0
+    for url in snapshot_urls(version):
+        # 直接请求网络，不经过缓存与已加载的快照
+        response = client.get(urljoin("maimai/", url), priority=Priority.BULK)
+        if response.status_code != 200:
+            raise APIError(response.status_code)
+        blob = zlib.compress(response.content, 6)
+        entries["|".join(cache_key(url))] = [offset, len(blob)]
+        blobs.append(blob)
+        offset += len(blob)
+    index = json.dumps(
+        {"version": version, "created_at": time.time(), "entries": entries}
+    ).encode()
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, len(index)))
+        f.write(index)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return path
+
+
+class Snapshot:
+    """
+    只读的快照文件，通过 mmap 按需解压各接口的响应。
+
+    除导出的列表接口外，还能从列表中取出单项接口（song/{id}、icon/{id} 等）的响应；
+    快照中确定不存在的单项返回与服务端一致的 404 响应。
+    解压后的响应会被缓存并在所有调用方之间共享，调用方不应修改。
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mmap: mmap.mmap = None
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        with open(self.path, "rb") as f:
+            new_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, index_size = _HEADER.unpack_from(new_mmap)
+            if magic != _MAGIC:
+                raise ValueError(f"{self.path} 不是快照文件")
+            index = json.loads(new_mmap[_HEADER.size : _HEADER.size + index_size])
+        except Exception:
+            new_mmap.close()
+            raise
+        with self._lock:
+            old_mmap, self._mmap = self._mmap, new_mmap
+            self.version: int = index["version"]
+            self.created_at: float = index["created_at"]
+            self._data_offset = _HEADER.size + index_size
+            self._entries: dict[str, list[int]] = index["entries"]
+            self._payloads: dict[str, dict] = {}
+            self._items: dict[str, dict[int, dict]] = {}
+        # 读取都在锁内从 mmap 复制数据，替换后旧的 mmap 不会再被访问
+        if old_mmap is not None:
+            old_mmap.close()
+
+    def reload(self) -> "Snapshot":
+        """
+        重新打开 path 处的快照文件（例如被 export_snapshot 替换后），并关闭旧的 mmap
+        """
+        self._load()
+        return self
+
+    def __contains__(self, info_type_url: str) -> bool:
+        return "|".join(cache_key(info_type_url)) in self._entries
+
+    def _payload(self, key: str) -> dict:
+        payload = self._payloads.get(key)
+        if payload is None:
+            with self._lock:
+                payloads = self._payloads
+                offset, size = self._entries[key]
+                start = self._data_offset + offset
+                blob = self._mmap[start : start + size]
+            payload = json.loads(zlib.decompress(blob))
+            with self._lock:
+                payload = payloads.setdefault(key, payload)
+        return payload
+
+    def _item_index(self, name: str) -> dict[int, dict]:
+        items = self._items
+        index = items.get(name)
+        if index is None:
+            url = _ITEM_SOURCES[name].format(version=self.version)
+            payload = self._payload("|".join(cache_key(url)))
+            data = payload.get("data", payload)
+            index = {item["id"]: item for item in data.get(_LIST_KEYS[name], [])}
+            with self._lock:
+                index = items.setdefault(name, index)
+        return index
+
+    def get(self, info_type_url: str) -> dict | None:
+        """
+        获取公共 API 的响应，快照无法回答（其他版本或未导出的接口）时返回 None
+        返回值为共享的缓存对象，调用方不应修改
+        """
+        endpoint, version = cache_key(info_type_url)
+        key = f"{endpoint}|{version}"
+        if key in self._entries:
+            return self._payload(key)
+        if version != str(self.version):
+            return None
+        name, _, item_id = endpoint.partition("/")
+        if name not in _ITEM_SOURCES or not item_id.isdigit():
+            return None
+        return self._item_index(name).get(int(item_id), _NOT_FOUND)
+
+    def close(self):
+        with self._lock:
+            self._mmap.close()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SnapshotRefresher:
+    """
+    后台定期重新导出快照，并将新快照设置到客户端上
+    """
+
+    def __init__(
+        self,
+        client: "Client",
+        path: str,
+        version: int = 24000,
+        interval: float = 3600.0,
+    ):
+        self.client = client
+        self.path = path
+        self.version = version
+        self.interval = interval
+        self.last_error: Exception = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+
+    def refresh(self) -> "Snapshot":
+        """
+        立即重新导出一次快照
+        """
+        export_snapshot(self.path, self.version, self.client)
+        snapshot = self.client.snapshot
+        if snapshot is not None and snapshot.path == self.path:
+            # 原地替换并关闭旧的 mmap，正在读取的线程不受影响
+            return snapshot.reload()
+        self.client.snapshot = Snapshot(self.path)
+        return self.client.snapshot
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                # 刷新失败时继续使用旧快照，下个周期重试
+                self.last_error = e
+
+    def start(self) -> "SnapshotRefresher":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
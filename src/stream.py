@@ -0,0 +1,141 @@
+import codecs
+import json
+import re
+from typing import Any, Generator, Iterable, Iterator
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+_number_chars = frozenset("0123456789+-.eE")
+
+
+class _Buffer:
+    """
+    按需从字节块中读取文本的缓冲区，已解析的部分在读取新块时丢弃
+    """
+
+    def __init__(self, chunks: Iterable[bytes | str]):
+        self.chunks = iter(chunks)
+        self.text = ""
+        self.pos = 0
+        self.exhausted = False
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+
+    def fill(self, min_size: int = 0) -> bool:
+        """
+        读取新块直到未解析部分不少于 min_size，没有更多数据时返回 False
+        """
+        pending = [self.text[self.pos :]]
+        size = len(pending[0])
+        read = False
+        while not read or size < min_size:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                pending.append(self._utf8.decode(b"", final=True))
+                self.exhausted = True
+                break
+            if isinstance(chunk, bytes):
+                chunk = self._utf8.decode(chunk)
+            pending.append(chunk)
+            size += len(chunk)
+            read = True
+        self.text = "".join(pending)
+        self.pos = 0
+        return read
+
+    def peek(self) -> str:
+        """
+        跳过空白并返回下一个字符
+        """
+        while True:
+            self.pos = _whitespace.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                raise ValueError("JSON 数据意外结束")
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"JSON 第 {self.pos} 个字符处应为 {char!r}")
+        self.pos += 1
+
+    def decode_value(self) -> Any:
+        """
+        解析下一个完整的 JSON 值，数据不完整时继续读取
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if self.exhausted:
+                    raise
+            else:
+                # 数字可能在块边界处被截断（如 "1." 被解析为 1），
+                # 只有其后出现非数字字符时才能确定已完整
+                if (
+                    self.exhausted
+                    or end < len(self.text)
+                    and self.text[end] not in _number_chars
+                ):
+                    self.pos = end
+                    return value
+            # 每次至少让未解析部分翻倍，避免大值被反复从头解析
+            self.fill(2 * (len(self.text) - self.pos) + 1)
+
+
+def _iter_array(buffer: _Buffer) -> Iterator[Any]:
+    buffer.expect("[")
+    if buffer.peek() == "]":
+        buffer.pos += 1
+        return
+    while True:
+        yield buffer.decode_value()
+        char = buffer.peek()
+        buffer.pos += 1
+        if char == "]":
+            return
+        if char != ",":
+            raise ValueError(f"JSON 第 {buffer.pos} 个字符处应为 ',' 或 ']'")
+
+
+def _iter_object(
+    buffer: _Buffer, key: str, descend: tuple[str, ...]
+) -> Generator[Any, None, bool]:
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        buffer.pos += 1
+        return False
+    while True:
+        name = buffer.decode_value()
+        buffer.expect(":")
+        char = buffer.peek()
+        if name == key and char == "[":
+            yield from _iter_array(buffer)
+            return True
+        if name in descend and char == "{":
+            if (yield from _iter_object(buffer, key, descend)):
+                return True
+        else:
+            buffer.decode_value()
+        char = buffer.peek()
+        buffer.pos += 1
+        if char == "}":
+            return False
+        if char != ",":
+            raise ValueError(f"JSON 第 {buffer.pos} 个字符处应为 ',' 或 '}}'")
+
+
+def iter_json_array(
+    chunks: Iterable[bytes | str],
+    key: str,
+    descend: tuple[str, ...] = ("data",),
+) -> Iterator[Any]:
+    """
+    从 JSON 对象的字节流中逐个解析键为 key 的数组元素，不构建整个 JSON 树
+
+    - chunks: UTF-8 字节块或字符串块，如 response.iter_content()
+    - key: 目标数组的键，e.g. "songs"
+    - descend: 遇到这些键对应的对象时进入其中继续查找，e.g. {"data": {"songs": [...]}}
+    峰值内存只与单个元素的大小有关；未找到 key 时不产生任何元素。
+    """
+    yield from _iter_object(_Buffer(chunks), key, descend)
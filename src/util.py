@@ -1,67 +1,648 @@
-from urllib.parse import urljoin
-import requests
+import json
+import sys
+import types
+import zlib
+from array import array
 from enum import Enum
-from typing import TypeVar, Type, List, Union
-from dataclasses import dataclass, field, fields
+from itertools import compress, islice, repeat
+from operator import attrgetter, is_, is_not
+from typing import Callable, Iterable, Iterator, TypeVar, Type, List, Union, get_type_hints
+from dataclasses import MISSING, dataclass, field, fields
+from struct import Struct
+from .client import ROOT_URL, Client, get_default_client
+from .scheduler import Priority
+from . import metrics
 
-ROOT_URL = "https://maimai.lxns.net/api/v0/"
+def get_player_info(
+    token: str,
+    info_type_url: str,
+    client: Client = None,
+    priority: Priority = Priority.NORMAL,
+) -> dict | List[dict]:
+    return (client or get_default_client()).get_player_info(
+        token, info_type_url, priority=priority
+    )
 
-def get_player_info(token: str, info_type_url: str) -> dict | List[dict]:
-    target_url = urljoin(urljoin(ROOT_URL, "user/maimai/"), info_type_url)
-    header = {"X-User-Token": token}
-    response = requests.get(target_url, headers=header)
-    return response.json()["data"]
+def get_public_info(info_type_url: str, client: Client = None) -> dict:
+    return (client or get_default_client()).get_public_info(info_type_url)
 
-def get_public_info(info_type_url: str) -> dict:
-    target_url = urljoin(urljoin(ROOT_URL, "maimai/"), info_type_url)
-    response = requests.get(target_url)
-    return response.json()
+def iter_player_info(
+    token: str,
+    info_type_url: str,
+    client: Client = None,
+    priority: Priority = Priority.NORMAL,
+) -> Iterator[dict]:
+    return (client or get_default_client()).iter_player_info(
+        token, info_type_url, priority=priority
+    )
+
+def iter_public_info(
+    info_type_url: str, key: str, client: Client = None
+) -> Iterator[dict]:
+    return (client or get_default_client()).iter_public_info(info_type_url, key)
 
 T = TypeVar("T", bound="ResponseStruct")
 
-@dataclass
+# 每个 ResponseStruct 子类（及其延迟解析模式）对应一个生成的解码函数，首次解析时编译并缓存
+_decoders: dict[tuple[type, bool], Callable[[dict], "ResponseStruct"]] = {}
+_lazy_classes: dict[type, type] = {}
+# to_dict 的编码函数同样按类生成并缓存
+_encoders: dict[type, Callable[["ResponseStruct"], dict]] = {}
+_MISSING = object()
+
+class _Raw:
+    """
+    延迟解析模式下尚未解析的嵌套数据
+    """
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+def _is_struct(tp) -> bool:
+    return isinstance(tp, type) and issubclass(tp, ResponseStruct)
+
+def _is_enum(tp) -> bool:
+    return isinstance(tp, type) and issubclass(tp, Enum)
+
+def _is_struct_union(tp) -> bool:
+    if getattr(tp, "__origin__", None) is not Union and not isinstance(tp, types.UnionType):
+        return False
+    return all(_is_struct(arg) for arg in tp.__args__ if arg is not type(None))
+
+def _required_keys(cls: type) -> set[str]:
+    return {
+        f.metadata.get("json_key", f.name) for f in fields(cls)
+        if f.default is MISSING and f.default_factory is MISSING
+    }
+
+def _union_decoder(members: tuple, lazy: bool = False) -> Callable[[dict], "ResponseStruct"]:
+    """
+    Union 中的成员均为 ResponseStruct 时，选择必填键全部出现在数据中的成员解码，
+    都不匹配时使用最后一个成员，匹配多个时抛出 ValueError。
+    e.g. Union[Notes, BuddyNotes] 中有 "left" 与 "right" 的解码为 BuddyNotes
+    """
+    members = [m for m in members if m is not type(None)]
+    candidates = [(_required_keys(m), m, _get_decoder(m, lazy)) for m in members]
+    fallback = candidates[-1][2]
+
+    def decode(data: dict) -> "ResponseStruct":
+        keys = data.keys()
+        matched = [(m, decoder) for required, m, decoder in candidates if required <= keys]
+        if len(matched) == 1:
+            return matched[0][1](data)
+        if not matched:
+            return fallback(data)
+        names = ", ".join(m.__name__ for m, _ in matched)
+        raise ValueError(f"无法确定数据对应的类型，同时匹配 {names}: {sorted(keys)}")
+
+    return decode
+
+def _nested_decoder(field_type, lazy: bool = False) -> Callable | None:
+    """
+    field_type 为结构体、结构体的 Union 或结构体列表时返回其解码函数，否则返回 None
+    """
+    if _is_struct(field_type):
+        decoder = _get_decoder(field_type, lazy)
+        return lambda value: decoder(value) if isinstance(value, dict) else value
+    if _is_struct_union(field_type):
+        decoder = _union_decoder(field_type.__args__, lazy)
+        return lambda value: decoder(value) if isinstance(value, dict) else value
+    if getattr(field_type, "__origin__", None) is list and _is_struct(field_type.__args__[0]):
+        decoder = _get_decoder(field_type.__args__[0], lazy)
+        return lambda value: [decoder(item) for item in value]
+    return None
+
+def _conversion(field_type, name: str, namespace: dict, lazy: bool = False) -> str | None:
+    """
+    返回将变量 value 转换为 field_type 的表达式，无需转换时返回 None。
+    表达式用到的类型、解码函数放入 namespace，以 name 为前缀避免冲突。
+    lazy 为 True 时嵌套的结构体与结构体列表只包装为 _Raw，首次访问时再解析
+    """
+    if lazy and _nested_decoder(field_type) is not None:
+        namespace["_Raw"] = _Raw
+        return "_Raw(value)"
+    if _is_struct(field_type):
+        namespace[f"decode_{name}"] = _get_decoder(field_type)
+        return f"decode_{name}(value) if isinstance(value, dict) else value"
+    if _is_enum(field_type):
+        namespace[f"enum_{name}"] = field_type
+        namespace[f"members_{name}"] = field_type._value2member_map_
+        # 直接查值到成员的映射，查不到时交给 Enum 构造抛出 ValueError
+        return f"members_{name}[value] if value in members_{name} else enum_{name}(value)"
+    if _is_struct_union(field_type):
+        namespace[f"decode_{name}"] = _union_decoder(field_type.__args__)
+        return f"decode_{name}(value) if isinstance(value, dict) else value"
+    if getattr(field_type, "__origin__", None) is list:
+        subtype = field_type.__args__[0]
+        if _is_struct(subtype):
+            namespace[f"decode_{name}"] = _get_decoder(subtype)
+            return f"[decode_{name}(item) for item in value]"
+        if _is_enum(subtype):
+            namespace[f"enum_{name}"] = subtype
+            return f"[enum_{name}(item) for item in value]"
+    return None
+
+def _slot(cls: type, name: str):
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            return klass.__dict__[name]
+    raise AttributeError(name)
+
+def _lazy_property(slot, decode: Callable) -> property:
+    def get(self):
+        value = slot.__get__(self)
+        if value.__class__ is _Raw:
+            value = decode(value.data)
+            slot.__set__(self, value)
+        return value
+
+    return property(get, slot.__set__)
+
+def _lazy_class(cls: type) -> type:
+    """
+    cls 的延迟解析版本：嵌套字段先保存原始数据，首次访问时解析并替换原值。
+    与 cls 的对象相等比较、pickle（还原为 cls 对象）行为一致；没有嵌套字段时返回 cls 本身
+    """
+    lazy = _lazy_classes.get(cls)
+    if lazy is not None:
+        return lazy
+    hints = get_type_hints(cls)
+    names = tuple(f.name for f in fields(cls))
+    namespace = {}
+    for f in fields(cls):
+        decode = _nested_decoder(hints.get(f.name, f.type), lazy=True)
+        if decode is not None:
+            namespace[f.name] = _lazy_property(_slot(cls, f.name), decode)
+    if not namespace:
+        _lazy_classes[cls] = cls
+        return cls
+
+    def __eq__(self, other):
+        if other.__class__ is cls or other.__class__ is lazy:
+            return tuple(getattr(self, n) for n in names) == tuple(getattr(other, n) for n in names)
+        return NotImplemented
+
+    def __reduce__(self):
+        # 还原为普通的 cls 对象，反序列化时不依赖动态生成的类
+        return (object.__new__, (cls,), (None, {n: getattr(self, n) for n in names}))
+
+    namespace.update(
+        __slots__=(),
+        __module__=cls.__module__,
+        __qualname__=cls.__qualname__,
+        __eq__=__eq__,
+        __hash__=None,
+        __reduce__=__reduce__,
+    )
+    lazy = _lazy_classes[cls] = type(cls.__name__, (cls,), namespace)
+    return lazy
+
+def _compile_decoder(cls: type, lazy: bool = False) -> Callable[[dict], "ResponseStruct"]:
+    """
+    根据 dataclass 字段生成直线式解码代码，避免每次解析都反射字段类型
+    """
+    hints = get_type_hints(cls)
+    target = _lazy_class(cls) if lazy else cls
+    namespace = {"cls": target, "_MISSING": _MISSING, "intern": sys.intern}
+    lines = ["def decode(data):", "    kwargs = {}"]
+    for f in fields(cls):
+        # 如果字段 metadata 指定了 json_key，则使用它；否则使用字段名
+        json_key = f.metadata.get("json_key", f.name)
+        conversion = _conversion(hints.get(f.name, f.type), f.name, namespace, lazy)
+        if f.metadata.get("intern"):
+            conversion = "intern(value) if value.__class__ is str else value"
+        lines.append(f"    value = data.get({json_key!r}, _MISSING)")
+        lines.append("    if value is not _MISSING:")
+        if conversion is None:
+            lines.append(f"        kwargs[{f.name!r}] = value")
+        else:
+            # 如果值为 None，则直接赋值 None，不进行后续转换
+            lines.append(
+                f"        kwargs[{f.name!r}] = None if value is None else ({conversion})"
+            )
+    lines.append("    return cls(**kwargs)")
+    exec("\n".join(lines), namespace)
+    decoder = namespace["decode"]
+    decoder.__qualname__ = f"{cls.__qualname__}.decode"
+    return decoder
+
+def _get_decoder(cls: type, lazy: bool = False) -> Callable[[dict], "ResponseStruct"]:
+    decoder = _decoders.get((cls, lazy))
+    if decoder is None:
+        decoder = _decoders[cls, lazy] = _compile_decoder(cls, lazy)
+    return decoder
+
+def _is_struct_list(tp) -> bool:
+    return getattr(tp, "__origin__", None) is list and _is_struct(tp.__args__[0])
+
+def _to_dict(value: "ResponseStruct") -> dict:
+    # 按实际类型分派，Union 字段与延迟解析的子类均由此处理
+    encoder = _encoders.get(value.__class__)
+    if encoder is None:
+        encoder = _encoders[value.__class__] = _compile_encoder(value.__class__)
+    return encoder(value)
+
+def _compile_encoder(cls: type) -> Callable[["ResponseStruct"], dict]:
+    """
+    _compile_decoder 的逆过程：字段名按 json_key 输出，枚举输出其值
+    """
+    hints = get_type_hints(cls)
+    namespace = {"_to_dict": _to_dict}
+    lines = ["def encode(obj):", "    data = {}"]
+    for f in fields(cls):
+        json_key = f.metadata.get("json_key", f.name)
+        field_type = hints.get(f.name, f.type)
+        conversion = None
+        if _is_struct(field_type) or _is_struct_union(field_type):
+            conversion = "_to_dict(value)"
+        elif _is_enum(field_type):
+            conversion = "value.value"
+        elif _is_struct_list(field_type):
+            conversion = "[_to_dict(item) for item in value]"
+        elif getattr(field_type, "__origin__", None) is list:
+            if _is_enum(field_type.__args__[0]):
+                conversion = "[item.value for item in value]"
+            else:
+                conversion = "list(value)"
+        lines.append(f"    value = obj.{f.name}")
+        if conversion is None:
+            lines.append(f"    data[{json_key!r}] = value")
+        else:
+            lines.append(f"    data[{json_key!r}] = None if value is None else ({conversion})")
+    lines.append("    return data")
+    exec("\n".join(lines), namespace)
+    encoder = namespace["encode"]
+    encoder.__qualname__ = f"{cls.__qualname__}.encode"
+    return encoder
+
+# ===== 二进制格式 =====
+# 列式编码：一组结构体的每个字段单独成列，不写出字段名与类名。
+# - 整数列按取值范围选用最窄的定长小端整数，浮点列为 float64，布尔列每行 1 字节
+# - 字符串列去重后以 "\0" 连接为一段 UTF-8，列中只保存下标
+# - 枚举保存为序号，Union 保存成员序号，嵌套结构体与列表递归编码为子表
+# - 含 None 的列额外保存每行 1 字节的标记，值只保存非 None 的部分
+# 类型与声明不一致（如 int 字段中的浮点数）的列退化为 JSON，保证无损。
+# 头部为 魔数、格式版本、单个 / 列表、结构指纹，字段或枚举成员变化后指纹随之变化，
+# 旧数据解码时报错而不是得到错位的字段。格式只由定长小端数值与 UTF-8 组成，与 Python 版本无关
+_BINARY_HEADER = Struct("<2sBBI")
+_BINARY_MAGIC = b"LX"
+_BINARY_VERSION = 3
+_BIG_ENDIAN = sys.byteorder == "big"
+
+def _array_code(size: int, signed: bool) -> str:
+    for code in ("bhilq" if signed else "BHILQ"):
+        if array(code).itemsize == size:
+            return code
+    raise RuntimeError(f"没有 {size} 字节的整数类型")
+
+# 整数列的类型标记（同 struct 格式字符）-> (array 类型码, 最小值, 最大值)，按宽度从窄到宽
+_INT_FORMATS = {
+    tag: (_array_code(size, tag.islower()), -(1 << (size * 8 - 1)) if tag.islower() else 0,
+          (1 << (size * 8 - 1 if tag.islower() else size * 8)) - 1)
+    for tag, size in (("B", 1), ("b", 1), ("H", 2), ("h", 2), ("I", 4), ("i", 4), ("Q", 8), ("q", 8))
+}
+_INT_TAGS = {ord(tag): code for tag, (code, _, _) in _INT_FORMATS.items()}
+
+def _describe(tp) -> str:
+    if _is_struct(tp):
+        hints = get_type_hints(tp)
+        return f"{tp.__name__}(" + ",".join(
+            f"{f.name}:{_describe(hints.get(f.name, f.type))}" for f in fields(tp)
+        ) + ")"
+    if _is_enum(tp):
+        return f"{tp.__name__}[" + ",".join(tp.__members__) + "]"
+    if _is_struct_union(tp):
+        return "|".join(_describe(arg) for arg in tp.__args__ if arg is not type(None))
+    if getattr(tp, "__origin__", None) is list:
+        return f"list[{_describe(tp.__args__[0])}]"
+    return getattr(tp, "__name__", repr(tp))
+
+class _Reader:
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes, pos: int = 0):
+        self.data = memoryview(data)
+        self.pos = pos
+
+    def take(self, size: int) -> memoryview:
+        end = self.pos + size
+        if end > len(self.data):
+            raise ValueError("数据不完整")
+        chunk, self.pos = self.data[self.pos:end], end
+        return chunk
+
+    def byte(self) -> int:
+        return self.take(1)[0]
+
+    def varint(self) -> int:
+        value = shift = 0
+        while True:
+            byte = self.byte()
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def array(self, code: str, count: int) -> list:
+        values = array(code)
+        values.frombytes(self.take(count * values.itemsize))
+        if _BIG_ENDIAN:
+            values.byteswap()
+        return values.tolist()
+
+def _write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+def _write_array(out: bytearray, code: str, values: list):
+    data = array(code, values)
+    if _BIG_ENDIAN:
+        data.byteswap()
+    out += data.tobytes()
+
+def _write_ints(out: bytearray, values: list) -> bool:
+    low, high = (min(values), max(values)) if values else (0, 0)
+    for tag, (code, minimum, maximum) in _INT_FORMATS.items():
+        if minimum <= low and high <= maximum:
+            out += tag.encode()
+            _write_array(out, code, values)
+            return True
+    return False
+
+def _read_ints(reader: _Reader, count: int) -> list[int]:
+    code = _INT_TAGS.get(reader.byte())
+    if code is None:
+        raise ValueError("无效的整数列")
+    return reader.array(code, count)
+
+def _write_scalars(out: bytearray, values: list, kinds: set = None):
+    if kinds is None:
+        kinds = set(map(type, values))
+    if not kinds or kinds == {int}:
+        if _write_ints(out, values):
+            return
+    elif kinds == {bool}:
+        out += b"?"
+        out += bytes(values)
+        return
+    elif kinds == {float}:
+        out += b"d"
+        _write_array(out, "d", values)
+        return
+    elif kinds == {str}:
+        table = {value: i for i, value in enumerate(dict.fromkeys(values))}
+        indices = list(map(table.__getitem__, values))
+        joined = "\0".join(table)
+        if joined.count("\0") == len(table) - 1:
+            blob = joined.encode()
+            out += b"s"
+            _write_varint(out, len(table))
+            _write_varint(out, len(blob))
+            out += blob
+            _write_ints(out, indices)
+            return
+    blob = json.dumps(values, ensure_ascii=False).encode()
+    out += b"j"
+    _write_varint(out, len(blob))
+    out += blob
+
+def _read_scalars(reader: _Reader, count: int, intern: bool) -> list:
+    tag = reader.byte()
+    if tag in _INT_TAGS:
+        return reader.array(_INT_TAGS[tag], count)
+    if tag == ord("?"):
+        return list(map(bool, reader.take(count)))
+    if tag == ord("d"):
+        return reader.array("d", count)
+    if tag == ord("s"):
+        size = reader.varint()
+        strings = str(reader.take(reader.varint()), "utf-8").split("\0") if size else []
+        if intern:
+            strings = list(map(sys.intern, strings))
+        return list(map(strings.__getitem__, _read_ints(reader, count)))
+    if tag == ord("j"):
+        return json.loads(str(reader.take(reader.varint()), "utf-8"))
+    raise ValueError(f"无效的列类型: {tag}")
+
+# 列的编码方式：("scalar", intern) / ("enum", 成员, 成员 -> 序号) / ("struct", 子表)
+# / ("union", 成员, 子表) / ("list", 元素的编码方式)
+def _column_plan(field_type, intern: bool = False) -> tuple:
+    if _is_struct(field_type):
+        return ("struct", _get_table(field_type))
+    if _is_struct_union(field_type):
+        members = [m for m in field_type.__args__ if m is not type(None)]
+        return ("union", members, [_get_table(m) for m in members])
+    if _is_enum(field_type):
+        # 按成员名查序号，避免逐个调用 Python 实现的 Enum.__hash__
+        return ("enum", tuple(field_type), {member._name_: i for i, member in enumerate(field_type)})
+    if getattr(field_type, "__origin__", None) is list:
+        return ("list", _column_plan(field_type.__args__[0]))
+    return ("scalar", intern)
+
+_ENUM_NAME = attrgetter("_name_")
+
+def _write_column(out: bytearray, plan: tuple, values: list):
+    kind = plan[0]
+    kinds = None
+    # 标量列顺便得到值的类型集合；结构体的 __eq__ 较慢，只按身份判断；其他类型直接用 in 在 C 中比较
+    if kind == "scalar":
+        kinds = set(map(type, values))
+        nullable = types.NoneType in kinds
+        kinds.discard(types.NoneType)
+    elif kind in ("struct", "union"):
+        nullable = any(value is None for value in values)
+    else:
+        nullable = None in values
+    if nullable:
+        out.append(1)
+        out += bytes(map(is_, values, repeat(None)))
+        values = list(compress(values, map(is_not, values, repeat(None))))
+    else:
+        out.append(0)
+    if kind == "scalar":
+        _write_scalars(out, values, kinds)
+    elif kind == "enum":
+        _write_ints(out, list(map(plan[2].__getitem__, map(_ENUM_NAME, values))))
+    elif kind == "struct":
+        _write_table(out, plan[1], values)
+    elif kind == "union":
+        members, tables = plan[1], plan[2]
+        tags = [next(i for i, m in enumerate(members) if isinstance(value, m)) for value in values]
+        _write_ints(out, tags)
+        for i, table in enumerate(tables):
+            _write_table(out, table, [value for value, tag in zip(values, tags) if tag == i])
+    else:
+        _write_ints(out, list(map(len, values)))
+        _write_column(out, plan[1], [item for value in values for item in value])
+
+def _read_column(reader: _Reader, plan: tuple, count: int) -> list:
+    mask = bytes(reader.take(count)) if reader.byte() else None
+    present = count - sum(mask) if mask else count
+    kind = plan[0]
+    if kind == "scalar":
+        values = _read_scalars(reader, present, plan[1])
+    elif kind == "enum":
+        values = list(map(plan[1].__getitem__, _read_ints(reader, present)))
+    elif kind == "struct":
+        values = _read_table(reader, plan[1], present)
+    elif kind == "union":
+        tags = _read_ints(reader, present)
+        groups = [iter(_read_table(reader, table, tags.count(i))) for i, table in enumerate(plan[2])]
+        values = [next(groups[tag]) for tag in tags]
+    else:
+        lengths = _read_ints(reader, present)
+        items = iter(_read_column(reader, plan[1], sum(lengths)))
+        values = [list(islice(items, length)) for length in lengths]
+    if mask:
+        values = iter(values)
+        return [None if null else next(values) for null in mask]
+    return values
+
+# 每个结构体的子表：(各字段的取值函数, 各字段的编码方式, 由各列构建对象的函数, 结构指纹)
+_tables: dict[type, tuple[list, list, Callable, int]] = {}
+
+def _compile_builder(cls: type) -> Callable[[list], list]:
+    """
+    由各列的值逐行构建对象，数据由编码生成且字段齐全，跳过 __init__ 直接写入各字段
+    """
+    names = [f"v{i}" for i in range(len(fields(cls)))]
+    assignments = "".join(f"        obj.{f.name} = {var}\n" for var, f in zip(names, fields(cls)))
+    source = (
+        "def build(columns):\n"
+        "    result = []\n"
+        "    append = result.append\n"
+        f"    for {', '.join(names)}, in zip(*columns):\n"
+        "        obj = new(cls)\n"
+        f"{assignments}"
+        "        append(obj)\n"
+        "    return result\n"
+    )
+    namespace = {"cls": cls, "new": object.__new__}
+    exec(source, namespace)
+    build = namespace["build"]
+    build.__qualname__ = f"{cls.__qualname__}.build"
+    return build
+
+def _get_table(cls: type) -> tuple[list, list, Callable, int]:
+    table = _tables.get(cls)
+    if table is None:
+        hints = get_type_hints(cls)
+        table = _tables[cls] = (
+            [attrgetter(f.name) for f in fields(cls)],
+            [_column_plan(hints.get(f.name, f.type), f.metadata.get("intern", False)) for f in fields(cls)],
+            _compile_builder(cls),
+            zlib.crc32(_describe(cls).encode()),
+        )
+    return table
+
+def _write_table(out: bytearray, table: tuple, items: list):
+    for getter, plan in zip(table[0], table[1]):
+        _write_column(out, plan, list(map(getter, items)))
+
+def _read_table(reader: _Reader, table: tuple, count: int) -> list:
+    return table[2]([_read_column(reader, plan, count) for plan in table[1]])
+
+def _dump_binary(cls: type, items: list, is_list: bool) -> bytes:
+    table = _get_table(cls)
+    out = bytearray(_BINARY_HEADER.pack(_BINARY_MAGIC, _BINARY_VERSION, is_list, table[3]))
+    _write_varint(out, len(items))
+    _write_table(out, table, items)
+    return bytes(out)
+
+def _load_binary(cls: type, data: bytes, is_list: bool) -> list:
+    if len(data) < _BINARY_HEADER.size:
+        raise ValueError("数据过短，不是有效的二进制格式")
+    magic, version, kind, schema = _BINARY_HEADER.unpack_from(data)
+    if magic != _BINARY_MAGIC or version != _BINARY_VERSION:
+        raise ValueError(f"不支持的二进制格式: {magic!r} 版本 {version}")
+    if kind != is_list:
+        raise ValueError("数据为" + ("列表" if kind else "单个对象") + f"，请使用对应的 {cls.__name__} 方法")
+    table = _get_table(cls)
+    if schema != table[3]:
+        raise ValueError(f"数据与当前 {cls.__name__} 的字段定义不一致")
+    reader = _Reader(data, _BINARY_HEADER.size)
+    items = _read_table(reader, table, reader.varint())
+    if reader.pos != len(reader.data):
+        raise ValueError("数据末尾有多余的内容")
+    return items
+
+def _timed_decode(cls: type, decode: Callable[[], T], count: int = None) -> T:
+    # count 为 None 时解析结果为列表，条数为其长度
+    recorder = metrics.state.current
+    with recorder.timer("lxns_decode_seconds", struct=cls.__name__):
+        result = decode()
+    if count is None:
+        count = len(result)
+    recorder.increment("lxns_decoded_structs_total", count, struct=cls.__name__)
+    return result
+
+@dataclass(slots=True)
 class ResponseStruct:
     """
     基础结构，支持递归解析子类、列表，并自动转换枚举类型。
     通过 dataclass 自动生成 __init__、__repr__ 等方法，
-    并在 from_dict 中利用 dataclass 的 fields 来解析 JSON 数据。
+    并根据 dataclass 的 fields 为每个子类生成一次解码函数来解析 JSON 数据。
+
+    lazy=True 时嵌套的结构体与列表（如 Song.difficulties）保留原始数据，
+    首次访问该属性时才解析并缓存，只用到顶层字段时可省去大部分解析
     """
     @classmethod
-    def from_dict(cls: Type[T], data: dict) -> T:
-        init_kwargs = {}
-        for f in fields(cls):
-            # 如果字段 metadata 指定了 json_key，则使用它；否则使用字段名
-            json_key = f.metadata.get("json_key", f.name)
-            if json_key in data:
-                value = data[json_key]
-                # 如果值为 None，则直接赋值 None，不进行后续转换
-                if value is None:
-                    init_kwargs[f.name] = None
-                    continue
-
-                field_type = f.type
-                # 如果字段类型是 ResponseStruct 子类，则递归解析
-                if isinstance(value, dict) and isinstance(field_type, type) and issubclass(field_type, ResponseStruct):
-                    init_kwargs[f.name] = field_type.from_dict(value)
-                # 处理列表类型
-                elif hasattr(field_type, '__origin__') and field_type.__origin__ is list:
-                    subtype = field_type.__args__[0]
-                    if isinstance(subtype, type) and issubclass(subtype, ResponseStruct):
-                        init_kwargs[f.name] = [subtype.from_dict(item) for item in value]
-                    elif isinstance(subtype, type) and issubclass(subtype, Enum):
-                        init_kwargs[f.name] = [subtype(item) for item in value]
-                    else:
-                        init_kwargs[f.name] = value
-                # 处理枚举类型
-                elif isinstance(field_type, type) and issubclass(field_type, Enum):
-                    init_kwargs[f.name] = field_type(value)
-                else:
-                    init_kwargs[f.name] = value
-        return cls(**init_kwargs)
+    def from_dict(cls: Type[T], data: dict, lazy: bool = False) -> T:
+        decoder = _get_decoder(cls, lazy)
+        if metrics.state.current is not None:
+            return _timed_decode(cls, lambda: decoder(data), 1)
+        return decoder(data)
+
+    @classmethod
+    def from_list(cls: Type[T], data: List[dict], lazy: bool = False) -> List[T]:
+        decoder = _get_decoder(cls, lazy)
+        if metrics.state.current is not None:
+            return _timed_decode(cls, lambda: [decoder(item) for item in data], len(data))
+        return [decoder(item) for item in data]
+
+    @classmethod
+    def iter_list(cls: Type[T], data: Iterable[dict], lazy: bool = False) -> Iterator[T]:
+        """
+        逐个解析，配合流式读取使用时不会同时持有整个列表
+        """
+        decoder = _get_decoder(cls, lazy)
+        for item in data:
+            yield decoder(item)
+
+    def to_dict(self) -> dict:
+        """
+        转换为与 API 返回格式一致的 dict（字段名使用 json_key），from_dict 可还原
+        """
+        return _to_dict(self)
+
+    def to_bytes(self) -> bytes:
+        """
+        编码为紧凑的列式二进制格式（见 _BINARY_HEADER 上方的说明），from_bytes 可还原。
+        格式与 Python 版本无关，可用于磁盘缓存与进程间传递；结构体的字段变化后旧数据无法解码
+        """
+        return _dump_binary(self.__class__, [self], False)
+
+    @classmethod
+    def from_bytes(cls: Type[T], data: bytes) -> T:
+        if metrics.state.current is not None:
+            return _timed_decode(cls, lambda: _load_binary(cls, data, False)[0], 1)
+        return _load_binary(cls, data, False)[0]
 
     @classmethod
-    def from_list(cls: Type[T], data: List[dict]) -> List[T]:
-        return [cls.from_dict(item) for item in data]
+    def list_to_bytes(cls: Type[T], items: Iterable[T]) -> bytes:
+        """
+        同 to_bytes，将一组 cls 对象编码为一个整体，同一字段的值连续存放，比逐个编码更紧凑
+        """
+        return _dump_binary(cls, list(items), True)
+
+    @classmethod
+    def list_from_bytes(cls: Type[T], data: bytes) -> List[T]:
+        if metrics.state.current is not None:
+            return _timed_decode(cls, lambda: _load_binary(cls, data, True))
+        return _load_binary(cls, data, True)
 
 # 枚举类型定义
 class LevelIndex(Enum):
@@ -106,14 +687,16 @@ class SongType(Enum):
     UTAGE = "utage"
 
 # 数据结构定义，均使用 dataclass 自动生成方法
+# slots=True 去掉实例 __dict__ 以压缩内存；metadata 中 intern=True 的字符串字段
+# （难度、谱师、分类等大量重复的值）在解析时驻留，相同的值共享同一个对象
 
-@dataclass
+@dataclass(slots=True)
 class CollectionGenre(ResponseStruct):
     id: int
     title: str
     genre: str
 
-@dataclass
+@dataclass(slots=True)
 class CollectionRequiredSong(ResponseStruct):
     id: int
     title: str
@@ -121,7 +704,7 @@ class CollectionRequiredSong(ResponseStruct):
     completed: bool = None
     completed_difficulties: List[LevelIndex] = None
 
-@dataclass
+@dataclass(slots=True)
 class CollectionRequired(ResponseStruct):
     difficulties: List[LevelIndex] = None
     rate: RateType = None
@@ -130,76 +713,77 @@ class CollectionRequired(ResponseStruct):
     songs: List[CollectionRequiredSong] = None
     completed: bool = None
 
-@dataclass
+@dataclass(slots=True)
 class Collection(ResponseStruct):
     id: int
     name: str
     color: str = None
     description: str = None
-    genre: str = None
+    genre: str = field(default=None, metadata={"intern": True})
     required: List[CollectionRequired] = None
 
-@dataclass
+@dataclass(slots=True)
 class Version(ResponseStruct):
     id: int
     title: str
     version: int
 
-@dataclass
+@dataclass(slots=True)
 class Alias(ResponseStruct):
     song_id: int
     aliases: List[str]
 
-@dataclass
+@dataclass(slots=True)
 class Notes(ResponseStruct):
     total: int
     tap: int
     hold: int
     slide: int
     touch: int
-    break_: int = field(metadata={"json_key": "break"})
+    # 部分谱面数据不含 break，视为没有 break
+    break_: int = field(default=0, metadata={"json_key": "break"})
 
-@dataclass
+@dataclass(slots=True)
 class BuddyNotes(ResponseStruct):
     left: Notes
     right: Notes
 
-@dataclass
+@dataclass(slots=True)
 class Genre(ResponseStruct):
     id: int
     title: str
     genre: str
 
 # 使用 kw_only=True 让所有参数仅限关键字传入，从而避免父类默认字段带来的顺序问题
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class SongDifficulty(ResponseStruct):
     type: SongType
     difficulty: LevelIndex
-    level: str
+    level: str = field(metadata={"intern": True})
     level_value: float
-    note_designer: str
+    note_designer: str = field(metadata={"intern": True})
     version: int
     notes: Notes = None
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class SongDifficultyUtage(SongDifficulty):
     kanji: str
     description: str
     is_buddy: bool
     notes: Union[Notes, BuddyNotes] = None
 
-@dataclass
+@dataclass(slots=True)
 class SongDifficulties(ResponseStruct):
     standard: List[SongDifficulty]
     dx: List[SongDifficulty]
     utage: List[SongDifficultyUtage] = None
 
-@dataclass
+@dataclass(slots=True)
 class Song(ResponseStruct):
     id: int
     title: str
     artist: str
-    genre: str
+    genre: str = field(metadata={"intern": True})
     bpm: int
     map: str = None
     version: int = None
@@ -207,29 +791,29 @@ class Song(ResponseStruct):
     disabled: bool = False
     difficulties: SongDifficulties = None
 
-@dataclass
+@dataclass(slots=True)
 class RatingTrend(ResponseStruct):
     total: int
     standard: int
     dx: int
     date: str
 
-@dataclass
+@dataclass(slots=True)
 class SimpleScore(ResponseStruct):
     id: int
-    song_name: str
-    level: str
+    song_name: str = field(metadata={"intern": True})
+    level: str = field(metadata={"intern": True})
     level_index: LevelIndex
     fc: FCType = None
     fs: FSType = None
     rate: RateType = None
     type: SongType = None
 
-@dataclass
+@dataclass(slots=True)
 class Score(ResponseStruct):
     id: int
-    song_name: str
-    level: str
+    song_name: str = field(metadata={"intern": True})
+    level: str = field(metadata={"intern": True})
     level_index: LevelIndex
     achievements: float
     fc: FCType = None
@@ -242,7 +826,7 @@ class Score(ResponseStruct):
     upload_time: str = None
     last_played_time: str = None
 
-@dataclass
+@dataclass(slots=True)
 class Player(ResponseStruct):
     name: str
     rating: int
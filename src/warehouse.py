@@ -0,0 +1,299 @@
+"""
+本地成绩仓库：使用 SQLite 保存曲目、谱面与多个玩家的成绩，供离线统计查询
+"""
+
+import sqlite3
+from dataclasses import fields
+from typing import Any, Iterable, Iterator
+
+from .util import BuddyNotes, Score, Song, Notes
+from .algorithm.algorithm import iter_note_sets
+from .algorithm.catalog import iter_difficulties
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS songs (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    artist TEXT,
+    genre TEXT,
+    bpm INTEGER,
+    map TEXT,
+    version INTEGER,
+    rights TEXT,
+    disabled INTEGER
+);
+CREATE TABLE IF NOT EXISTS difficulties (
+    song_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    level_index INTEGER NOT NULL,
+    level TEXT,
+    level_value REAL,
+    note_designer TEXT,
+    version INTEGER,
+    total INTEGER,
+    tap INTEGER,
+    hold INTEGER,
+    slide INTEGER,
+    touch INTEGER,
+    break INTEGER,
+    PRIMARY KEY (song_id, type, level_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS scores (
+    player TEXT NOT NULL,
+    song_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    level_index INTEGER NOT NULL,
+    song_name TEXT,
+    level TEXT,
+    achievements REAL NOT NULL,
+    fc TEXT,
+    fs TEXT,
+    dx_score INTEGER,
+    dx_rating REAL,
+    rate TEXT,
+    play_time TEXT,
+    upload_time TEXT,
+    last_played_time TEXT,
+    PRIMARY KEY (player, song_id, type, level_index)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS difficulties_level_value ON difficulties (level_value);
+CREATE INDEX IF NOT EXISTS difficulties_level_index ON difficulties (level_index);
+CREATE INDEX IF NOT EXISTS scores_chart ON scores (song_id, type, level_index);
+CREATE INDEX IF NOT EXISTS scores_rate ON scores (rate);
+CREATE INDEX IF NOT EXISTS scores_fc ON scores (fc);
+"""
+
+_SCORE_COLUMNS = (
+    "song_id",
+    "type",
+    "level_index",
+    "song_name",
+    "level",
+    "achievements",
+    "fc",
+    "fs",
+    "dx_score",
+    "dx_rating",
+    "rate",
+    "play_time",
+    "upload_time",
+    "last_played_time",
+)
+
+# 成绩与其谱面连接，之后可按谱面定数筛选
+_CHART_JOIN = (
+    "FROM scores s JOIN difficulties d ON d.song_id = s.song_id "
+    "AND d.type = s.type AND d.level_index = s.level_index"
+)
+_LEVEL_FILTER = "d.level_value >= ? AND d.level_value <= ?"
+
+
+def _value(member) -> Any:
+    return None if member is None else member.value
+
+
+def _song_row(song: Song) -> tuple:
+    return (
+        song.id,
+        song.title,
+        song.artist,
+        song.genre,
+        song.bpm,
+        song.map,
+        song.version,
+        song.rights,
+        song.disabled,
+    )
+
+
+def _chart_notes(notes: Notes | BuddyNotes | None) -> Notes | None:
+    note_sets = [n for _, n in iter_note_sets(notes)]
+    if len(note_sets) <= 1:
+        return note_sets[0] if note_sets else None
+    return Notes(*(sum(getattr(n, f.name) for n in note_sets) for f in fields(Notes)))
+
+
+def _difficulty_rows(song: Song) -> Iterator[tuple]:
+    for diff in iter_difficulties(song):
+        # 协力谱面的物量为左右两侧之和
+        notes = _chart_notes(diff.notes)
+        yield (
+            song.id,
+            diff.type.value,
+            diff.difficulty.value,
+            diff.level,
+            diff.level_value,
+            diff.note_designer,
+            diff.version,
+            *(
+                (notes.total, notes.tap, notes.hold, notes.slide, notes.touch)
+                if notes
+                else (None,) * 5
+            ),
+            notes.break_ if notes else None,
+        )
+
+
+def _score_row(player: str, score: Score) -> tuple:
+    return (
+        player,
+        score.id,
+        _value(score.type),
+        score.level_index.value,
+        score.song_name,
+        score.level,
+        score.achievements,
+        _value(score.fc),
+        _value(score.fs),
+        score.dx_score,
+        score.dx_rating,
+        _value(score.rate),
+        score.play_time,
+        score.upload_time,
+        score.last_played_time,
+    )
+
+
+class ScoreWarehouse:
+    """
+    基于 SQLite 的成绩仓库。
+
+    曲目、谱面（含物量）与成绩分表保存，谱面定数、难度、成绩评级与 FC 上建有索引，
+    统计查询在数据库中完成并以游标逐行返回，内存占用与数据总量无关。
+    写入均为批量 executemany，可直接传入流式读取的生成器。
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        - path: 数据库文件路径，默认为内存数据库
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        if path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(_SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> "ScoreWarehouse":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # ===== 写入 =====
+    def ingest_songs(self, songs: Iterable[Song]) -> int:
+        """
+        写入曲目与其所有谱面，已存在的曲目会被覆盖
+
+        返回值: 写入的曲目数
+        """
+        songs = list(songs)
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO songs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                map(_song_row, songs),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO difficulties "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (row for song in songs for row in _difficulty_rows(song)),
+            )
+        return len(songs)
+
+    def ingest_scores(self, player: str, scores: Iterable[Score]) -> int:
+        """
+        写入玩家成绩，同一谱面的成绩会被覆盖；没有谱面类型的成绩会被跳过
+
+        - player: 玩家标识，e.g. 好友码
+        - scores: 成绩列表，也可以是 iter_player_scores 的返回值
+        返回值: 写入的成绩数
+        """
+        with self.connection:
+            cursor = self.connection.executemany(
+                f"INSERT OR REPLACE INTO scores (player, {', '.join(_SCORE_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * (len(_SCORE_COLUMNS) + 1))})",
+                (
+                    _score_row(player, score)
+                    for score in scores
+                    if score.type is not None
+                ),
+            )
+        return cursor.rowcount
+
+    # ===== 查询 =====
+    def query(self, sql: str, parameters: Iterable = ()) -> sqlite3.Cursor:
+        """
+        执行任意只读查询，返回可逐行迭代的游标
+        """
+        return self.connection.execute(sql, tuple(parameters))
+
+    def players(self) -> list[str]:
+        return [row[0] for row in self.query("SELECT DISTINCT player FROM scores")]
+
+    def iter_scores(self, player: str) -> Iterator[Score]:
+        """
+        逐条读取玩家的成绩
+        """
+        cursor = self.query(
+            f"SELECT {', '.join(_SCORE_COLUMNS)} FROM scores WHERE player = ?",
+            (player,),
+        )
+        keys = ("id",) + _SCORE_COLUMNS[1:]
+        return Score.iter_list(dict(zip(keys, row)) for row in cursor)
+
+    def ap_rate(
+        self,
+        min_level_value: float = 0.0,
+        max_level_value: float = float("inf"),
+    ) -> Iterator[tuple[int, str, int, int, int, float]]:
+        """
+        统计定数范围内每个谱面的 AP 率（AP 与 AP+ 均计入）
+
+        返回值: 逐行产生 (song_id, type, level_index, 成绩数, AP 数, AP 率)，按 AP 率降序
+        """
+        return self.query(
+            "SELECT s.song_id, s.type, s.level_index, COUNT(*) AS players, "
+            "SUM(IFNULL(s.fc, '') IN ('ap', 'app')) AS aps, "
+            "AVG(IFNULL(s.fc, '') IN ('ap', 'app')) AS ap_rate "
+            f"{_CHART_JOIN} WHERE {_LEVEL_FILTER} "
+            "GROUP BY s.song_id, s.type, s.level_index "
+            "ORDER BY ap_rate DESC, players DESC",
+            (min_level_value, max_level_value),
+        )
+
+    def achievement_histogram(
+        self,
+        min_level_value: float = 0.0,
+        max_level_value: float = float("inf"),
+        bucket: float = 0.5,
+    ) -> list[tuple[float, int]]:
+        """
+        统计定数范围内所有成绩的达成率分布
+        e.g. achievement_histogram(14.6) 统计所有 14+ 及以上谱面
+
+        返回值: [(区间下限, 成绩数)]，区间宽度为 bucket，按下限升序
+        """
+        cursor = self.query(
+            "SELECT CAST(s.achievements / ? AS INTEGER) AS bin, COUNT(*) "
+            f"{_CHART_JOIN} WHERE {_LEVEL_FILTER} GROUP BY bin ORDER BY bin",
+            (bucket, min_level_value, max_level_value),
+        )
+        return [(round(index * bucket, 4), count) for index, count in cursor]
+
+    def rate_distribution(
+        self,
+        min_level_value: float = 0.0,
+        max_level_value: float = float("inf"),
+    ) -> dict[str, int]:
+        """
+        统计定数范围内所有成绩的评级分布，e.g. {"sssp": 120, "sss": 300, ...}
+        """
+        cursor = self.query(
+            "SELECT s.rate, COUNT(*) "
+            f"{_CHART_JOIN} WHERE {_LEVEL_FILTER} GROUP BY s.rate",
+            (min_level_value, max_level_value),
+        )
+        return dict(cursor.fetchall())
@@ -0,0 +1,35 @@
+import asyncio
+
+from src.client import AsyncClient
+from src.api import aio
+
+
+def test_concurrent_get_song(stub_server, song_payload):
+    async def run(root_url):
+        async with AsyncClient(root_url, max_concurrency=8) as client:
+            return await asyncio.gather(
+                *(aio.get_song(8, client=client) for _ in range(50))
+            )
+
+    songs = asyncio.run(run(stub_server().root_url))
+    assert len(songs) == 50
+    assert all(song.title == song_payload["title"] for song in songs)
+
+
+def test_not_found(stub_server):
+    async def run(root_url):
+        async with AsyncClient(root_url, retries=0) as client:
+            return await aio.get_song(1, client=client)
+
+    assert asyncio.run(run(stub_server({}).root_url)) is None
+
+
+def test_retry_html_error_body(stub_server, song_payload):
+    async def run(root_url):
+        async with AsyncClient(root_url, backoff_factor=0) as client:
+            return await aio.get_song(8, client=client)
+
+    html = b"<html><body>502 Bad Gateway</body></html>"
+    server = stub_server(throttle=2, error_status=502, error_body=html)
+    song = asyncio.run(run(server.root_url))
+    assert song.title == song_payload["title"] and server.request_count == 3
@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from src.algorithm import (
+    LOSS_COEFFICIENTS,
+    LossTable,
+    NotesBatch,
+    SongCatalog,
+    batch_achievement_loss,
+    batch_total_achievement_loss,
+    extract_notes,
+    get_achievement_loss_from_notes,
+    get_total_achievement_loss_from_song,
+    get_total_achievement_loss_from_notes,
+)
+from src.util import BuddyNotes, LevelIndex, Notes, Song, SongType
+from benchmarks.fixtures import song_list_payload
+
+NOTES = [
+    Notes(total=500, tap=350, hold=40, slide=50, touch=20, break_=40),
+    Notes(total=900, tap=700, hold=60, slide=80, touch=0, break_=60),
+    Notes(total=300, tap=250, hold=20, slide=30, touch=0, break_=0),
+]
+LOSS_DICTS = [
+    {"tap": {"great": 3, "miss": 1}},
+    {"break": {"perfect": 2, "great": 1}, "slide": {"good": 1}},
+    {"hold": {"good": 2}},
+]
+
+
+def test_loss_values():
+    notes = NOTES[0]
+    x = 1 / (350 + 40 * 2 + 50 * 3 + 20 + 40 * 5)
+    y = 1 / 40 * 0.01
+    assert get_achievement_loss_from_notes(notes, "tap", "great") == (0.2 * x,)
+    assert get_achievement_loss_from_notes(notes, "break", "great") == (
+        x + 0.6 * y,
+        2 * x + 0.6 * y,
+        2.5 * x + 0.6 * y,
+    )
+    assert get_achievement_loss_from_notes(notes, "touch", "great") is None
+
+
+def test_batch_total_matches_scalar():
+    lower, upper = batch_total_achievement_loss(NOTES, LOSS_DICTS)
+    assert lower.shape == upper.shape == (3, 3)
+    for i, notes in enumerate(NOTES):
+        for j, loss_dict in enumerate(LOSS_DICTS):
+            if notes.break_ == 0 and "break" in loss_dict:
+                assert np.isnan(lower[i, j])
+                continue
+            expected = get_total_achievement_loss_from_notes(notes, loss_dict)
+            assert np.allclose((lower[i, j], upper[i, j]), expected)
+
+
+def test_batch_single_matches_scalar():
+    for note_type, accuracy in LOSS_COEFFICIENTS:
+        table = batch_achievement_loss(NOTES[:2], note_type, accuracy)
+        for row, notes in zip(table, NOTES):
+            expected = get_achievement_loss_from_notes(notes, note_type, accuracy)
+            assert np.allclose(row, expected)
+
+
+def test_notes_batch_from_catalog():
+    catalog = SongCatalog(Song.from_list(song_list_payload(songs=30)["songs"]))
+    batch = NotesBatch.from_catalog(catalog, LevelIndex.MASTER)
+    assert all(key[2] is LevelIndex.MASTER for key in batch.keys)
+    table = batch.achievement_loss("break", "perfect")
+    key = batch.keys[0]
+    expected = get_achievement_loss_from_notes(
+        catalog.charts[key].notes, "break", "perfect"
+    )
+    assert np.allclose(table[batch.index[key]], expected)
+
+
+def test_loss_table(tmp_path):
+    songs = Song.from_list(song_list_payload(songs=30)["songs"])
+    catalog = SongCatalog(songs, version=24000)
+    table = LossTable.load_or_build(catalog, tmp_path / "loss.npz")
+    loaded = LossTable.load_or_build(catalog, tmp_path / "loss.npz")
+    assert loaded.keys == table.keys and loaded.version == 24000
+    lower, upper = loaded.total_achievement_loss(LOSS_DICTS)
+    assert any(len(key) == 4 for key in loaded.keys)
+    for key, row in loaded.index.items():
+        notes = catalog.get_notes_by_key(key)
+        for j, loss_dict in enumerate(LOSS_DICTS):
+            expected = get_total_achievement_loss_from_notes(notes, loss_dict)
+            assert np.allclose((lower[row, j], upper[row, j]), expected)
+        assert np.allclose(
+            loaded.get_total_achievement_loss(
+                key[0], key[2], LOSS_DICTS[1], key[1], *key[3:]
+            ),
+            get_total_achievement_loss_from_notes(notes, LOSS_DICTS[1]),
+        )
+        assert np.allclose(
+            loaded.get_achievement_loss(
+                key[0], key[2], "break", "great", key[1], *key[3:]
+            ),
+            get_achievement_loss_from_notes(notes, "break", "great"),
+        )
+
+
+def test_buddy_notes():
+    songs = Song.from_list(song_list_payload(songs=30)["songs"])
+    song = next(
+        s
+        for s in songs
+        if s.difficulties.utage
+        and isinstance(s.difficulties.utage[0].notes, BuddyNotes)
+    )
+    buddy = extract_notes(song, 0, "utage")
+    assert isinstance(buddy, BuddyNotes)
+    assert extract_notes(song, 0, SongType.UTAGE, "right") is buddy.right
+    assert get_total_achievement_loss_from_song(
+        song, 0, LOSS_DICTS[0], "utage", "left"
+    ) == get_total_achievement_loss_from_notes(buddy.left, LOSS_DICTS[0])
+    with pytest.raises(ValueError):
+        get_total_achievement_loss_from_song(song, 0, LOSS_DICTS[0], "utage")
+
+    batch = NotesBatch.from_catalog(SongCatalog(songs), type=SongType.UTAGE)
+    key = (song.id, SongType.UTAGE, LevelIndex.BASIC)
+    assert (*key, "left") in batch.index and (*key, "right") in batch.index
+    assert batch.notes[batch.index[(*key, "right")]][0] == buddy.right.tap
@@ -0,0 +1,48 @@
+from src.cache import CacheEntry, CatalogueCache, LRUCache, cache_key
+from src.client import Client
+from src.api.raw import get_alias_list
+
+ROUTES = {"maimai/alias/list": {"aliases": [{"song_id": 8, "aliases": ["tls"]}]}}
+
+
+def test_cache_key():
+    assert cache_key("song/list?version=24000&notes=true") == (
+        "song/list?notes=true",
+        "24000",
+    )
+    assert cache_key("alias/list") == ("alias/list", "latest")
+
+
+def test_lru_eviction():
+    cache = LRUCache(maxsize=2)
+    for i in range(3):
+        cache.put(i, CacheEntry({}, 0))
+    assert len(cache) == 2 and cache.get(0) is None
+    assert cache.stats.evictions == 1
+
+
+def test_memory_hit(stub_server):
+    server = stub_server(ROUTES)
+    client = Client(server.root_url, cache=CatalogueCache())
+    assert get_alias_list(client=client) == get_alias_list(client=client)
+    assert server.request_count == 1
+    assert client.cache.stats.hits == 1 and client.cache.stats.misses == 1
+
+
+def test_revalidation(stub_server):
+    server = stub_server(ROUTES)
+    client = Client(server.root_url, cache=CatalogueCache(ttl=0))
+    get_alias_list(client=client)
+    aliases = get_alias_list(client=client)
+    assert aliases[0].aliases == ["tls"]
+    assert client.cache.stats.not_modified == 1
+
+
+def test_disk_persistence(tmp_path, stub_server):
+    server = stub_server(ROUTES)
+    first = Client(server.root_url, cache=CatalogueCache(disk_root=tmp_path))
+    get_alias_list(client=first)
+    second = Client(server.root_url, cache=CatalogueCache(disk_root=tmp_path))
+    assert get_alias_list(client=second)[0].song_id == 8
+    assert server.request_count == 1
+    assert second.cache.stats.disk_hits == 1
@@ -0,0 +1,47 @@
+from dataclasses import replace
+
+from src.algorithm import SongCatalog, extract_notes
+from src.util import Alias, LevelIndex, Song
+from benchmarks.fixtures import song_list_payload
+
+SONGS = Song.from_list(song_list_payload(songs=50)["songs"])
+
+
+def test_lookup_matches_extract_notes():
+    catalog = SongCatalog(SONGS)
+    for song in SONGS:
+        for diff in song.difficulties.dx:
+            assert catalog.get_notes(song.id, diff.difficulty, "dx") == extract_notes(
+                song, diff.difficulty, "dx"
+            )
+    assert catalog.get_difficulty(SONGS[0].id, LevelIndex.RE_MASTER, "dx") in (
+        None,
+        *SONGS[0].difficulties.dx,
+    )
+
+
+def test_title_and_alias():
+    catalog = SongCatalog(SONGS, [Alias(song_id=3, aliases=["三", "Three"])])
+    assert catalog.find_by_title(SONGS[0].title) == [SONGS[0]]
+    assert catalog.find_by_alias("three") == [3]
+    catalog.update(SONGS, [Alias(song_id=4, aliases=["three"])])
+    assert catalog.find_by_alias("three") == [4] and catalog.find_by_alias("三") == []
+
+
+def test_level_range():
+    catalog = SongCatalog(SONGS)
+    charts = catalog.charts_in_range(14.6)
+    expected = {k for k, d in catalog.charts.items() if d.level_value >= 14.6}
+    assert {key for key, _ in charts} == expected
+    values = [diff.level_value for _, diff in charts]
+    assert values == sorted(values)
+
+
+def test_incremental_update():
+    catalog = SongCatalog(SONGS, version=24000)
+    changed_song = replace(SONGS[1], title="renamed")
+    changed = catalog.update([SONGS[0], changed_song, *SONGS[3:]], version=25000)
+    assert changed == {SONGS[1].id, SONGS[2].id}
+    assert catalog.version == 25000 and SONGS[2].id not in catalog
+    assert catalog.find_by_title("renamed") == [changed_song]
+    assert len(catalog._by_level) == len(catalog.charts)
@@ -0,0 +1,34 @@
+from src.client import Client
+from src.api.raw import get_song, get_alias_list
+
+
+def test_client_injection(stub_server, song_payload):
+    routes = {"maimai/song/8": song_payload, "maimai/alias/list": {"aliases": []}}
+    with Client(stub_server(routes).root_url) as client:
+        song = get_song(8, client=client)
+        assert song.title == "True Love Song"
+        assert get_alias_list(client=client) == []
+
+
+def test_client_not_found(stub_server):
+    with Client(stub_server({}).root_url, retries=0) as client:
+        assert get_song(1, client=client) is None
+
+
+def test_stream_retry_closes_responses(stub_server, song_payload):
+    server = stub_server({"maimai/song/8": song_payload}, throttle=2)
+    with Client(server.root_url, retries=2, backoff_factor=0) as client:
+        responses = []
+        session_get = client.session.get
+
+        def get(*args, **kwargs):
+            responses.append(session_get(*args, **kwargs))
+            return responses[-1]
+
+        client.session.get = get
+        response = client.get("maimai/song/8", stream=True)
+        assert response.status_code == 200
+        assert [r.status_code for r in responses] == [429, 429, 200]
+        assert all(r.raw.closed for r in responses[:2])
+        assert not response.raw.closed
+        response.close()
@@ -0,0 +1,106 @@
+import random
+
+from src.algorithm import CollectionIndex
+from src.util import Collection, Score
+from benchmarks.fixtures import plate_list_payload, scores_payload
+
+# 没有曲目的版本的姓名框不在索引中
+PLATES = [
+    plate
+    for plate in Collection.from_list(plate_list_payload(songs=40)["plates"])
+    if plate.required[0].songs
+]
+RATES = ["sssp", "sss", "ssp", "ss", "sp", "s"]
+
+
+def naive_completed(collection: Collection, scores: list[Score]) -> int:
+    """
+    逐个要求遍历成绩列表的直接实现，用于对照
+    """
+    order = {"rate": RATES, "fc": ["app", "ap", "fcp", "fc"]}
+    order["fs"] = ["fsdp", "fsd", "fsp", "fs", "sync"]
+    completed = 0
+    for required in collection.required:
+        for song in required.songs:
+            for level in required.difficulties:
+                completed += any(
+                    s.id == song.id
+                    and s.type == song.type
+                    and s.level_index == level
+                    and all(
+                        getattr(required, name) is None
+                        or getattr(s, name) is not None
+                        and ranks.index(getattr(s, name).value)
+                        <= ranks.index(getattr(required, name).value)
+                        for name, ranks in order.items()
+                    )
+                    for s in scores
+                )
+    return completed
+
+
+def player_scores(seed: int) -> list[Score]:
+    # 只使用姓名框中出现的谱面，使部分姓名框可以完成
+    rng = random.Random(seed)
+    payload = scores_payload(scores=600, songs=40, seed=seed)["data"]
+    charts = [
+        (song.id, song.type.value, level.value)
+        for plate in PLATES
+        for required in plate.required
+        for song in required.songs
+        for level in required.difficulties
+    ]
+    for record in payload:
+        record["id"], record["type"], record["level_index"] = rng.choice(charts)
+        record["rate"] = rng.choice(RATES)
+    return Score.from_list(payload)
+
+
+def test_matches_naive():
+    index = CollectionIndex(PLATES)
+    scores = player_scores(1)
+    progress = index.progress(scores)
+    for plate in PLATES:
+        result = progress.get(plate.id)
+        assert result.completed == naive_completed(plate, scores)
+        assert result.total - result.completed == len(result.missing)
+        assert progress.is_done(plate.id) == result.done
+
+
+def test_incremental_update():
+    index = CollectionIndex(PLATES)
+    scores = player_scores(2)
+    full = index.progress(scores)
+    progress = index.progress(scores[:300])
+    changed = progress.update(scores[300:])
+    assert progress.masks == full.masks
+    before = index.progress(scores[:300])
+    assert changed == {
+        p.id for p in PLATES if before.get(p.id).completed != full.get(p.id).completed
+    }
+    assert progress.update(scores) == set()
+
+
+def test_completion():
+    plate = next(p for p in PLATES if p.name.endswith("将"))
+    required = plate.required[0]
+    scores = [
+        Score(
+            id=song.id,
+            song_name=song.title,
+            level="13",
+            level_index=level,
+            achievements=100.5,
+            rate=required.rate,
+            type=song.type,
+        )
+        for song in required.songs
+        for level in required.difficulties
+    ]
+    progress = CollectionIndex(PLATES).progress(scores[:-1])
+    assert not progress.is_done(plate.id)
+    assert progress.get(plate.id).missing == [
+        (scores[-1].id, scores[-1].type, scores[-1].level_index)
+    ]
+    assert progress.update(scores[-1:]) == {plate.id}
+    assert plate in progress.completed()
@@ -0,0 +1,50 @@
+from src.algorithm import get_total_achievement_loss_from_notes
+from src.api import (
+    get_songs_notes,
+    get_songs_total_achievement_loss,
+)
+from src.client import Client
+from src.util import LevelIndex, Song
+from benchmarks.fixtures import song_list_payload
+
+PAYLOAD = song_list_payload(songs=10)
+ROUTES = {f"maimai/song/{song['id']}": song for song in PAYLOAD["songs"]}
+ROUTES["maimai/song/list"] = PAYLOAD
+SONGS = {song.id: song for song in Song.from_list(PAYLOAD["songs"])}
+QUERIES = [
+    (song.id, diff.difficulty, "dx")
+    for song in SONGS.values()
+    for diff in song.difficulties.dx
+]
+
+
+def test_batch_order_and_dedup(stub_server):
+    server = stub_server(ROUTES)
+    with Client(server.root_url) as client:
+        results = get_songs_notes(QUERIES, client=client)
+        assert server.request_count == len({q[0] for q in QUERIES})
+    assert all(r.ok for r in results)
+    for (song_id, difficulty, _), result in zip(QUERIES, results):
+        notes = [
+            d for d in SONGS[song_id].difficulties.dx if d.difficulty == difficulty
+        ]
+        assert result.value == notes[0].notes
+
+
+def test_batch_song_list_and_failures(stub_server):
+    loss_dict = {"tap": {"great": 2}}
+    queries = QUERIES[:3] + [(9999, LevelIndex.MASTER, "dx")] + QUERIES[3:5]
+    server = stub_server(ROUTES)
+    with Client(server.root_url) as client:
+        results = get_songs_total_achievement_loss(
+            queries, loss_dict, client=client, list_threshold=1
+        )
+        assert server.request_count == 1
+    assert [r.ok for r in results] == [True] * 3 + [False] + [True] * 2
+    assert isinstance(results[3].error, LookupError)
+    notes = [
+        d for d in SONGS[queries[4][0]].difficulties.dx if d.difficulty == queries[4][1]
+    ]
+    assert results[4].value == get_total_achievement_loss_from_notes(
+        notes[0].notes, loss_dict
+    )
@@ -0,0 +1,40 @@
+import copy
+
+import pytest
+
+from benchmarks.stub_server import StubServer
+
+# 客户端相关测试共用的曲目响应
+SONG = {
+    "id": 8,
+    "title": "True Love Song",
+    "artist": "Kai",
+    "genre": "maimai",
+    "bpm": 150,
+    "difficulties": {"standard": [], "dx": []},
+}
+
+
+@pytest.fixture
+def song_payload() -> dict:
+    return copy.deepcopy(SONG)
+
+
+@pytest.fixture
+def stub_server():
+    """
+    启动本地桩服务的工厂，参数同 StubServer，默认路由只有 maimai/song/8；
+    测试结束时关闭所有启动的服务
+    """
+    servers = []
+
+    def start(routes: dict = None, **kwargs) -> StubServer:
+        if routes is None:
+            routes = {"maimai/song/8": SONG}
+        server = StubServer(routes, **kwargs).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
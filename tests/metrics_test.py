@@ -0,0 +1,75 @@
+from src import metrics
+from src.cache import CatalogueCache
+from src.client import Client, _record_request
+from src.api.raw import get_song
+from src.algorithm import get_total_achievement_loss_from_notes
+from src.util import Notes
+
+
+def test_endpoint_label():
+    assert metrics.endpoint_label("maimai/song/8?version=24000") == "maimai/song/{id}"
+    assert metrics.endpoint_label("maimai/song/list") == "maimai/song/list"
+
+
+def test_metrics_collection(stub_server):
+    exporter = metrics.InMemoryExporter()
+    recorder = metrics.enable_metrics(metrics.Metrics([exporter]))
+    try:
+        cache = CatalogueCache()
+        recorder.watch_cache(cache)
+        with Client(stub_server().root_url, cache=cache) as client:
+            get_song(8, client=client)
+            get_song(8, 23000, client)
+        notes = Notes(total=10, tap=5, hold=1, slide=1, touch=1, break_=2)
+        get_total_achievement_loss_from_notes(notes, {"tap": {"great": 1}})
+        recorder.export()
+    finally:
+        metrics.disable_metrics()
+
+    data = exporter.snapshots[-1]
+    latency = data["histograms"][
+        (
+            "lxns_http_request_seconds",
+            (("endpoint", "maimai/song/{id}"), ("status", "200")),
+        )
+    ]
+    assert latency["count"] == 2
+    decode = data["histograms"][("lxns_decode_seconds", (("struct", "Song"),))]
+    assert decode["count"] == 2
+    counters = data["counters"]
+    assert (
+        counters[
+            ("lxns_http_response_bytes_total", (("endpoint", "maimai/song/{id}"),))
+        ]
+        > 0
+    )
+    assert (
+        counters[
+            (
+                "lxns_algorithm_calls_total",
+                (("function", "get_achievement_loss_from_notes"),),
+            )
+        ]
+        == 1
+    )
+    assert data["gauges"][("lxns_cache_misses", (("cache", "catalogue"),))] == 2
+
+    text = metrics.to_prometheus_text(recorder)
+    assert "# TYPE lxns_http_request_seconds histogram" in text
+    assert 'lxns_decode_seconds_bucket{struct="Song",le="+Inf"} 2' in text
+
+
+def test_prometheus_exporter_replaces_file(tmp_path):
+    path = str(tmp_path / "lxns.prom")
+    recorder = metrics.Metrics([metrics.PrometheusExporter(path)])
+    recorder.increment("lxns_algorithm_calls_total", function="f")
+    recorder.export()
+    with open(path, encoding="utf-8") as f:
+        assert 'lxns_algorithm_calls_total{function="f"} 1' in f.read()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["lxns.prom"]
+
+
+def test_record_request_after_disable():
+    metrics.disable_metrics()
+    _record_request("maimai/song/8", 200, 0.0)
+    metrics.count_call("f")
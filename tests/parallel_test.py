@@ -0,0 +1,43 @@
+import pytest
+
+from src.algorithm import (
+    ParallelRunner,
+    SongCatalog,
+    get_total_achievement_loss_from_notes,
+    total_achievement_loss_task,
+)
+from src.util import Song
+from benchmarks.fixtures import song_list_payload
+
+SONGS = Song.from_list(song_list_payload(songs=50)["songs"])
+LOSS_DICT = {"tap": {"great": 2}, "break": {"perfect": 1}}
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_runner_matches_serial(start_method):
+    catalog = SongCatalog(SONGS)
+    queries = [(key[0], key[2], key[1], LOSS_DICT) for key in catalog.charts]
+    queries.append((99999, "master", None, LOSS_DICT))
+    progress = []
+    with ParallelRunner(catalog, 2, 16, start_method) as runner:
+        results = runner.total_achievement_loss(
+            queries, lambda done, total: progress.append((done, total))
+        )
+    assert results == [total_achievement_loss_task(catalog, q) for q in queries]
+    assert results[-1] is None
+    assert results[0] == get_total_achievement_loss_from_notes(
+        catalog.get_notes(*queries[0][:3]), LOSS_DICT
+    )
+    assert progress[-1] == (len(queries), len(queries))
+
+
+def test_runners_keep_their_own_catalog():
+    first = SongCatalog(SONGS[:10])
+    second = SongCatalog(SONGS[10:20])
+    queries = [(key[0], key[2], key[1], LOSS_DICT) for key in first.charts]
+    with ParallelRunner(first, 2, 4, "fork") as runner:
+        with ParallelRunner(second, 2, 4, "fork") as other:
+            other.total_achievement_loss(queries[:1])
+        results = runner.total_achievement_loss(queries)
+    assert results == [total_achievement_loss_task(first, q) for q in queries]
+    assert all(result is not None for result in results)
@@ -0,0 +1,31 @@
+import random
+
+from src.algorithm import RatingEngine, SongCatalog, get_rating
+from src.util import Score, Song
+from benchmarks.fixtures import scores_payload, song_list_payload
+
+SONGS = Song.from_list(song_list_payload(songs=200)["songs"])
+
+
+def test_get_rating():
+    assert get_rating(13.7, 100.5) == 308
+    assert get_rating(15.0, 101.0) == 337
+    assert get_rating(13.0, 99.5) == 272
+    assert get_rating(13.0, 99.4999) == 269
+    assert get_rating(10.0, 0.0) == 0
+
+
+def test_batch_matches_best50():
+    engine = RatingEngine(SongCatalog(SONGS), current_version=23000)
+    players = [
+        Score.from_list(
+            scores_payload(random.Random(i).randrange(0, 300), 200, i)["data"]
+        )
+        for i in range(20)
+    ]
+    totals = engine.batch_ratings(players)
+    for scores, (total, standard, dx) in zip(players, totals):
+        best = engine.best50(scores)
+        assert len(best.standard) <= 35 and len(best.dx) <= 15
+        assert (best.total, best.standard_total, best.dx_total) == (total, standard, dx)
+        assert all(e.difficulty.version >= 23000 for e in best.dx)
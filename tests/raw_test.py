@@ -0,0 +1,24 @@
+from src.client import Client
+from src.api import raw
+from benchmarks.fixtures import stub_routes
+
+
+def test_raw_endpoints_offline(stub_server):
+    server = stub_server(stub_routes())
+    with Client(server.root_url) as client:
+        assert raw.get_player("token", client).name
+        assert len(raw.get_player_scores("token", client)) == 2000
+        assert sum(1 for _ in raw.iter_player_scores("token", client)) == 2000
+        assert len(raw.get_song_list(client=client)["songs"]) == 1400
+        assert sum(1 for _ in raw.iter_song_list(client=client)) == 1400
+        assert raw.get_song(1, client=client).id == 1
+        assert raw.get_alias_list(client=client)
+        assert raw.get_icon_list(client=client)
+        assert raw.get_icon(1, client=client).id == 1
+        plates = raw.get_plate_list(required=True, client=client)
+        assert plates[0].required[0].songs
+        assert raw.get_plate(1, client=client).id == 1
+        assert raw.get_frame_list(client=client)
+        assert raw.get_frame(1, client=client).id == 1
+        assert raw.get_collection_genre_list(client=client)
+        assert raw.get_collection_genre(1, client=client).id == 1
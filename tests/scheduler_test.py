@@ -0,0 +1,65 @@
+import threading
+import time
+
+import pytest
+
+from src.client import APIError, Client
+from src.scheduler import Priority, RequestScheduler
+from src.api.raw import get_player
+
+PLAYER = {"name": "maimai", "rating": 15000, "friend_code": 1}
+
+
+def _wait_until(predicate, timeout: float = 5.0):
+    # 只用于等待其他线程进入队列，不对耗时做断言
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_interactive_preempts_bulk():
+    scheduler = RequestScheduler(rate=1000, burst=1)
+    # 暂停期间所有请求只能排队，恢复后按 (优先级, 到达顺序) 依次取得令牌
+    scheduler.pause(3600)
+    order = []
+
+    def worker(name, priority):
+        scheduler.acquire(priority)
+        order.append(name)
+
+    threads = []
+    for i, (name, priority) in enumerate(
+        [(f"bulk{i}", Priority.BULK) for i in range(3)]
+        + [("interactive", Priority.INTERACTIVE)]
+    ):
+        thread = threading.Thread(target=worker, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        _wait_until(lambda: scheduler.queue_depth == i + 1)
+    assert scheduler.queue_depth_by_priority()[Priority.BULK] == 3
+    assert order == []
+    scheduler.resume()
+    for thread in threads:
+        thread.join()
+    assert order == ["interactive", "bulk0", "bulk1", "bulk2"]
+    assert scheduler.queue_depth == 0
+    assert scheduler.stats.requests == 4 and scheduler.stats.max_wait > 0
+
+
+def test_throttled_requests_back_off(stub_server):
+    routes = {"user/maimai/player": {"success": True, "data": PLAYER}}
+    scheduler = RequestScheduler(rate=100, burst=10)
+    server = stub_server(routes, throttle=2)
+    with Client(server.root_url, backoff_factor=0.01, scheduler=scheduler) as client:
+        assert get_player("token", client).name == "maimai"
+        assert server.request_count == 3
+    assert scheduler.stats.throttled == 2
+
+
+def test_player_info_error_status(stub_server):
+    server = stub_server({})
+    with Client(server.root_url, retries=0) as client:
+        with pytest.raises(APIError) as info:
+            get_player("token", client)
+    assert info.value.status == 404
@@ -0,0 +1,60 @@
+from src.algorithm import SongCatalog, SongSearchIndex, normalize
+from src.util import Alias, Song
+
+SONGS = [
+    Song(id=1, title="PANDORA PARADOXXX", artist="", genre="", bpm=150),
+    Song(id=2, title="パラドクスィ", artist="", genre="", bpm=150),
+    Song(id=3, title="群青シグナル", artist="", genre="", bpm=150),
+    Song(id=4, title="+♂", artist="", genre="", bpm=150),
+]
+ALIASES = [Alias(1, ["潘多拉", "ぱんどら"]), Alias(3, ["グンジョウ"])]
+
+
+def test_normalize():
+    assert normalize("ＰＡＮＤＯＲＡ　パラドクス!") == "pandoraぱらどくす"
+    assert normalize("+ ♂") == "+♂"
+
+
+def test_search_titles_and_aliases():
+    index = SongSearchIndex(SONGS, ALIASES)
+    assert index.search_ids("pandora")[0] == 1
+    assert index.search_ids("パンドラ") == [1]
+    assert index.search_ids("ぐんじょう") == [3]
+    assert index.search_ids("群青")[0] == 3
+    assert index.search_ids("+♂") == [4]
+    assert index.search_ids("paradox")[:1] == [1]
+    hit = index.search("潘多拉")[0]
+    assert (hit.song_id, hit.kind, hit.name, hit.score) == (1, "alias", "潘多拉", 3)
+    assert index.search("zzzz") == []
+
+
+def test_incremental_aliases():
+    index = SongSearchIndex(SONGS, ALIASES)
+    changed = index.set_aliases([Alias(1, ["潘多拉", "ぱんどら"]), Alias(2, ["ぐん"])])
+    assert changed == {2, 3}
+    assert 3 not in index.search_ids("ぐんじょう")
+    assert index.search("ぐん")[0].song_id == 2
+    index.remove_song(1)
+    assert index.search_ids("潘多拉") == []
+    rebuilt = SongSearchIndex(SONGS[1:], [Alias(2, ["ぐん"])])
+    assert len(index) == len(rebuilt)
+
+
+def test_from_catalog():
+    catalog = SongCatalog(SONGS, ALIASES)
+    index = SongSearchIndex.from_catalog(catalog)
+    assert len(index) == len(SongSearchIndex(SONGS, ALIASES))
+    assert index.search_ids("ぐんじょう") == [3]
+
+
+def test_single_character_exact_match():
+    songs = [
+        Song(id=1, title="天空", artist="", genre="", bpm=150),
+        Song(id=2, title="天", artist="", genre="", bpm=150),
+        Song(id=3, title="A", artist="", genre="", bpm=150),
+        Song(id=4, title="Ab", artist="", genre="", bpm=150),
+    ]
+    index = SongSearchIndex(songs)
+    assert index.search_ids("天")[0] == 2
+    assert index.search("天")[0].score == 3
+    assert index.search_ids("a") == [3, 4]
@@ -0,0 +1,34 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from src.client import AsyncClient, Client
+from src.api import aio
+from src.api.raw import get_song
+
+
+def test_threaded_calls_share_fetch(stub_server):
+    server = stub_server(delay=0.2)
+    with Client(server.root_url) as client:
+        with ThreadPoolExecutor(8) as pool:
+            songs = list(pool.map(lambda _: get_song(8, client=client), range(8)))
+        assert server.request_count == 1
+        assert all(song is songs[0] for song in songs)
+        # 进行中的调用结束后不再共享
+        assert get_song(8, 24000, client) is not songs[0]
+        assert server.request_count == 2
+
+
+def test_async_calls_share_fetch(stub_server):
+    async def main(client):
+        return await asyncio.gather(*(aio.get_song(8, client=client) for _ in range(8)))
+
+    server = stub_server(delay=0.2)
+    client = AsyncClient(server.root_url)
+
+    async def run():
+        async with client:
+            return await main(client)
+
+    songs = asyncio.run(run())
+    assert server.request_count == 1
+    assert all(song is songs[0] for song in songs)
@@ -0,0 +1,60 @@
+from src.client import Client
+from src.snapshot import Snapshot, SnapshotRefresher, export_snapshot
+from src.api.raw import get_alias_list, get_icon, get_icon_list, get_song, get_song_list
+from benchmarks.fixtures import song_list_payload
+
+ICONS = {"icons": [{"id": 1, "name": "icon", "genre": "genre"}]}
+ROUTES = {
+    "maimai/song/list": song_list_payload(songs=20),
+    "maimai/alias/list": {"aliases": [{"song_id": 1, "aliases": ["one"]}]},
+    "maimai/icon/list": ICONS,
+    "maimai/plate/list": {"plates": []},
+    "maimai/frame/list": {"frames": []},
+    "maimai/collection-genre/list": {"collectionGenres": []},
+}
+
+
+def test_snapshot_serves_offline(tmp_path, stub_server):
+    path = str(tmp_path / "snapshot.bin")
+    server = stub_server(ROUTES)
+    with Client(server.root_url) as client:
+        export_snapshot(path, 24000, client)
+
+    # 不可达的地址：所有请求都必须由快照回答
+    with Snapshot(path) as snapshot, Client(
+        "http://127.0.0.1:9/", retries=0, snapshot=snapshot
+    ) as client:
+        assert len(get_song_list(client=client)["songs"]) == 20
+        assert get_song(3, client=client).id == 3
+        assert get_song(999, client=client) is None
+        assert get_alias_list(client=client)[0].aliases == ["one"]
+        assert get_icon_list(client=client)[0].name == "icon"
+        assert get_icon(1, client=client).id == 1
+        assert snapshot.get("song/list?version=23000&notes=true") is None
+
+
+def test_refresher_swaps_snapshot(tmp_path, stub_server):
+    path = str(tmp_path / "snapshot.bin")
+    server = stub_server(ROUTES)
+    with Client(server.root_url) as client:
+        refresher = SnapshotRefresher(client, path)
+        snapshot = refresher.refresh()
+        assert client.snapshot is snapshot
+        count = server.request_count
+        assert get_song(5, client=client).id == 5
+        assert server.request_count == count
+
+
+def test_refresher_reloads_in_place(tmp_path, stub_server):
+    path = str(tmp_path / "snapshot.bin")
+    server = stub_server(ROUTES)
+    with Client(server.root_url) as client:
+        refresher = SnapshotRefresher(client, path)
+        snapshot = refresher.refresh()
+        old_mmap = snapshot._mmap
+        assert get_song(5, client=client).id == 5
+        assert refresher.refresh() is snapshot
+        assert old_mmap.closed
+        assert get_song(5, client=client).id == 5
+        snapshot.close()
+        assert snapshot._mmap.closed
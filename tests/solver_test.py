@@ -0,0 +1,59 @@
+from src.algorithm import (
+    LOSS_KEYS,
+    NotesBatch,
+    SongCatalog,
+    achievement_budget,
+    batch_max_counts,
+    get_total_achievement_loss_from_notes,
+    iter_loss_combinations,
+    max_count,
+    max_counts,
+)
+from src.util import Notes, Song
+from benchmarks.fixtures import song_list_payload
+
+NOTES = Notes(total=530, tap=400, hold=50, slide=40, touch=20, break_=20)
+JUDGEMENTS = (("tap", "great"), ("tap", "miss"), ("break", "great"))
+
+
+def loss(notes, note_type, accuracy, count):
+    return get_total_achievement_loss_from_notes(notes, {note_type: {accuracy: count}})[
+        1
+    ]
+
+
+def test_max_count_is_tight():
+    budget = achievement_budget(100.5)
+    for note_type, accuracy in (("tap", "great"), ("break", "great"), ("hold", "miss")):
+        n = max_count(NOTES, 100.5, note_type, accuracy)
+        assert n >= 0
+        assert loss(NOTES, note_type, accuracy, n) <= budget + 1e-12
+        assert loss(NOTES, note_type, accuracy, n + 1) > budget
+    # 数量上限与无法达到的目标
+    assert max_count(NOTES, 50, "tap", "great") == NOTES.tap
+    assert max_count(NOTES, 101.5, "tap", "great") == -1
+
+
+def test_loss_combinations_are_maximal():
+    budget = achievement_budget(100.5) + 1e-12
+    combinations = list(iter_loss_combinations(NOTES, 100.5, JUDGEMENTS))
+    assert combinations
+    for loss_dict in combinations:
+        assert get_total_achievement_loss_from_notes(NOTES, loss_dict)[1] <= budget
+        for note_type, accuracy in JUDGEMENTS:
+            more = {t: dict(d) for t, d in loss_dict.items()}
+            more.setdefault(note_type, {}).setdefault(accuracy, 0)
+            more[note_type][accuracy] += 1
+            assert get_total_achievement_loss_from_notes(NOTES, more)[1] > budget
+    assert len({repr(c) for c in combinations}) == len(combinations)
+
+
+def test_batch_max_counts_matches_scalar():
+    catalog = SongCatalog(Song.from_list(song_list_payload(songs=30)["songs"]))
+    batch = NotesBatch.from_catalog(catalog)
+    targets = [100.5 if i % 2 else 99.0 for i in range(len(batch))]
+    counts = batch_max_counts(batch, targets)
+    assert counts.shape == (len(batch), len(LOSS_KEYS))
+    for row, key, target in zip(counts, batch.keys, targets):
+        expected = max_counts(catalog.get_notes_by_key(key), target)
+        assert row.tolist() == [expected[k] for k in LOSS_KEYS]
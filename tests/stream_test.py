@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from src.api.raw import get_song_list, iter_player_scores, iter_song_list
+from src.client import Client
+from src.stream import iter_json_array
+from benchmarks.fixtures import scores_payload, song_list_payload
+
+
+def chunked(data: bytes, size: int):
+    return (data[i : i + size] for i in range(0, len(data), size))
+
+
+@pytest.mark.parametrize("size", [1, 3, 64, 1 << 16])
+def test_iter_json_array_chunking(size):
+    payload = {
+        "code": 200,
+        "meta": {"songs": "not this"},
+        "data": {"songs": [{"id": 12345, "title": "曲目"}, 1.5, None, [1, 2]]},
+        "tail": [],
+    }
+    data = json.dumps(payload, ensure_ascii=False, indent=1).encode()
+    items = list(iter_json_array(chunked(data, size), "songs"))
+    assert items == payload["data"]["songs"]
+
+
+def test_iter_json_array_edge_cases():
+    assert list(iter_json_array([b'{"data": []}'], "data")) == []
+    assert list(iter_json_array([b"{}"], "data")) == []
+    assert list(iter_json_array([b'{"a": 1}'], "data")) == []
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"data": [1, 2'], "data"))
+
+
+def test_streaming_api(stub_server):
+    songs = song_list_payload(songs=20)
+    routes = {
+        "maimai/song/list": songs,
+        "user/maimai/player/scores": scores_payload(50),
+    }
+    server = stub_server(routes)
+    with Client(server.root_url) as client:
+        assert (
+            list(iter_song_list(notes=True, client=client))
+            == get_song_list(notes=True, client=client)["songs"]
+        )
+        assert len(list(iter_player_scores("token", client=client))) == 50
@@ -0,0 +1,67 @@
+import pytest
+
+from src.api.sync import ScoreStore, ScoreSync
+from benchmarks.fixtures import scores_payload
+
+
+def _records():
+    records = {}
+    for record in scores_payload(200, 100)["data"]:
+        records[(record["id"], record["type"], record["level_index"])] = record
+    return list(records.values())
+
+
+def test_sync_delta(tmp_path):
+    records = _records()
+    sync = ScoreSync(ScoreStore(str(tmp_path)))
+    delta = sync.apply("1", records)
+    assert len(delta.inserted) == len(records) and not delta.improved
+
+    # 重新从磁盘读取，未变化的记录不产生增量
+    sync = ScoreSync(ScoreStore(str(tmp_path)))
+    assert not sync.apply("1", records)
+
+    improved = dict(records[0], dx_score=9999, upload_time="2025-02-01T00:00:00Z")
+    replayed = dict(records[1], achievements=0.0, upload_time="2025-02-01T00:00:00Z")
+    delta = sync.apply("1", [improved, replayed] + records[2:])
+    assert [s.dx_score for s in delta.improved] == [9999]
+    assert delta.replayed == 1 and delta.unchanged == len(records) - 2
+    assert len(sync.scores("1")) == len(records)
+
+
+def test_replay_keeps_best(tmp_path):
+    records = _records()
+    sync = ScoreSync(ScoreStore(str(tmp_path)))
+    sync.apply("1", records)
+    best = records[0]
+    lower = dict(
+        best,
+        achievements=best["achievements"] - 1,
+        dx_score=0,
+        fc=None,
+        fs=None,
+        upload_time="2025-02-01T00:00:00Z",
+    )
+    assert sync.apply("1", [lower]).replayed == 1
+    stored = sync.records("1")[(best["id"], best["type"], best["level_index"])]
+    assert stored["achievements"] == best["achievements"]
+    assert stored["upload_time"] == "2025-02-01T00:00:00Z"
+
+    # 重新读取后，同一次重打不再计入，原最佳成绩也不会被当作提升
+    sync = ScoreSync(ScoreStore(str(tmp_path)))
+    delta = sync.apply("1", [lower])
+    assert not delta and delta.unchanged == 1
+
+
+def test_interrupted_stream(tmp_path):
+    records = _records()
+    sync = ScoreSync(ScoreStore(str(tmp_path)))
+
+    def interrupted():
+        yield from records[:5]
+        raise ConnectionError
+
+    with pytest.raises(ConnectionError):
+        sync.apply("1", interrupted())
+    assert sync.records("1") == {}
+    assert len(sync.apply("1", records[:5]).inserted) == 5
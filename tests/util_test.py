@@ -0,0 +1,233 @@
+import copy
+import json
+import pickle
+
+import pytest
+
+from src.util import (
+    BuddyNotes,
+    Collection,
+    CollectionRequired,
+    LevelIndex,
+    Notes,
+    Player,
+    RateType,
+    Score,
+    Song,
+    SongType,
+)
+
+SONG = {
+    "id": 8,
+    "title": "True Love Song",
+    "artist": "Kai",
+    "genre": "maimai",
+    "bpm": 150,
+    "difficulties": {
+        "standard": [
+            {
+                "type": "standard",
+                "difficulty": 3,
+                "level": "10",
+                "level_value": 10.5,
+                "note_designer": "-",
+                "version": 10000,
+                "notes": {
+                    "total": 300,
+                    "tap": 200,
+                    "hold": 30,
+                    "slide": 40,
+                    "touch": 0,
+                    "break": 30,
+                },
+            }
+        ],
+        "dx": [],
+    },
+}
+
+
+def test_nested_decode():
+    song = Song.from_dict(SONG)
+    difficulty = song.difficulties.standard[0]
+    assert difficulty.type is SongType.STANDARD
+    assert difficulty.difficulty is LevelIndex.MASTER
+    assert difficulty.notes.break_ == 30
+    assert song.difficulties.utage is None and song.disabled is False
+
+
+def test_utage_notes_union():
+    notes = SONG["difficulties"]["standard"][0]["notes"]
+    utage = {
+        "type": "utage",
+        "difficulty": 0,
+        "level": "13?",
+        "level_value": 13.0,
+        "note_designer": "-",
+        "version": 24000,
+        "kanji": "協",
+        "description": "",
+        "is_buddy": True,
+        "notes": {"left": notes, "right": dict(notes, tap=150)},
+    }
+    song = Song.from_dict(
+        dict(SONG, difficulties=dict(SONG["difficulties"], utage=[utage]))
+    )
+    buddy = song.difficulties.utage[0].notes
+    assert isinstance(buddy, BuddyNotes)
+    assert buddy.left.break_ == 30 and buddy.right.tap == 150
+    single = Song.from_dict(
+        dict(
+            SONG,
+            difficulties=dict(
+                SONG["difficulties"], utage=[dict(utage, is_buddy=False, notes=notes)]
+            ),
+        )
+    )
+    assert isinstance(single.difficulties.utage[0].notes, Notes)
+    no_break = {k: v for k, v in notes.items() if k != "break"}
+    song = Song.from_dict(
+        dict(
+            SONG,
+            difficulties=dict(
+                SONG["difficulties"],
+                utage=[dict(utage, is_buddy=False, notes=no_break)],
+            ),
+        )
+    )
+    assert song.difficulties.utage[0].notes == Notes(**dict(no_break, break_=0))
+    with pytest.raises(ValueError):
+        Song.from_dict(
+            dict(
+                SONG,
+                difficulties=dict(
+                    SONG["difficulties"],
+                    utage=[dict(utage, notes=dict(notes, left=notes, right=notes))],
+                ),
+            )
+        )
+
+
+def test_enum_list_and_none():
+    required = CollectionRequired.from_dict(
+        {"difficulties": [0, 3], "rate": "sss", "fc": None}
+    )
+    assert required.difficulties == [LevelIndex.BASIC, LevelIndex.MASTER]
+    assert required.rate is RateType.SSS and required.fc is None
+
+
+def test_from_list():
+    scores = Score.from_list(
+        [
+            {
+                "id": 1,
+                "song_name": "a",
+                "level": "13",
+                "level_index": 2,
+                "achievements": 99.5,
+            }
+        ]
+    )
+    assert scores[0].level_index is LevelIndex.EXPERT and scores[0].rate is None
+
+
+def test_slots_and_interning():
+    songs = Song.from_list([json.loads(json.dumps(SONG)) for _ in range(2)])
+    assert songs[0].genre == "maimai"
+    assert not hasattr(songs[0], "__dict__")
+    first, second = (song.difficulties.standard[0] for song in songs)
+    # json.loads 得到的是不同的字符串对象，intern=True 的字段解析后共享同一个对象
+    assert songs[0].genre is songs[1].genre
+    assert first.level is second.level
+    assert first.note_designer is second.note_designer
+    for song in (songs[0], Song.from_dict(SONG, lazy=True)):
+        assert copy.copy(song) == song and copy.deepcopy(song) == songs[0]
+        assert pickle.loads(pickle.dumps(song)) == songs[0]
+
+
+def test_lazy_decode():
+    song = Song.from_dict(SONG, lazy=True)
+    assert isinstance(song, Song) and type(song).__name__ == "Song"
+    assert song == Song.from_dict(SONG) and Song.from_dict(SONG) == song
+    difficulty = song.difficulties.standard[0]
+    assert difficulty.difficulty is LevelIndex.MASTER
+    assert difficulty.notes.break_ == 30
+    # 解析结果会被缓存
+    assert song.difficulties.standard[0] is difficulty
+    restored = pickle.loads(pickle.dumps(Song.from_dict(SONG, lazy=True)))
+    assert type(restored) is Song and restored == song
+    song.difficulties = None
+    assert song.difficulties is None
+
+
+def test_to_dict_round_trip():
+    song = Song.from_dict(SONG)
+    data = song.to_dict()
+    assert data["difficulties"]["standard"][0]["notes"]["break"] == 30
+    assert data["difficulties"]["standard"][0]["type"] == "standard"
+    assert Song.from_dict(data) == song
+    assert Song.from_dict(SONG, lazy=True).to_dict() == data
+    required = CollectionRequired.from_dict({"difficulties": [0, 3], "rate": "sss"})
+    assert required.to_dict()["difficulties"] == [0, 3]
+
+
+def test_binary_round_trip():
+    notes = SONG["difficulties"]["standard"][0]["notes"]
+    utage = {
+        "type": "utage",
+        "difficulty": 0,
+        "level": "13?",
+        "level_value": 13.0,
+        "note_designer": "-",
+        "version": 24000,
+        "kanji": "協",
+        "description": "",
+        "is_buddy": True,
+        "notes": {"left": notes, "right": dict(notes, tap=150)},
+    }
+    song = Song.from_dict(
+        dict(SONG, difficulties=dict(SONG["difficulties"], utage=[utage]))
+    )
+    restored = Song.from_bytes(song.to_bytes())
+    assert restored == song
+    assert isinstance(restored.difficulties.utage[0].notes, BuddyNotes)
+    assert restored.difficulties.standard[0].difficulty is LevelIndex.MASTER
+    assert Song.list_from_bytes(Song.list_to_bytes([song, song])) == [song, song]
+    assert Song.from_bytes(
+        Song.from_dict(SONG, lazy=True).to_bytes()
+    ) == Song.from_dict(SONG)
+
+    player = Player.from_dict(
+        {
+            "name": "p",
+            "rating": 15000,
+            "friend_code": 1,
+            "trophy": {"id": 1, "name": "t", "color": "Normal"},
+        }
+    )
+    assert Player.from_bytes(player.to_bytes()) == player
+
+    # 与声明类型不一致、无法按列压缩的值退化为 JSON，仍然无损
+    odd = [
+        Song(id=1 << 70, title="a\0b", artist="", genre="g", bpm=150.5),
+        Song(id=-1, title="", artist="x", genre="g", bpm=None, disabled=True),
+    ]
+    restored = Song.list_from_bytes(Song.list_to_bytes(odd))
+    assert restored == odd and type(restored[1].disabled) is bool
+    assert Song.list_from_bytes(Song.list_to_bytes([])) == []
+    assert len(player.to_bytes()) < len(pickle.dumps(player))
+
+
+def test_binary_errors():
+    data = Song.from_dict(SONG).to_bytes()
+    with pytest.raises(ValueError):
+        Collection.from_bytes(data)
+    with pytest.raises(ValueError):
+        Song.list_from_bytes(data)
+    with pytest.raises(ValueError):
+        Song.from_bytes(b"not a struct")
+    # 其他格式版本写入的数据、不完整的数据
+    with pytest.raises(ValueError):
+        Song.from_bytes(data[:2] + bytes([data[2] + 1]) + data[3:])
+    with pytest.raises(ValueError):
+        Song.from_bytes(data[:-1])
@@ -0,0 +1,48 @@
+from src.warehouse import ScoreWarehouse
+from src.algorithm import SongCatalog
+from src.util import FCType, Score, Song
+from benchmarks.fixtures import scores_payload, song_list_payload
+
+SONGS = Song.from_list(song_list_payload(songs=100)["songs"])
+
+
+def test_warehouse_queries(tmp_path):
+    catalog = SongCatalog(SONGS)
+    players = {
+        str(i): Score.from_list(scores_payload(300, 100, i)["data"]) for i in range(3)
+    }
+    with ScoreWarehouse(str(tmp_path / "scores.db")) as warehouse:
+        assert warehouse.ingest_songs(SONGS) == len(SONGS)
+        for player, scores in players.items():
+            warehouse.ingest_scores(player, scores)
+        assert sorted(warehouse.players()) == ["0", "1", "2"]
+
+        # 同一谱面只保留最后写入的成绩
+        latest = {}
+        for player, scores in players.items():
+            for score in scores:
+                latest[(player, score.id, score.type, score.level_index)] = score
+        assert sorted(
+            (s.id, s.level_index.value, s.achievements)
+            for s in warehouse.iter_scores("0")
+        ) == sorted(
+            (s.id, s.level_index.value, s.achievements)
+            for (p, *_), s in latest.items()
+            if p == "0"
+        )
+
+        expected = [
+            s
+            for (_, *key), s in latest.items()
+            if tuple(key) in catalog.charts
+            and catalog.charts[tuple(key)].level_value >= 13.0
+        ]
+        histogram = warehouse.achievement_histogram(13.0)
+        assert sum(count for _, count in histogram) == len(expected)
+        assert sum(warehouse.rate_distribution(13.0).values()) == len(expected)
+
+        rows = list(warehouse.ap_rate(13.0))
+        assert sum(row[3] for row in rows) == len(expected)
+        assert sum(row[4] for row in rows) == sum(
+            s.fc in (FCType.AP, FCType.AP_PLUS) for s in expected
+        )